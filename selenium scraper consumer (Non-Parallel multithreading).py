@@ -1,5 +1,6 @@
 import os
 import time
+import queue
 import hashlib
 import schedule
 import psycopg2
@@ -9,6 +10,7 @@ import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from psycopg2.extras import execute_values
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -59,6 +61,104 @@ MODULO_RICHIESTA_FIELDS = [
     "note_sezione_incendio", "note_sezione_rc", "note_sezione_furto", "note_sezione_assistenza", "note_sezione_tutela_legale"
 ]
 
+# (field, kind, element id) for every modulo richiesta field, read from the page in one script call
+MODULO_RICHIESTA_INPUTS = [
+    ("comune", "input", "module:j_id1488:0:j_id1849"),
+    ("provincia", "input", "module:j_id1488:0:j_id1851"),
+    ("indirizzo", "input", "module:j_id1488:0:j_id1853"),
+    ("cap", "input", "module:j_id1488:0:j_id1855"),
+    ("piano", "input", "module:j_id1488:0:j_id1857"),
+
+    ("appartamento_in_cond", "checkbox", "module:j_id1488:0:j_id1865"),
+    ("villa_a_schiera", "checkbox", "module:j_id1488:0:j_id1868"),
+    ("villa_isolata", "checkbox", "module:j_id1488:0:j_id1871"),
+    ("dimora_abituale", "checkbox", "module:j_id1488:0:j_id1874"),
+    ("dimora_saltuaria", "checkbox", "module:j_id1488:0:j_id1877"),
+    ("dimora_locata_a_terzi", "checkbox", "module:j_id1488:0:j_id1880"),
+
+    ("anno_di_costruzione", "input", "module:j_id1488:0:annoCostruzione"),
+    ("anno_ristrutturazione_impianti", "input", "module:j_id1488:0:annoRistrutturazioneImpianti"),
+
+    ("struttura_portante_in_muratura", "checkbox", "module:j_id1488:0:j_id1890"),
+    ("cappotto_termico", "checkbox", "module:j_id1488:0:j_id1893"),
+    ("struttura_portante_in_cemento_armato", "checkbox", "module:j_id1488:0:j_id1896"),
+    ("pannelli_solari_e_o_fotovoltaici", "checkbox", "module:j_id1488:0:j_id1899"),
+    ("struttura_portante_in_acciaio", "checkbox", "module:j_id1488:0:j_id1902"),
+    ("antisismico", "checkbox", "module:j_id1488:0:j_id1905"),
+    ("presenza_struttura_commerciale_e_o_ricreative", "checkbox", "module:j_id1488:0:j_id1908"),
+
+    ("vincolo", "checkbox", "module:j_id1488:0:j_id1926"),
+    ("ente_vincolatario", "input", "module:j_id1488:0:j_id1929"),
+    ("scadenza", "input", "module:j_id1488:0:j_id1931"),
+
+    ("immobile", "textarea", "module:j_id1488:0:j_id1937"),
+
+    ("incendio_fabbricato", "checkbox", "module:j_id1488:0:j_id1947"),
+    ("incendio_fabbricato_importo", "input", "module:j_id1488:0:j_id1949"),
+    ("incendio_contenuto", "checkbox", "module:j_id1488:0:j_id1951"),
+    ("incendio_contenuto_importo", "input", "module:j_id1488:0:j_id1953"),
+    ("rischio_locativo", "checkbox", "module:j_id1488:0:j_id1955"),
+    ("rischio_locativo_importo", "input", "module:j_id1488:0:j_id1957"),
+    ("ricorso_terzi", "checkbox", "module:j_id1488:0:j_id1959"),
+    ("ricorso_terzi_importo", "input", "module:j_id1488:0:j_id1961"),
+    ("fenomeno_elettrico", "checkbox", "module:j_id1488:0:j_id1963"),
+    ("fenomeno_elettrico_importo", "input", "module:j_id1488:0:j_id1965"),
+    ("acqua_condotta", "checkbox", "module:j_id1488:0:j_id1967"),
+    ("acqua_condotta_importo", "input", "module:j_id1488:0:j_id1969"),
+    ("spese_ricerca_e_riparazione_guasti", "checkbox", "module:j_id1488:0:j_id1971"),
+    ("spese_ricerca_e_riparazione_guasti_importo", "input", "module:j_id1488:0:j_id1973"),
+    ("cristalli", "checkbox", "module:j_id1488:0:j_id1975"),
+    ("cristalli_importo", "input", "module:j_id1488:0:j_id1977"),
+    ("eventi_atmosferici", "checkbox", "module:j_id1488:0:j_id1979"),
+    ("eventi_atmosferici_importo", "input", "module:j_id1488:0:j_id1981"),
+    ("eventi_sociopolitici", "checkbox", "module:j_id1488:0:j_id1983"),
+    ("eventi_sociopolitici_importo", "input", "module:j_id1488:0:j_id1985"),
+    ("pacchetto_extra", "checkbox", "module:j_id1488:0:j_id1987"),
+    ("pacchetto_extra_importo", "input", "module:j_id1488:0:j_id1989"),
+
+    ("rct", "checkbox", "module:j_id1488:0:j_id1999"),
+    ("rct_importo", "input", "module:j_id1488:0:j_id2001"),
+
+    ("furto_contenuto", "checkbox", "module:j_id1488:0:j_id2011"),
+    ("furto_contenuto_importo", "input", "module:j_id1488:0:j_id2013"),
+    ("furto_gioielli_e_valori", "checkbox", "module:j_id1488:0:j_id2015"),
+    ("furto_gioielli_e_valori_importo", "input", "module:j_id1488:0:j_id2017"),
+    ("furto_rapina_estorsione", "checkbox", "module:j_id1488:0:j_id2019"),
+    ("furto_rapina_estorsione_importo", "input", "module:j_id1488:0:j_id2021"),
+
+    ("allagamento_locali", "checkbox", "module:j_id1488:0:j_id2031"),
+    ("allagamento_locali_importo", "input", "module:j_id1488:0:j_id2033"),
+    ("pronto_intervento_per_danni_acqua", "checkbox", "module:j_id1488:0:j_id2035"),
+    ("pronto_intervento_per_danni_acqua_importo", "input", "module:j_id1488:0:j_id2037"),
+    ("invio_fabbro_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2039"),
+    ("invio_fabbro_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2041"),
+    ("invio_elettricista_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2043"),
+    ("invio_elettricista_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2045"),
+
+    ("tutela_legale", "checkbox", "module:j_id1488:0:j_id2055"),
+    ("tutela_legale_importo", "input", "module:j_id1488:0:j_id2057"),
+
+    ("note_sezione_incendio", "textarea", "module:j_id1488:0:j_id2064"),
+    ("note_sezione_rc", "textarea", "module:j_id1488:0:j_id2066"),
+    ("note_sezione_furto", "textarea", "module:j_id1488:0:j_id2068"),
+    ("note_sezione_assistenza", "textarea", "module:j_id1488:0:j_id2070"),
+    ("note_sezione_tutela_legale", "textarea", "module:j_id1488:0:j_id2072")
+]
+
+MODULO_RICHIESTA_JS = """
+return arguments[0].map(([name, kind, id]) => {
+    const elem = document.getElementById(id);
+    if (kind === "checkbox") {
+        return elem && elem.checked ? "checked" : "unchecked";
+    } else if (!elem) {
+        return "";
+    } else if (kind === "textarea") {
+        return elem.value || elem.textContent || "";
+    }
+    return (elem.value || "").trim();
+});
+"""
+
 CUSTOMER_DETAIL_FIELDS = [
     "nome_cliente",
     "indirizzo", "sesso", "ateco", "codice_fiscale", "legale_rappresentante", "telefono",
@@ -81,6 +181,14 @@ class DatabaseManager:
             port=DB_PORT
         )
         self.cur = self.conn.cursor()
+        # The upsert statements never change, so build them once instead of on every insert
+        self._upsert_sql = {
+            "richiesta_contratto": self.build_upsert_sql("richiesta_contratto", RICHIESTA_CONTRATTO_FIELDS),
+            "modulo_richiesta": self.build_upsert_sql("modulo_richiesta", ["protocollo"] + MODULO_RICHIESTA_FIELDS),
+            "customer_detail": self.build_upsert_sql("customer_detail", ["protocollo"] + CUSTOMER_DETAIL_FIELDS)
+        }
+        # Rows scraped this cycle, keyed by protocollo so a batch never upserts the same row twice
+        self.pending = {table: {} for table in self._upsert_sql}
         self.create_richiesta_contratto_table()
         self.create_modulo_richiesta_table()
         self.create_customer_detail_table()
@@ -136,60 +244,120 @@ class DatabaseManager:
         )
         return self.cur.fetchone() is not None
 
-    def insert_richiesta_contratto(self, data):
-        columns = RICHIESTA_CONTRATTO_FIELDS
-        values = [data.get(f, "") for f in columns]
-        placeholders = ", ".join(["%s"] * len(columns))
+    @staticmethod
+    def build_upsert_sql(table, columns):
         update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in columns[1:]])
-        sql = f"""
-            INSERT INTO richiesta_contratto ({', '.join(columns)})
-            VALUES ({placeholders})
+        return f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES %s
             ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
         """
-        self.cur.execute(sql, values)
-        self.conn.commit()
+
+    def protocollo_pending(self, protocollo):
+        return protocollo in self.pending["modulo_richiesta"]
+
+    def insert_richiesta_contratto(self, data):
+        values = tuple(data.get(f, "") for f in RICHIESTA_CONTRATTO_FIELDS)
+        self.pending["richiesta_contratto"][values[0]] = values
 
     def insert_modulo_richiesta(self, protocollo, fields_dict):
-        columns = ["protocollo"] + MODULO_RICHIESTA_FIELDS
-        values = [protocollo] + [fields_dict.get(f, "") for f in MODULO_RICHIESTA_FIELDS]
-        placeholders = ", ".join(["%s"] * len(columns))
-        update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in MODULO_RICHIESTA_FIELDS])
-        sql = f"""
-            INSERT INTO modulo_richiesta ({', '.join(columns)})
-            VALUES ({placeholders})
-            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
-        """
-        self.cur.execute(sql, values)
-        self.conn.commit()
+        values = (protocollo, *(fields_dict.get(f, "") for f in MODULO_RICHIESTA_FIELDS))
+        self.pending["modulo_richiesta"][protocollo] = values
 
     def insert_customer_detail(self, protocollo, fields_dict):
-        columns = ["protocollo"] + CUSTOMER_DETAIL_FIELDS
-        values = [protocollo] + [fields_dict.get(f, "") for f in CUSTOMER_DETAIL_FIELDS]
-        placeholders = ", ".join(["%s"] * len(columns))
-        update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in CUSTOMER_DETAIL_FIELDS])
-        sql = f"""
-            INSERT INTO customer_detail ({', '.join(columns)})
-            VALUES ({placeholders})
-            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
-        """
-        self.cur.execute(sql, values)
-        self.conn.commit()
+        values = (protocollo, *(fields_dict.get(f, "") for f in CUSTOMER_DETAIL_FIELDS))
+        self.pending["customer_detail"][protocollo] = values
+
+    def flush(self):
+        # One execute_values per table and a single commit for everything scraped this cycle
+        counts = {table: len(rows) for table, rows in self.pending.items()}
+        if not any(counts.values()):
+            return counts
+        try:
+            for table, rows in self.pending.items():
+                if rows:
+                    execute_values(self.cur, self._upsert_sql[table], list(rows.values()), page_size=500)
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            logging.error(f"Batch insert failed, retrying row by row: {e}", exc_info=True)
+            counts = self.flush_rows()
+        # Always emptied: a row left pending would block its protocollo (and the batch) on every later cycle
+        for rows in self.pending.values():
+            rows.clear()
+        return counts
+
+    def flush_rows(self):
+        # One commit per row so a bad row only costs itself; it is logged and dropped
+        counts = {}
+        for table, rows in self.pending.items():
+            counts[table] = 0
+            for row in rows.values():
+                try:
+                    execute_values(self.cur, self._upsert_sql[table], [row])
+                    self.conn.commit()
+                    counts[table] += 1
+                except Exception as e:
+                    self.conn.rollback()
+                    logging.error(f"Dropping {table} row for {row[0]}: {e}")
+        return counts
 
     def close(self):
         self.conn.close()
 
 class PopupNotifier:
+    # One hidden Tk root per process, owned by a daemon thread; show() only enqueues
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.queue = queue.Queue()
+                instance.root = None
+                instance.thread = None
+                instance.open_popups = []
+                cls._instance = instance
+        return cls._instance
+
     def show(self, msg, title="Success"):
-        root = tk.Tk()
-        root.overrideredirect(True)
-        root.attributes("-topmost", True)
+        with self._instance_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="PopupNotifier", daemon=True)
+                self.thread.start()
+        self.queue.put((msg, title))
+
+    def _run(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.root.after(50, self._pump)
+        self.root.mainloop()
+
+    def _pump(self):
+        while True:
+            try:
+                msg, title = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._popup(msg, title)
+        self.root.after(50, self._pump)
+
+    def _close(self, popup):
+        self.open_popups.remove(popup)
+        popup.destroy()
+
+    def _popup(self, msg, title):
+        popup = tk.Toplevel(self.root)
+        popup.overrideredirect(True)
+        popup.attributes("-topmost", True)
         width, height = 360, 110
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
+        screen_width = popup.winfo_screenwidth()
+        screen_height = popup.winfo_screenheight()
         x = screen_width - width - 20
-        y = screen_height - height - 120
-        root.geometry(f"{width}x{height}+{x}+{y}")
-        container = tk.Frame(root, bg="white", bd=0)
+        y = screen_height - height - 120 - len(self.open_popups) * (height + 10)
+        popup.geometry(f"{width}x{height}+{x}+{y}")
+        container = tk.Frame(popup, bg="white", bd=0)
         container.place(relwidth=1, relheight=1)
         stripe_margin_x = 8
         stripe_margin_y = 12
@@ -217,8 +385,8 @@ class PopupNotifier:
             wraplength=300
         )
         message.place(x=28, y=50)
-        root.after(4000, root.destroy)
-        root.mainloop()
+        self.open_popups.append(popup)
+        popup.after(4000, lambda: self._close(popup))
 
 class SeleniumHelper:
     @staticmethod
@@ -309,113 +477,11 @@ class SeleniumHelper:
             )
             tab.click()
             wait.until(EC.presence_of_element_located((By.ID, "module:j_id1488:0:j_id1849")))
-            panel = wait.until(
+            wait.until(
                 EC.visibility_of_element_located((By.ID, "module:j_id1488:0td2"))
             )
-            fields = {}
-
-            def get_input_value(input_id):
-                try:
-                    elem = panel.find_element(By.ID, input_id)
-                    return elem.get_attribute("value").strip()
-                except Exception:
-                    return ""
-
-            def get_checkbox_value(input_id):
-                try:
-                    return "checked" if panel.find_element(By.ID, input_id).is_selected() else "unchecked"
-                except Exception:
-                    return "unchecked"
-
-            def get_textarea_value(textarea_id):
-                try:
-                    elem = panel.find_element(By.ID, textarea_id)
-                    return elem.get_attribute("value") or elem.text or ""
-                except Exception:
-                    return ""
-
-            fields["comune"] = get_input_value("module:j_id1488:0:j_id1849")
-            fields["provincia"] = get_input_value("module:j_id1488:0:j_id1851")
-            fields["indirizzo"] = get_input_value("module:j_id1488:0:j_id1853")
-            fields["cap"] = get_input_value("module:j_id1488:0:j_id1855")
-            fields["piano"] = get_input_value("module:j_id1488:0:j_id1857")
-
-            fields["appartamento_in_cond"] = get_checkbox_value("module:j_id1488:0:j_id1865")
-            fields["villa_a_schiera"] = get_checkbox_value("module:j_id1488:0:j_id1868")
-            fields["villa_isolata"] = get_checkbox_value("module:j_id1488:0:j_id1871")
-            fields["dimora_abituale"] = get_checkbox_value("module:j_id1488:0:j_id1874")
-            fields["dimora_saltuaria"] = get_checkbox_value("module:j_id1488:0:j_id1877")
-            fields["dimora_locata_a_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1880")
-
-            fields["anno_di_costruzione"] = get_input_value("module:j_id1488:0:annoCostruzione")
-            fields["anno_ristrutturazione_impianti"] = get_input_value("module:j_id1488:0:annoRistrutturazioneImpianti")
-
-            fields["struttura_portante_in_muratura"] = get_checkbox_value("module:j_id1488:0:j_id1890")
-            fields["cappotto_termico"] = get_checkbox_value("module:j_id1488:0:j_id1893")
-            fields["struttura_portante_in_cemento_armato"] = get_checkbox_value("module:j_id1488:0:j_id1896")
-            fields["pannelli_solari_e_o_fotovoltaici"] = get_checkbox_value("module:j_id1488:0:j_id1899")
-            fields["struttura_portante_in_acciaio"] = get_checkbox_value("module:j_id1488:0:j_id1902")
-            fields["antisismico"] = get_checkbox_value("module:j_id1488:0:j_id1905")
-            fields["presenza_struttura_commerciale_e_o_ricreative"] = get_checkbox_value("module:j_id1488:0:j_id1908")
-
-            fields["vincolo"] = get_checkbox_value("module:j_id1488:0:j_id1926")
-            fields["ente_vincolatario"] = get_input_value("module:j_id1488:0:j_id1929")
-            fields["scadenza"] = get_input_value("module:j_id1488:0:j_id1931")
-
-            fields["immobile"] = get_textarea_value("module:j_id1488:0:j_id1937")
-
-            fields["incendio_fabbricato"] = get_checkbox_value("module:j_id1488:0:j_id1947")
-            fields["incendio_fabbricato_importo"] = get_input_value("module:j_id1488:0:j_id1949")
-            fields["incendio_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id1951")
-            fields["incendio_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id1953")
-            fields["rischio_locativo"] = get_checkbox_value("module:j_id1488:0:j_id1955")
-            fields["rischio_locativo_importo"] = get_input_value("module:j_id1488:0:j_id1957")
-            fields["ricorso_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1959")
-            fields["ricorso_terzi_importo"] = get_input_value("module:j_id1488:0:j_id1961")
-            fields["fenomeno_elettrico"] = get_checkbox_value("module:j_id1488:0:j_id1963")
-            fields["fenomeno_elettrico_importo"] = get_input_value("module:j_id1488:0:j_id1965")
-            fields["acqua_condotta"] = get_checkbox_value("module:j_id1488:0:j_id1967")
-            fields["acqua_condotta_importo"] = get_input_value("module:j_id1488:0:j_id1969")
-            fields["spese_ricerca_e_riparazione_guasti"] = get_checkbox_value("module:j_id1488:0:j_id1971")
-            fields["spese_ricerca_e_riparazione_guasti_importo"] = get_input_value("module:j_id1488:0:j_id1973")
-            fields["cristalli"] = get_checkbox_value("module:j_id1488:0:j_id1975")
-            fields["cristalli_importo"] = get_input_value("module:j_id1488:0:j_id1977")
-            fields["eventi_atmosferici"] = get_checkbox_value("module:j_id1488:0:j_id1979")
-            fields["eventi_atmosferici_importo"] = get_input_value("module:j_id1488:0:j_id1981")
-            fields["eventi_sociopolitici"] = get_checkbox_value("module:j_id1488:0:j_id1983")
-            fields["eventi_sociopolitici_importo"] = get_input_value("module:j_id1488:0:j_id1985")
-            fields["pacchetto_extra"] = get_checkbox_value("module:j_id1488:0:j_id1987")
-            fields["pacchetto_extra_importo"] = get_input_value("module:j_id1488:0:j_id1989")
-
-            fields["rct"] = get_checkbox_value("module:j_id1488:0:j_id1999")
-            fields["rct_importo"] = get_input_value("module:j_id1488:0:j_id2001")
-
-            fields["furto_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id2011")
-            fields["furto_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id2013")
-            fields["furto_gioielli_e_valori"] = get_checkbox_value("module:j_id1488:0:j_id2015")
-            fields["furto_gioielli_e_valori_importo"] = get_input_value("module:j_id1488:0:j_id2017")
-            fields["furto_rapina_estorsione"] = get_checkbox_value("module:j_id1488:0:j_id2019")
-            fields["furto_rapina_estorsione_importo"] = get_input_value("module:j_id1488:0:j_id2021")
-
-            fields["allagamento_locali"] = get_checkbox_value("module:j_id1488:0:j_id2031")
-            fields["allagamento_locali_importo"] = get_input_value("module:j_id1488:0:j_id2033")
-            fields["pronto_intervento_per_danni_acqua"] = get_checkbox_value("module:j_id1488:0:j_id2035")
-            fields["pronto_intervento_per_danni_acqua_importo"] = get_input_value("module:j_id1488:0:j_id2037")
-            fields["invio_fabbro_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2039")
-            fields["invio_fabbro_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2041")
-            fields["invio_elettricista_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2043")
-            fields["invio_elettricista_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2045")
-
-            fields["tutela_legale"] = get_checkbox_value("module:j_id1488:0:j_id2055")
-            fields["tutela_legale_importo"] = get_input_value("module:j_id1488:0:j_id2057")
-
-            fields["note_sezione_incendio"] = get_textarea_value("module:j_id1488:0:j_id2064")
-            fields["note_sezione_rc"] = get_textarea_value("module:j_id1488:0:j_id2066")
-            fields["note_sezione_furto"] = get_textarea_value("module:j_id1488:0:j_id2068")
-            fields["note_sezione_assistenza"] = get_textarea_value("module:j_id1488:0:j_id2070")
-            fields["note_sezione_tutela_legale"] = get_textarea_value("module:j_id1488:0:j_id2072")
-
-            return fields
+            values = driver.execute_script(MODULO_RICHIESTA_JS, MODULO_RICHIESTA_INPUTS)
+            return {name: value for (name, _, _), value in zip(MODULO_RICHIESTA_INPUTS, values)}
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
             return {}
@@ -584,6 +650,26 @@ def submit_to_test_website(driver, wait, modulo_data, customer_data, notifier):
         form.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
         time.sleep(1)
 
+NAVIGATION_TABS = ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]
+
+# Click an element by id inside the page; false when it is not rendered
+CLICK_BY_ID_JS = """
+const elem = document.getElementById(arguments[0]);
+if (!elem) return false;
+elem.click();
+return true;
+"""
+
+def open_requests_dashboard(driver):
+    # When the dashboard tab is already on the landing page, one scripted click replaces the tab walk
+    if driver.execute_script(CLICK_BY_ID_JS, NAVIGATION_TABS[-1]):
+        return
+    for tab in NAVIGATION_TABS:
+        try:
+            WebDriverWait(driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
+        except Exception:
+            logging.warning(f"Tab {tab} not clickable, skipping.")
+
 class Scraper:
     def __init__(self, driver, driver1, wait, db_manager, notifier):
         self.driver = driver
@@ -598,11 +684,7 @@ class Scraper:
         logging.info("Scraping started...")
         try:
             self.driver.get(os.getenv("OMNIA_URL"))
-            for tab in ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]:
-                try:
-                    WebDriverWait(self.driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
-                except Exception:
-                    logging.warning(f"Tab {tab} not clickable, skipping.")
+            open_requests_dashboard(self.driver)
 
             table = WebDriverWait(self.driver, 7).until(EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard")))
             spans = table.find_elements(By.XPATH, ".//tbody//tr//span[contains(@id,'j_id484')]")
@@ -612,7 +694,7 @@ class Scraper:
                 if not protocollo:
                     continue
 
-                if self.db.protocollo_exists(protocollo):
+                if self.db.protocollo_pending(protocollo) or self.db.protocollo_exists(protocollo):
                     print(f"Skipping existing protocollo {protocollo}")
                     logging.debug(f"Skipping existing protocollo {protocollo}")
                     continue
@@ -627,12 +709,10 @@ class Scraper:
                 richiesta_contratto_data = SeleniumHelper.extract_richiesta_contratto(self.wait, self.driver)
                 if richiesta_contratto_data and richiesta_contratto_data.get("protocollo"):
                     self.db.insert_richiesta_contratto(richiesta_contratto_data)
-                    self.notifier.show(f"Inserted richiesta_contratto for: {protocollo}")
 
                 modulo_fields = SeleniumHelper.extract_modulo_richiesta(self.wait, self.driver)
                 if modulo_fields:
                     self.db.insert_modulo_richiesta(protocollo, modulo_fields)
-                    self.notifier.show(f"Inserted modulo richiesta for: {protocollo}")
 
                 try:
                     cliente_link = self.driver.find_element(By.ID, "module:j_id1444")
@@ -640,7 +720,6 @@ class Scraper:
                     customer_fields = SeleniumHelper.extract_customer_detail(self.wait, self.driver)
                     if customer_fields:
                         self.db.insert_customer_detail(protocollo, customer_fields)
-                        self.notifier.show(f"Inserted customer detail for: {protocollo}")
                 except Exception as e:
                     logging.error(f"Could not extract customer detail for {protocollo}: {e}", exc_info=True)
                     continue
@@ -657,6 +736,13 @@ class Scraper:
         except Exception as e:
             logging.error(f"General scraping error: {e}", exc_info=True)
         finally:
+            try:
+                counts = self.db.flush()
+                for table, count in counts.items():
+                    if count:
+                        self.notifier.show(f"Inserted {count} {table} records")
+            except Exception as e:
+                logging.error(f"Batch insert error: {e}", exc_info=True)
             print("\n📁 Reports saved.")
 
 class ScrapeScheduler:
@@ -689,18 +775,20 @@ class ScrapeScheduler:
             print("✅ Script completed successfully.")
 
 if __name__ == "__main__":
+    # Both drivers share one resolved binary instead of each re-running the version check
+    service_path = ChromeDriverManager().install()
     options = webdriver.ChromeOptions()
     #options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--start-maximized")
     options.add_argument("--disable-dev-shm-usage")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = webdriver.Chrome(service=Service(service_path), options=options)
     wait = WebDriverWait(driver, 20)
 
     options1 = webdriver.ChromeOptions()
     options1.add_argument("--start-maximized")
-    driver1 = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options1)
+    driver1 = webdriver.Chrome(service=Service(service_path), options=options1)
 
     db_manager = DatabaseManager()
     notifier = PopupNotifier()
@@ -1,22 +1,32 @@
+import io
 import os
+import csv
 import time
 import queue
 import hashlib
-import schedule
-import psycopg2
+import urllib3
+from urllib3.util import Retry
 import logging
+import signal
 import threading
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from psycopg2 import sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from tenacity import retry, stop_after_attempt, wait_fixed
+from tenacity import retry, stop_after_attempt, wait_fixed, wait_exponential
 
 load_dotenv()
 
@@ -59,12 +69,152 @@ MODULO_RICHIESTA_FIELDS = [
     "note_sezione_incendio", "note_sezione_rc", "note_sezione_furto", "note_sezione_assistenza", "note_sezione_tutela_legale"
 ]
 
+MODULO_RICHIESTA_INPUTS = [
+    ("comune", "input", "module:j_id1488:0:j_id1849"),
+    ("provincia", "input", "module:j_id1488:0:j_id1851"),
+    ("indirizzo", "input", "module:j_id1488:0:j_id1853"),
+    ("cap", "input", "module:j_id1488:0:j_id1855"),
+    ("piano", "input", "module:j_id1488:0:j_id1857"),
+
+    ("appartamento_in_cond", "checkbox", "module:j_id1488:0:j_id1865"),
+    ("villa_a_schiera", "checkbox", "module:j_id1488:0:j_id1868"),
+    ("villa_isolata", "checkbox", "module:j_id1488:0:j_id1871"),
+    ("dimora_abituale", "checkbox", "module:j_id1488:0:j_id1874"),
+    ("dimora_saltuaria", "checkbox", "module:j_id1488:0:j_id1877"),
+    ("dimora_locata_a_terzi", "checkbox", "module:j_id1488:0:j_id1880"),
+
+    ("anno_di_costruzione", "input", "module:j_id1488:0:annoCostruzione"),
+    ("anno_ristrutturazione_impianti", "input", "module:j_id1488:0:annoRistrutturazioneImpianti"),
+
+    ("struttura_portante_in_muratura", "checkbox", "module:j_id1488:0:j_id1890"),
+    ("cappotto_termico", "checkbox", "module:j_id1488:0:j_id1893"),
+    ("struttura_portante_in_cemento_armato", "checkbox", "module:j_id1488:0:j_id1896"),
+    ("pannelli_solari_e_o_fotovoltaici", "checkbox", "module:j_id1488:0:j_id1899"),
+    ("struttura_portante_in_acciaio", "checkbox", "module:j_id1488:0:j_id1902"),
+    ("antisismico", "checkbox", "module:j_id1488:0:j_id1905"),
+    ("presenza_struttura_commerciale_e_o_ricreative", "checkbox", "module:j_id1488:0:j_id1908"),
+
+    ("vincolo", "checkbox", "module:j_id1488:0:j_id1926"),
+    ("ente_vincolatario", "input", "module:j_id1488:0:j_id1929"),
+    ("scadenza", "input", "module:j_id1488:0:j_id1931"),
+
+    ("immobile", "textarea", "module:j_id1488:0:j_id1937"),
+
+    ("incendio_fabbricato", "checkbox", "module:j_id1488:0:j_id1947"),
+    ("incendio_fabbricato_importo", "input", "module:j_id1488:0:j_id1949"),
+    ("incendio_contenuto", "checkbox", "module:j_id1488:0:j_id1951"),
+    ("incendio_contenuto_importo", "input", "module:j_id1488:0:j_id1953"),
+    ("rischio_locativo", "checkbox", "module:j_id1488:0:j_id1955"),
+    ("rischio_locativo_importo", "input", "module:j_id1488:0:j_id1957"),
+    ("ricorso_terzi", "checkbox", "module:j_id1488:0:j_id1959"),
+    ("ricorso_terzi_importo", "input", "module:j_id1488:0:j_id1961"),
+    ("fenomeno_elettrico", "checkbox", "module:j_id1488:0:j_id1963"),
+    ("fenomeno_elettrico_importo", "input", "module:j_id1488:0:j_id1965"),
+    ("acqua_condotta", "checkbox", "module:j_id1488:0:j_id1967"),
+    ("acqua_condotta_importo", "input", "module:j_id1488:0:j_id1969"),
+    ("spese_ricerca_e_riparazione_guasti", "checkbox", "module:j_id1488:0:j_id1971"),
+    ("spese_ricerca_e_riparazione_guasti_importo", "input", "module:j_id1488:0:j_id1973"),
+    ("cristalli", "checkbox", "module:j_id1488:0:j_id1975"),
+    ("cristalli_importo", "input", "module:j_id1488:0:j_id1977"),
+    ("eventi_atmosferici", "checkbox", "module:j_id1488:0:j_id1979"),
+    ("eventi_atmosferici_importo", "input", "module:j_id1488:0:j_id1981"),
+    ("eventi_sociopolitici", "checkbox", "module:j_id1488:0:j_id1983"),
+    ("eventi_sociopolitici_importo", "input", "module:j_id1488:0:j_id1985"),
+    ("pacchetto_extra", "checkbox", "module:j_id1488:0:j_id1987"),
+    ("pacchetto_extra_importo", "input", "module:j_id1488:0:j_id1989"),
+
+    ("rct", "checkbox", "module:j_id1488:0:j_id1999"),
+    ("rct_importo", "input", "module:j_id1488:0:j_id2001"),
+
+    ("furto_contenuto", "checkbox", "module:j_id1488:0:j_id2011"),
+    ("furto_contenuto_importo", "input", "module:j_id1488:0:j_id2013"),
+    ("furto_gioielli_e_valori", "checkbox", "module:j_id1488:0:j_id2015"),
+    ("furto_gioielli_e_valori_importo", "input", "module:j_id1488:0:j_id2017"),
+    ("furto_rapina_estorsione", "checkbox", "module:j_id1488:0:j_id2019"),
+    ("furto_rapina_estorsione_importo", "input", "module:j_id1488:0:j_id2021"),
+
+    ("allagamento_locali", "checkbox", "module:j_id1488:0:j_id2031"),
+    ("allagamento_locali_importo", "input", "module:j_id1488:0:j_id2033"),
+    ("pronto_intervento_per_danni_acqua", "checkbox", "module:j_id1488:0:j_id2035"),
+    ("pronto_intervento_per_danni_acqua_importo", "input", "module:j_id1488:0:j_id2037"),
+    ("invio_fabbro_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2039"),
+    ("invio_fabbro_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2041"),
+    ("invio_elettricista_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2043"),
+    ("invio_elettricista_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2045"),
+
+    ("tutela_legale", "checkbox", "module:j_id1488:0:j_id2055"),
+    ("tutela_legale_importo", "input", "module:j_id1488:0:j_id2057"),
+
+    ("note_sezione_incendio", "textarea", "module:j_id1488:0:j_id2064"),
+    ("note_sezione_rc", "textarea", "module:j_id1488:0:j_id2066"),
+    ("note_sezione_furto", "textarea", "module:j_id1488:0:j_id2068"),
+    ("note_sezione_assistenza", "textarea", "module:j_id1488:0:j_id2070"),
+    ("note_sezione_tutela_legale", "textarea", "module:j_id1488:0:j_id2072")
+]
+
+# Reads every modulo richiesta input in one round trip: [field, kind, element id] -> [value, ...]
+# MODULO_RICHIESTA_INPUTS is in MODULO_RICHIESTA_FIELDS order, so the values line up with the table columns
+MODULO_RICHIESTA_JS = """
+return arguments[0].map(([name, kind, id]) => {
+    const elem = document.getElementById(id);
+    if (kind === "checkbox") {
+        return elem && elem.checked ? "checked" : "unchecked";
+    } else if (!elem) {
+        return "";
+    } else if (kind === "textarea") {
+        return elem.value || elem.textContent || "";
+    }
+    return (elem.value || "").trim();
+});
+"""
+
 CUSTOMER_DETAIL_FIELDS = [
     "nome_cliente",
     "indirizzo", "sesso", "ateco", "codice_fiscale", "legale_rappresentante", "telefono",
     "settore", "partita_iva", "codice_fiscale_legale_rappresentante", "email"
 ]
 
+RICHIESTA_CONTRATTO_IDS = {
+    "protocollo": "module:j_id1356",
+    "avanzamento": "module:j_id1416",
+    "inserita_il": "module:j_id1425",
+    "prodotto": "module:j_id1426",
+    "assegnata_a": "module:j_id1432",
+    "richiedente": "module:j_id1434",
+    "referente_destinatario": "module:j_id1436",
+    "cliente": "module:j_id1444",
+    "progetto": "module:j_id1452",
+    "collegato_a": "module:j_id1459"
+}
+
+# Trimmed innerText of each element id, "" when the element is missing: {field: id} -> {field: text}
+ELEMENT_TEXTS_JS = """
+const result = {};
+for (const [name, id] of Object.entries(arguments[0])) {
+    const elem = document.getElementById(id);
+    result[name] = elem ? elem.innerText.trim() : "";
+}
+return result;
+"""
+
+# Second-row cells of each customer panel table, in column order
+CUSTOMER_DETAIL_TABLES = [
+    ("customerViewForm:j_id2586", ["indirizzo", "sesso", "ateco"]),
+    ("customerViewForm:j_id2606", ["codice_fiscale", "legale_rappresentante", "telefono", "settore"]),
+    ("customerViewForm:j_id2621", ["partita_iva", "codice_fiscale_legale_rappresentante", "email"])
+]
+
+CUSTOMER_DETAIL_JS = """
+const cells = (id) => {
+    const table = document.getElementById(id);
+    const rows = table ? table.querySelectorAll("tr") : [];
+    return rows.length >= 2 ? Array.from(rows[1].querySelectorAll("td"), (td) => td.innerText.trim()) : null;
+};
+const nome = document.getElementById("customerViewForm:j_id2433");
+const link = nome ? nome.querySelector("a") : null;
+return {nome_cliente: link ? link.innerText.trim() : "", tables: arguments[0].map(cells)};
+"""
+
 RICHIESTA_CONTRATTO_FIELDS = [
     "protocollo", "avanzamento", "inserita_il", "prodotto",
     "assegnata_a", "richiedente", "referente_destinatario",
@@ -72,124 +222,286 @@ RICHIESTA_CONTRATTO_FIELDS = [
 ]
 
 class DatabaseManager:
-    def __init__(self):
-        self.conn = psycopg2.connect(
+    def __init__(self, batch_size=200, flush_interval=5, minconn=1, maxconn=4, copy_threshold=None):
+        self.pool = ThreadedConnectionPool(
+            minconn,
+            maxconn,
             dbname=DB_NAME,
             user=DB_USER,
             password=DB_PASSWORD,
             host=DB_HOST,
             port=DB_PORT
         )
-        self.cur = self.conn.cursor()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # A buffer that filled up flushes through COPY; interval flushes of a few rows stay on execute_values
+        self.copy_threshold = copy_threshold or batch_size
+        self.buffer_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        # Pending rows keyed by protocollo so one batch never upserts the same row twice
+        self.buffers = {"richiesta_contratto": {}, "modulo_richiesta": {}, "customer_detail": {}}
+        self.last_flush = time.monotonic()
+        # Compose the upserts once and render them to plain strings so no flush repeats the work
+        with self._conn() as conn:
+            self._sql_rc = self.build_upsert_sql(
+                "richiesta_contratto", RICHIESTA_CONTRATTO_FIELDS).as_string(conn)
+            self._sql_modulo = self.build_upsert_sql(
+                "modulo_richiesta", ["protocollo"] + MODULO_RICHIESTA_FIELDS).as_string(conn)
+            self._sql_customer = self.build_upsert_sql(
+                "customer_detail", ["protocollo"] + CUSTOMER_DETAIL_FIELDS).as_string(conn)
+            self._upsert_sql = {
+                "richiesta_contratto": self._sql_rc,
+                "modulo_richiesta": self._sql_modulo,
+                "customer_detail": self._sql_customer
+            }
+            self._stage_sql = {
+                "richiesta_contratto": self.build_stage_sql(
+                    "richiesta_contratto", RICHIESTA_CONTRATTO_FIELDS, conn),
+                "modulo_richiesta": self.build_stage_sql(
+                    "modulo_richiesta", ["protocollo"] + MODULO_RICHIESTA_FIELDS, conn),
+                "customer_detail": self.build_stage_sql(
+                    "customer_detail", ["protocollo"] + CUSTOMER_DETAIL_FIELDS, conn)
+            }
         self.create_richiesta_contratto_table()
         self.create_modulo_richiesta_table()
         self.create_customer_detail_table()
 
+    @contextmanager
+    def _conn(self):
+        conn = self.pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
     def create_richiesta_contratto_table(self):
-        self.cur.execute("""
-            CREATE TABLE IF NOT EXISTS richiesta_contratto (
-              protocollo TEXT PRIMARY KEY,
-              avanzamento TEXT,
-              inserita_il TEXT,
-              prodotto TEXT,
-              assegnata_a TEXT,
-              richiedente TEXT,
-              referente_destinatario TEXT,
-              cliente TEXT,
-              progetto TEXT,
-              collegato_a TEXT
-            )
-        """)
-        self.conn.commit()
+        with self._conn() as conn, conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS richiesta_contratto (
+                  protocollo TEXT PRIMARY KEY,
+                  avanzamento TEXT,
+                  inserita_il TEXT,
+                  prodotto TEXT,
+                  assegnata_a TEXT,
+                  richiedente TEXT,
+                  referente_destinatario TEXT,
+                  cliente TEXT,
+                  progetto TEXT,
+                  collegato_a TEXT
+                )
+            """)
 
     def create_modulo_richiesta_table(self):
         columns = ",\n".join([f"{field} TEXT" for field in MODULO_RICHIESTA_FIELDS])
-        sql = f"""
+        query = f"""
             CREATE TABLE IF NOT EXISTS modulo_richiesta (
                 protocollo TEXT PRIMARY KEY,
                 {columns}
             )
         """
-        self.cur.execute(sql)
-        self.conn.commit()
+        with self._conn() as conn, conn.cursor() as cur:
+            cur.execute(query)
 
     def create_customer_detail_table(self):
         columns = ",\n".join([f"{field} TEXT" for field in CUSTOMER_DETAIL_FIELDS])
-        sql = f"""
+        query = f"""
             CREATE TABLE IF NOT EXISTS customer_detail (
                 protocollo TEXT PRIMARY KEY,
                 {columns}
             )
         """
-        self.cur.execute(sql)
-        self.conn.commit()
+        with self._conn() as conn, conn.cursor() as cur:
+            cur.execute(query)
 
-    def protocollo_exists(self, protocollo):
-        self.cur.execute(
-            "SELECT 1 FROM modulo_richiesta WHERE protocollo = %s", (protocollo,)
+    def load_existing_protocolli(self):
+        with self._conn() as conn, conn.cursor() as cur:
+            cur.execute("SELECT protocollo FROM modulo_richiesta")
+            existing = {r[0] for r in cur.fetchall()}
+        with self.buffer_lock:
+            existing.update(self.buffers["modulo_richiesta"])
+        return existing
+
+    @staticmethod
+    def build_upsert_sql(table, columns):
+        return sql.SQL("""
+            INSERT INTO {table} ({columns})
+            VALUES %s
+            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
+        """).format(
+            table=sql.Identifier(table),
+            columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+            update_stmt=sql.SQL(", ").join(
+                sql.SQL("{0}=EXCLUDED.{0}").format(sql.Identifier(f)) for f in columns[1:]
+            )
         )
-        return self.cur.fetchone() is not None
 
-    def richiesta_contratto_exists(self, protocollo):
-        self.cur.execute(
-            "SELECT 1 FROM richiesta_contratto WHERE protocollo = %s", (protocollo,)
+    @staticmethod
+    def build_stage_sql(table, columns, conn):
+        # Session-local staging table emptied on commit, fed by COPY and merged with one upsert
+        stage = sql.Identifier(f"{table}_stage")
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        create = sql.SQL(
+            "CREATE TEMP TABLE IF NOT EXISTS {stage} (LIKE {table}) ON COMMIT DELETE ROWS"
+        ).format(stage=stage, table=sql.Identifier(table))
+        copy = sql.SQL("COPY {stage} ({columns}) FROM STDIN WITH (FORMAT CSV)").format(
+            stage=stage, columns=column_list
         )
-        return self.cur.fetchone() is not None
+        merge = sql.SQL("""
+            INSERT INTO {table} ({columns})
+            SELECT {columns} FROM {stage}
+            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
+        """).format(
+            table=sql.Identifier(table),
+            columns=column_list,
+            stage=stage,
+            update_stmt=sql.SQL(", ").join(
+                sql.SQL("{0}=EXCLUDED.{0}").format(sql.Identifier(f)) for f in columns[1:]
+            )
+        )
+        return create.as_string(conn), copy.as_string(conn), merge.as_string(conn)
+
+    def write_batch(self, cur, table, rows):
+        if len(rows) >= self.copy_threshold:
+            create, copy, merge = self._stage_sql[table]
+            buf = io.StringIO()
+            # QUOTE_ALL keeps "" as an empty string; an unquoted empty CSV field would load as NULL
+            csv.writer(buf, quoting=csv.QUOTE_ALL).writerows(rows)
+            buf.seek(0)
+            cur.execute(create)
+            cur.copy_expert(copy, buf)
+            cur.execute(merge)
+        else:
+            execute_values(cur, self._upsert_sql[table], rows, page_size=1000)
+
+    def buffer_row(self, table, row):
+        with self.buffer_lock:
+            self.buffers[table][row[0]] = row
+            full = len(self.buffers[table]) >= self.batch_size
+        if full:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        with self.buffer_lock:
+            pending = any(self.buffers.values())
+            due = time.monotonic() - self.last_flush >= self.flush_interval
+        if pending and due:
+            self.flush()
+
+    def flush_wait(self):
+        # Seconds until buffered rows fall due, or None when nothing is pending.
+        # Never below 1s so a failed flush leaving rows overdue cannot turn into a spin.
+        with self.buffer_lock:
+            if not any(self.buffers.values()):
+                return None
+            return max(self.flush_interval - (time.monotonic() - self.last_flush), 1)
+
+    def flush_rows(self, batches):
+        # One transaction per row so a bad row only costs itself; it is logged and dropped
+        for table, rows in batches.items():
+            for row in rows.values():
+                try:
+                    with self._conn() as conn, conn.cursor() as cur:
+                        self.write_batch(cur, table, [row])
+                except Exception as e:
+                    logging.error(f"Dropping {table} row for {row[0]}: {e}")
+
+    def flush(self):
+        # Rows stay buffered (and visible to load_existing_protocolli) until their batch is committed
+        with self.flush_lock:
+            with self.buffer_lock:
+                batches = {table: dict(rows) for table, rows in self.buffers.items()}
+            if any(batches.values()):
+                try:
+                    with self._conn() as conn, conn.cursor() as cur:
+                        for table, rows in batches.items():
+                            if rows:
+                                self.write_batch(cur, table, list(rows.values()))
+                except Exception as e:
+                    logging.error(f"Batch insert failed, retrying row by row: {e}", exc_info=True)
+                    self.flush_rows(batches)
+            # Always released: a batch kept after a failure would fail again behind the same bad row
+            with self.buffer_lock:
+                for table, rows in batches.items():
+                    for key, row in rows.items():
+                        if self.buffers[table].get(key) is row:
+                            del self.buffers[table][key]
+                self.last_flush = time.monotonic()
 
     def insert_richiesta_contratto(self, data):
-        columns = RICHIESTA_CONTRATTO_FIELDS
-        values = [data.get(f, "") for f in columns]
-        placeholders = ", ".join(["%s"] * len(columns))
-        update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in columns[1:]])
-        sql = f"""
-            INSERT INTO richiesta_contratto ({', '.join(columns)})
-            VALUES ({placeholders})
-            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
-        """
-        self.cur.execute(sql, values)
-        self.conn.commit()
-
-    def insert_modulo_richiesta(self, protocollo, fields_dict):
-        columns = ["protocollo"] + MODULO_RICHIESTA_FIELDS
-        values = [protocollo] + [fields_dict.get(f, "") for f in MODULO_RICHIESTA_FIELDS]
-        placeholders = ", ".join(["%s"] * len(columns))
-        update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in MODULO_RICHIESTA_FIELDS])
-        sql = f"""
-            INSERT INTO modulo_richiesta ({', '.join(columns)})
-            VALUES ({placeholders})
-            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
-        """
-        self.cur.execute(sql, values)
-        self.conn.commit()
+        values = tuple(data.get(f, "") for f in RICHIESTA_CONTRATTO_FIELDS)
+        self.buffer_row("richiesta_contratto", values)
+
+    def insert_modulo_richiesta(self, protocollo, values_tuple):
+        # values_tuple is already in MODULO_RICHIESTA_FIELDS order
+        self.buffer_row("modulo_richiesta", (protocollo, *values_tuple))
 
     def insert_customer_detail(self, protocollo, fields_dict):
-        columns = ["protocollo"] + CUSTOMER_DETAIL_FIELDS
-        values = [protocollo] + [fields_dict.get(f, "") for f in CUSTOMER_DETAIL_FIELDS]
-        placeholders = ", ".join(["%s"] * len(columns))
-        update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in CUSTOMER_DETAIL_FIELDS])
-        sql = f"""
-            INSERT INTO customer_detail ({', '.join(columns)})
-            VALUES ({placeholders})
-            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
-        """
-        self.cur.execute(sql, values)
-        self.conn.commit()
+        values = (protocollo,) + tuple(fields_dict.get(f, "") for f in CUSTOMER_DETAIL_FIELDS)
+        self.buffer_row("customer_detail", values)
 
     def close(self):
-        self.conn.close()
+        self.flush()
+        self.pool.closeall()
 
 class PopupNotifier:
+    # One hidden Tk root per process, owned by a daemon thread; show() only enqueues
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.queue = queue.Queue()
+                instance.root = None
+                instance.thread = None
+                instance.open_popups = []
+                cls._instance = instance
+        return cls._instance
+
     def show(self, msg, title="Success"):
-        root = tk.Tk()
-        root.overrideredirect(True)
-        root.attributes("-topmost", True)
+        with self._instance_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="PopupNotifier", daemon=True)
+                self.thread.start()
+        self.queue.put((msg, title))
+
+    def _run(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.root.after(50, self._pump)
+        self.root.mainloop()
+
+    def _pump(self):
+        while True:
+            try:
+                msg, title = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._popup(msg, title)
+        self.root.after(50, self._pump)
+
+    def _close(self, popup):
+        self.open_popups.remove(popup)
+        popup.destroy()
+
+    def _popup(self, msg, title):
+        popup = tk.Toplevel(self.root)
+        popup.overrideredirect(True)
+        popup.attributes("-topmost", True)
         width, height = 360, 110
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
+        screen_width = popup.winfo_screenwidth()
+        screen_height = popup.winfo_screenheight()
         x = screen_width - width - 20
-        y = screen_height - height - 120
-        root.geometry(f"{width}x{height}+{x}+{y}")
-        container = tk.Frame(root, bg="white", bd=0)
+        y = screen_height - height - 120 - len(self.open_popups) * (height + 10)
+        popup.geometry(f"{width}x{height}+{x}+{y}")
+        container = tk.Frame(popup, bg="white", bd=0)
         container.place(relwidth=1, relheight=1)
         stripe_margin_x = 8
         stripe_margin_y = 12
@@ -217,8 +529,18 @@ class PopupNotifier:
             wraplength=300
         )
         message.place(x=28, y=50)
-        root.after(4000, root.destroy)
-        root.mainloop()
+        self.open_popups.append(popup)
+        popup.after(4000, lambda: self._close(popup))
+
+class NullNotifier:
+    # Unattended runs: no GUI at all, notifications only go to the log
+    def show(self, msg, title="Success"):
+        logging.info(f"{title}: {msg}")
+
+def make_notifier():
+    if os.getenv("HEADLESS") == "1":
+        return NullNotifier()
+    return PopupNotifier()
 
 class SeleniumHelper:
     @staticmethod
@@ -235,268 +557,169 @@ class SeleniumHelper:
         element.send_keys(text)
 
     @staticmethod
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=4))
+    def _wait_richiesta_contratto_panel(wait):
+        return wait.until(
+            EC.visibility_of_element_located((By.ID, "module:j_id1350"))
+        )
+
+    @staticmethod
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=4))
+    def _open_modulo_tab(wait):
+        tab = wait.until(
+            EC.element_to_be_clickable((By.ID, "module:j_id1488:0.1"))
+        )
+        tab.click()
+        wait.until(EC.presence_of_element_located((By.ID, "module:j_id1488:0:j_id1849")))
+        return wait.until(
+            EC.visibility_of_element_located((By.ID, "module:j_id1488:0td2"))
+        )
+
+    @staticmethod
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.5, max=4))
+    def _wait_customer_panel(wait):
+        return wait.until(
+            EC.visibility_of_element_located((By.ID, "customerViewForm:j_id2429"))
+        )
+
+    @staticmethod
     def extract_richiesta_contratto(wait, driver):
         # ...existing extraction code...
         try:
-            panel = wait.until(
-                EC.visibility_of_element_located((By.ID, "module:j_id1350"))
-            )
-            data = {}
-            try:
-                protocollo_full = panel.find_element(By.ID, "module:j_id1356").text.strip()
-                protocollo = protocollo_full.split()[0].split('(')[0].strip()
-                data["protocollo"] = protocollo
-            except Exception:
-                data["protocollo"] = ""
-            try:
-                avanzamento = panel.find_element(By.ID, "module:j_id1416").text.strip()
-                data["avanzamento"] = avanzamento
-            except Exception:
-                data["avanzamento"] = ""
-            try:
-                inserita_il = panel.find_element(By.ID, "module:j_id1425").text.strip()
-                data["inserita_il"] = inserita_il
-            except Exception:
-                data["inserita_il"] = ""
-            try:
-                prodotto = panel.find_element(By.ID, "module:j_id1426").text.strip()
-                data["prodotto"] = prodotto
-            except Exception:
-                data["prodotto"] = ""
-            try:
-                assegnata_a = panel.find_element(By.ID, "module:j_id1432").text.strip()
-                data["assegnata_a"] = assegnata_a
-            except Exception:
-                data["assegnata_a"] = ""
-            try:
-                richiedente = panel.find_element(By.ID, "module:j_id1434").text.strip()
-                data["richiedente"] = richiedente
-            except Exception:
-                data["richiedente"] = ""
-            try:
-                referente_destinatario = panel.find_element(By.ID, "module:j_id1436").text.strip()
-                data["referente_destinatario"] = referente_destinatario
-            except Exception:
-                data["referente_destinatario"] = ""
-            try:
-                cliente = panel.find_element(By.ID, "module:j_id1444").text.strip()
-                data["cliente"] = cliente
-            except Exception:
-                data["cliente"] = ""
-            try:
-                progetto = panel.find_element(By.ID, "module:j_id1452").text.strip()
-                data["progetto"] = progetto
-            except Exception:
-                data["progetto"] = ""
-            try:
-                collegato_a = panel.find_element(By.ID, "module:j_id1459").text.strip()
-                data["collegato_a"] = collegato_a
-            except Exception:
-                data["collegato_a"] = ""
+            SeleniumHelper._wait_richiesta_contratto_panel(wait)
+            data = driver.execute_script(ELEMENT_TEXTS_JS, RICHIESTA_CONTRATTO_IDS)
+            protocollo_full = data["protocollo"].split()
+            data["protocollo"] = protocollo_full[0].split('(')[0].strip() if protocollo_full else ""
             return data
         except Exception as e:
             logging.error(f"Richiesta contratto extraction error: {e}", exc_info=True)
             return {}
 
     @staticmethod
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
     def extract_modulo_richiesta(wait, driver):
         # ...existing extraction code...
         try:
-            tab = wait.until(
-                EC.element_to_be_clickable((By.ID, "module:j_id1488:0.1"))
-            )
-            tab.click()
-            wait.until(EC.presence_of_element_located((By.ID, "module:j_id1488:0:j_id1849")))
-            panel = wait.until(
-                EC.visibility_of_element_located((By.ID, "module:j_id1488:0td2"))
-            )
-            fields = {}
-
-            def get_input_value(input_id):
-                try:
-                    elem = panel.find_element(By.ID, input_id)
-                    return elem.get_attribute("value").strip()
-                except Exception:
-                    return ""
-
-            def get_checkbox_value(input_id):
-                try:
-                    return "checked" if panel.find_element(By.ID, input_id).is_selected() else "unchecked"
-                except Exception:
-                    return "unchecked"
-
-            def get_textarea_value(textarea_id):
-                try:
-                    elem = panel.find_element(By.ID, textarea_id)
-                    return elem.get_attribute("value") or elem.text or ""
-                except Exception:
-                    return ""
-
-            fields["comune"] = get_input_value("module:j_id1488:0:j_id1849")
-            fields["provincia"] = get_input_value("module:j_id1488:0:j_id1851")
-            fields["indirizzo"] = get_input_value("module:j_id1488:0:j_id1853")
-            fields["cap"] = get_input_value("module:j_id1488:0:j_id1855")
-            fields["piano"] = get_input_value("module:j_id1488:0:j_id1857")
-
-            fields["appartamento_in_cond"] = get_checkbox_value("module:j_id1488:0:j_id1865")
-            fields["villa_a_schiera"] = get_checkbox_value("module:j_id1488:0:j_id1868")
-            fields["villa_isolata"] = get_checkbox_value("module:j_id1488:0:j_id1871")
-            fields["dimora_abituale"] = get_checkbox_value("module:j_id1488:0:j_id1874")
-            fields["dimora_saltuaria"] = get_checkbox_value("module:j_id1488:0:j_id1877")
-            fields["dimora_locata_a_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1880")
-
-            fields["anno_di_costruzione"] = get_input_value("module:j_id1488:0:annoCostruzione")
-            fields["anno_ristrutturazione_impianti"] = get_input_value("module:j_id1488:0:annoRistrutturazioneImpianti")
-
-            fields["struttura_portante_in_muratura"] = get_checkbox_value("module:j_id1488:0:j_id1890")
-            fields["cappotto_termico"] = get_checkbox_value("module:j_id1488:0:j_id1893")
-            fields["struttura_portante_in_cemento_armato"] = get_checkbox_value("module:j_id1488:0:j_id1896")
-            fields["pannelli_solari_e_o_fotovoltaici"] = get_checkbox_value("module:j_id1488:0:j_id1899")
-            fields["struttura_portante_in_acciaio"] = get_checkbox_value("module:j_id1488:0:j_id1902")
-            fields["antisismico"] = get_checkbox_value("module:j_id1488:0:j_id1905")
-            fields["presenza_struttura_commerciale_e_o_ricreative"] = get_checkbox_value("module:j_id1488:0:j_id1908")
-
-            fields["vincolo"] = get_checkbox_value("module:j_id1488:0:j_id1926")
-            fields["ente_vincolatario"] = get_input_value("module:j_id1488:0:j_id1929")
-            fields["scadenza"] = get_input_value("module:j_id1488:0:j_id1931")
-
-            fields["immobile"] = get_textarea_value("module:j_id1488:0:j_id1937")
-
-            fields["incendio_fabbricato"] = get_checkbox_value("module:j_id1488:0:j_id1947")
-            fields["incendio_fabbricato_importo"] = get_input_value("module:j_id1488:0:j_id1949")
-            fields["incendio_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id1951")
-            fields["incendio_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id1953")
-            fields["rischio_locativo"] = get_checkbox_value("module:j_id1488:0:j_id1955")
-            fields["rischio_locativo_importo"] = get_input_value("module:j_id1488:0:j_id1957")
-            fields["ricorso_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1959")
-            fields["ricorso_terzi_importo"] = get_input_value("module:j_id1488:0:j_id1961")
-            fields["fenomeno_elettrico"] = get_checkbox_value("module:j_id1488:0:j_id1963")
-            fields["fenomeno_elettrico_importo"] = get_input_value("module:j_id1488:0:j_id1965")
-            fields["acqua_condotta"] = get_checkbox_value("module:j_id1488:0:j_id1967")
-            fields["acqua_condotta_importo"] = get_input_value("module:j_id1488:0:j_id1969")
-            fields["spese_ricerca_e_riparazione_guasti"] = get_checkbox_value("module:j_id1488:0:j_id1971")
-            fields["spese_ricerca_e_riparazione_guasti_importo"] = get_input_value("module:j_id1488:0:j_id1973")
-            fields["cristalli"] = get_checkbox_value("module:j_id1488:0:j_id1975")
-            fields["cristalli_importo"] = get_input_value("module:j_id1488:0:j_id1977")
-            fields["eventi_atmosferici"] = get_checkbox_value("module:j_id1488:0:j_id1979")
-            fields["eventi_atmosferici_importo"] = get_input_value("module:j_id1488:0:j_id1981")
-            fields["eventi_sociopolitici"] = get_checkbox_value("module:j_id1488:0:j_id1983")
-            fields["eventi_sociopolitici_importo"] = get_input_value("module:j_id1488:0:j_id1985")
-            fields["pacchetto_extra"] = get_checkbox_value("module:j_id1488:0:j_id1987")
-            fields["pacchetto_extra_importo"] = get_input_value("module:j_id1488:0:j_id1989")
-
-            fields["rct"] = get_checkbox_value("module:j_id1488:0:j_id1999")
-            fields["rct_importo"] = get_input_value("module:j_id1488:0:j_id2001")
-
-            fields["furto_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id2011")
-            fields["furto_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id2013")
-            fields["furto_gioielli_e_valori"] = get_checkbox_value("module:j_id1488:0:j_id2015")
-            fields["furto_gioielli_e_valori_importo"] = get_input_value("module:j_id1488:0:j_id2017")
-            fields["furto_rapina_estorsione"] = get_checkbox_value("module:j_id1488:0:j_id2019")
-            fields["furto_rapina_estorsione_importo"] = get_input_value("module:j_id1488:0:j_id2021")
-
-            fields["allagamento_locali"] = get_checkbox_value("module:j_id1488:0:j_id2031")
-            fields["allagamento_locali_importo"] = get_input_value("module:j_id1488:0:j_id2033")
-            fields["pronto_intervento_per_danni_acqua"] = get_checkbox_value("module:j_id1488:0:j_id2035")
-            fields["pronto_intervento_per_danni_acqua_importo"] = get_input_value("module:j_id1488:0:j_id2037")
-            fields["invio_fabbro_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2039")
-            fields["invio_fabbro_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2041")
-            fields["invio_elettricista_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2043")
-            fields["invio_elettricista_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2045")
-
-            fields["tutela_legale"] = get_checkbox_value("module:j_id1488:0:j_id2055")
-            fields["tutela_legale_importo"] = get_input_value("module:j_id1488:0:j_id2057")
-
-            fields["note_sezione_incendio"] = get_textarea_value("module:j_id1488:0:j_id2064")
-            fields["note_sezione_rc"] = get_textarea_value("module:j_id1488:0:j_id2066")
-            fields["note_sezione_furto"] = get_textarea_value("module:j_id1488:0:j_id2068")
-            fields["note_sezione_assistenza"] = get_textarea_value("module:j_id1488:0:j_id2070")
-            fields["note_sezione_tutela_legale"] = get_textarea_value("module:j_id1488:0:j_id2072")
-
-            return fields
+            SeleniumHelper._open_modulo_tab(wait)
+            return tuple(driver.execute_script(MODULO_RICHIESTA_JS, MODULO_RICHIESTA_INPUTS))
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
-            return {}
+            return ()
 
     @staticmethod
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
     def extract_customer_detail(wait, driver):
         # ...existing extraction code...
         try:
-            panel = wait.until(
-                EC.visibility_of_element_located((By.ID, "customerViewForm:j_id2429"))
+            SeleniumHelper._wait_customer_panel(wait)
+            result = driver.execute_script(
+                CUSTOMER_DETAIL_JS, [table_id for table_id, _ in CUSTOMER_DETAIL_TABLES]
             )
-            data = {}
-            try:
-                nome_cliente_div = driver.find_element(By.ID, "customerViewForm:j_id2433")
-                nome_cliente_a = nome_cliente_div.find_element(By.TAG_NAME, "a")
-                data["nome_cliente"] = nome_cliente_a.text.strip()
-            except Exception:
-                data["nome_cliente"] = ""
-            table1 = panel.find_element(By.ID, "customerViewForm:j_id2586")
-            rows1 = table1.find_elements(By.TAG_NAME, "tr")
-            if len(rows1) >= 2:
-                indirizzo = rows1[1].find_elements(By.TAG_NAME, "td")[0].text.strip().replace("\n", " ")
-                sesso = rows1[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-                ateco = rows1[1].find_elements(By.TAG_NAME, "td")[2].text.strip()
-                data["indirizzo"] = indirizzo
-                data["sesso"] = sesso
-                data["ateco"] = ateco
-            table2 = panel.find_element(By.ID, "customerViewForm:j_id2606")
-            rows2 = table2.find_elements(By.TAG_NAME, "tr")
-            if len(rows2) >= 2:
-                codice_fiscale = rows2[1].find_elements(By.TAG_NAME, "td")[0].text.strip()
-                legale_rappresentante = rows2[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-                telefono = rows2[1].find_elements(By.TAG_NAME, "td")[2].text.strip()
-                settore = rows2[1].find_elements(By.TAG_NAME, "td")[3].text.strip()
-                data["codice_fiscale"] = codice_fiscale
-                data["legale_rappresentante"] = legale_rappresentante
-                data["telefono"] = telefono
-                data["settore"] = settore
-            table3 = panel.find_element(By.ID, "customerViewForm:j_id2621")
-            rows3 = table3.find_elements(By.TAG_NAME, "tr")
-            if len(rows3) >= 2:
-                partita_iva = rows3[1].find_elements(By.TAG_NAME, "td")[0].text.strip()
-                codice_fiscale_legale_rappresentante = rows3[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-                email = rows3[1].find_elements(By.TAG_NAME, "td")[2].text.strip()
-                data["partita_iva"] = partita_iva
-                data["codice_fiscale_legale_rappresentante"] = codice_fiscale_legale_rappresentante
-                data["email"] = email
+            data = {"nome_cliente": result["nome_cliente"]}
+            for (_, names), cells in zip(CUSTOMER_DETAIL_TABLES, result["tables"]):
+                if cells is None:
+                    continue
+                for name, value in zip(names, cells):
+                    data[name] = value
+            if "indirizzo" in data:
+                data["indirizzo"] = data["indirizzo"].replace("\n", " ")
             return data
         except Exception as e:
             logging.error(f"Customer detail extraction error: {e}", exc_info=True)
             return {}
 
+TEST_WEBSITE_URL = "file:///C:/Users/shehzad/Desktop/test%20website%20upgraded.html"
+
+def test_website_logged_in(driver):
+    try:
+        return driver.current_url == TEST_WEBSITE_URL and driver.find_element(By.ID, "app").is_displayed()
+    except Exception:
+        return False
+
+# Sets every named form control in one round trip and returns the names that were not found
+FILL_FORM_JS = """
+const form = arguments[0];
+const missing = [];
+for (const [name, value] of Object.entries(arguments[1])) {
+    const elem = form.querySelector(`[name="${CSS.escape(name)}"]`);
+    if (!elem) {
+        missing.push(name);
+        continue;
+    }
+    if (elem.type === "checkbox") {
+        const checked = ["on", "checked", "true", "1"].includes(value);
+        if (elem.checked !== checked) {
+            elem.click();
+        }
+    } else {
+        elem.value = value;
+        elem.dispatchEvent(new Event("input", {bubbles: true}));
+        elem.dispatchEvent(new Event("change", {bubbles: true}));
+    }
+}
+return missing;
+"""
+
+# Marks the window once every handler for the event has run: the zero-delay timeout is queued when
+# our listener fires and only runs after the page's own handlers for the same dispatch have returned
+ARM_HANDLED_JS = """
+const [elem, type, token] = arguments;
+elem.addEventListener(type, () => setTimeout(() => { window.__omniaHandled = token; }, 0), {once: true});
+"""
+
+def arm_handled(driver, elem, event):
+    token = str(time.monotonic_ns())
+    driver.execute_script(ARM_HANDLED_JS, elem, event, token)
+    return token
+
+def handled(token, elem):
+    # True once the page has processed the event, or once a real navigation replaced the element
+    def condition(driver):
+        try:
+            elem.is_enabled()
+        except StaleElementReferenceException:
+            return True
+        return driver.execute_script("return window.__omniaHandled === arguments[0];", token)
+    return condition
+
+def submit_and_wait(driver, wait, form):
+    token = arm_handled(driver, form, "submit")
+    form.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+    wait.until(handled(token, form))
+
+def run_profile_search(driver, wait, search_input, search_btn, term):
+    search_input.clear()
+    search_input.send_keys(term)
+    driver.execute_script("arguments[0].scrollIntoView(true);", search_btn)
+    wait.until(EC.element_to_be_clickable(search_btn))
+    # Wait for the search handler itself, not for rows: an empty result may leave the old table untouched
+    token = arm_handled(driver, search_btn, "click")
+    try:
+        search_btn.click()
+    except Exception:
+        driver.execute_script("arguments[0].click();", search_btn)
+    wait.until(handled(token, search_btn))
+    wait.until(EC.visibility_of_element_located((By.ID, "profileSearchResult")))
+
+def fill_form(driver, form, values):
+    missing = driver.execute_script(FILL_FORM_JS, form, values)
+    if missing:
+        logging.warning(f"Form fields not found: {', '.join(missing)}")
+
 def submit_to_test_website(driver, wait, modulo_data, customer_data, notifier):
-    # Open the test website
-    driver.get("file:///C:/Users/shehzad/Desktop/test%20website%20upgraded.html")
-    # Login (hardcoded credentials)
-    wait.until(EC.visibility_of_element_located((By.ID, "username"))).send_keys("admin")
-    wait.until(EC.visibility_of_element_located((By.ID, "password"))).send_keys("password")
-    wait.until(EC.element_to_be_clickable((By.ID, "loginBtn"))).click()
-    wait.until(EC.visibility_of_element_located((By.ID, "app")))
+    # Open the test website and login only if the session is not already authenticated
+    if not test_website_logged_in(driver):
+        driver.get(TEST_WEBSITE_URL)
+        # Login (hardcoded credentials)
+        wait.until(EC.visibility_of_element_located((By.ID, "username"))).send_keys("admin")
+        wait.until(EC.visibility_of_element_located((By.ID, "password"))).send_keys("password")
+        wait.until(EC.element_to_be_clickable((By.ID, "loginBtn"))).click()
+        wait.until(EC.visibility_of_element_located((By.ID, "app")))
 
     # --- Submit Modulo Richiesta to Request tab ---
     wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".nav-btn[data-tab='request']"))).click()
     wait.until(EC.visibility_of_element_located((By.ID, "requestForm")))
     form = driver.find_element(By.ID, "requestForm")
-    for field in ["protocollo"] + MODULO_RICHIESTA_FIELDS:
-        elem = form.find_element(By.NAME, field)
-        value = modulo_data.get(field, "")
-        if elem.get_attribute("type") == "checkbox":
-            if value in ["on", "checked", "true", "1"]:
-                if not elem.is_selected():
-                    elem.click()
-            else:
-                if elem.is_selected():
-                    elem.click()
-        else:
-            elem.clear()
-            elem.send_keys(value)
-    form.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
-    time.sleep(1)
+    fill_form(driver, form, {field: modulo_data.get(field, "") for field in ["protocollo"] + MODULO_RICHIESTA_FIELDS})
+    submit_and_wait(driver, wait, form)
 
     # --- Profile: Search for existing profile before submitting ---
     wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, ".nav-btn[data-tab='profile']"))).click()
@@ -508,15 +731,7 @@ def submit_to_test_website(driver, wait, modulo_data, customer_data, notifier):
     search_term = f"{customer_data.get('nome_cliente','')}".strip()
     codice_fiscale = f"{customer_data.get('codice_fiscale','')}".strip()
     # Search by name first
-    search_input.clear()
-    search_input.send_keys(search_term)
-    driver.execute_script("arguments[0].scrollIntoView(true);", search_btn)
-    time.sleep(0.3)
-    try:
-        search_btn.click()
-    except Exception:
-        driver.execute_script("arguments[0].click();", search_btn)
-    time.sleep(1)
+    run_profile_search(driver, wait, search_input, search_btn, search_term)
     # Check results
     exists = False
     try:
@@ -535,15 +750,7 @@ def submit_to_test_website(driver, wait, modulo_data, customer_data, notifier):
 
     # If not found by name, search by codice fiscale
     if not exists and codice_fiscale:
-        search_input.clear()
-        search_input.send_keys(codice_fiscale)
-        driver.execute_script("arguments[0].scrollIntoView(true);", search_btn)
-        time.sleep(0.3)
-        try:
-            search_btn.click()
-        except Exception:
-            driver.execute_script("arguments[0].click();", search_btn)
-        time.sleep(1)
+        run_profile_search(driver, wait, search_input, search_btn, codice_fiscale)
         try:
             result_table = driver.find_element(By.ID, "profileSearchResult")
             rows = result_table.find_elements(By.TAG_NAME, "tr")
@@ -562,12 +769,12 @@ def submit_to_test_website(driver, wait, modulo_data, customer_data, notifier):
     try:
         close_btn = driver.find_element(By.XPATH, "//button[contains(@onclick,'closeProfileSearch')]")
         driver.execute_script("arguments[0].scrollIntoView(true);", close_btn)
-        time.sleep(0.2)
+        wait.until(EC.element_to_be_clickable(close_btn))
         try:
             close_btn.click()
         except Exception:
             driver.execute_script("arguments[0].click();", close_btn)
-        time.sleep(1)
+        wait.until(EC.invisibility_of_element_located((By.ID, "profileSearchResult")))
     except Exception:
         pass
 
@@ -576,55 +783,232 @@ def submit_to_test_website(driver, wait, modulo_data, customer_data, notifier):
     else:
         # Submit Customer Detail to Profile tab
         form = driver.find_element(By.ID, "profileForm")
-        for field in CUSTOMER_DETAIL_FIELDS:
-            elem = form.find_element(By.NAME, field)
-            value = customer_data.get(field, "")
-            elem.clear()
-            elem.send_keys(value)
-        form.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
-        time.sleep(1)
+        fill_form(driver, form, {field: customer_data.get(field, "") for field in CUSTOMER_DETAIL_FIELDS})
+        submit_and_wait(driver, wait, form)
+
+
+CHROME_ARGUMENTS = [
+    "--headless=new",
+    "--window-size=1920,1080",
+    "--disable-gpu",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-features=Translate,BackForwardCache"
+]
+
+def chromedriver_path():
+    # Resolve the driver binary once; the path is exported so spawned worker processes inherit it
+    path = os.environ.get("CHROMEDRIVER_PATH")
+    if not path:
+        path = ChromeDriverManager().install()
+        os.environ["CHROMEDRIVER_PATH"] = path
+    return path
+
+def enlarge_connection_pool(driver, maxsize=20):
+    # Selenium's local driver keeps a small urllib3 pool with no retries; give it room for overlapping commands
+    # and a short retry so a dropped keep-alive socket does not fail the command
+    executor = driver.command_executor
+    if executor._conn.connection_pool_kw.get("maxsize", 1) >= maxsize:
+        return driver
+    executor._conn.clear()
+    executor._conn = urllib3.PoolManager(
+        maxsize=maxsize,
+        timeout=executor.get_timeout(),
+        retries=Retry(total=2, backoff_factor=0.1)
+    )
+    return driver
+
+def driver_factory(pool_maxsize=20):
+    options = webdriver.ChromeOptions()
+    for argument in CHROME_ARGUMENTS:
+        options.add_argument(argument)
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    options.add_experimental_option("excludeSwitches", ["enable-logging"])
+    driver = webdriver.Chrome(service=Service(chromedriver_path()), options=options, keep_alive=True)
+    # Explicit waits only: an implicit wait would stack on top of every WebDriverWait poll
+    driver.implicitly_wait(0)
+    return enlarge_connection_pool(driver, pool_maxsize)
+
+def make_wait(driver, timeout=20):
+    return WebDriverWait(driver, timeout, poll_frequency=0.1,
+                         ignored_exceptions=(StaleElementReferenceException,))
+
+def initialise_webdriver(driver=None):
+    if driver is not None and driver.session_id:
+        return driver
+    return driver_factory()
+
+def reset_webdriver(driver):
+    # Drop session state after a failed job; quit the driver if the session is gone so it gets recreated
+    try:
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        return driver
+    except WebDriverException:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        return None
 
+def worker_main(in_queue, stop_event, db_params):
+    # Runs in its own process: owns one driver and one DatabaseManager for its lifetime
+    db = DatabaseManager(**db_params)
+    notifier = make_notifier()
+    driver = None
+    try:
+        # Start Chrome before the first record arrives; if that fails it is retried on first use
+        try:
+            driver = initialise_webdriver()
+        except Exception as e:
+            logging.error(f"Could not start submission driver: {e}", exc_info=True)
+        while not stop_event.is_set():
+            try:
+                # Block until a record or the None sentinel arrives; only wake early when buffered rows are due
+                record = in_queue.get(timeout=db.flush_wait())
+            except queue.Empty:
+                db.flush_if_due()
+                continue
+            if record is None:
+                in_queue.task_done()
+                break
+            protocollo = record["protocollo"]
+            richiesta_contratto_data = record["richiesta_contratto"]
+            modulo_fields = record["modulo_fields"]
+            customer_fields = record["customer_fields"]
+
+            try:
+                if richiesta_contratto_data and richiesta_contratto_data.get("protocollo"):
+                    db.insert_richiesta_contratto(richiesta_contratto_data)
+                    notifier.show(f"Inserted richiesta_contratto for: {protocollo}")
+                if modulo_fields:
+                    db.insert_modulo_richiesta(protocollo, modulo_fields)
+                    notifier.show(f"Inserted modulo richiesta for: {protocollo}")
+                if customer_fields:
+                    db.insert_customer_detail(protocollo, customer_fields)
+                    notifier.show(f"Inserted customer detail for: {protocollo}")
+
+                driver = initialise_webdriver(driver)
+                try:
+                    submit_to_test_website(driver, make_wait(driver, 20),
+                                           dict(zip(["protocollo"] + MODULO_RICHIESTA_FIELDS, (protocollo, *modulo_fields))),
+                                           customer_fields, notifier)
+                    notifier.show(f"Submitted to test website for: {protocollo}")
+                except TimeoutException:
+                    # A slow or unresponsive page, not a dead session: keep the login for the next record
+                    raise
+                except WebDriverException:
+                    driver = reset_webdriver(driver)
+                    raise
+            except Exception as e:
+                logging.error(f"Submission error for {protocollo}: {e}", exc_info=True)
+            finally:
+                in_queue.task_done()
+    finally:
+        if driver is not None:
+            driver.quit()
+        db.close()
+
+
+NAVIGATION_TABS = ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]
+
+# Click an element by id inside the page; false when it is not rendered
+CLICK_BY_ID_JS = """
+const elem = document.getElementById(arguments[0]);
+if (!elem) return false;
+elem.click();
+return true;
+"""
+
+def open_requests_dashboard(driver):
+    # When the dashboard tab is already on the landing page, one scripted click replaces the tab walk
+    if driver.execute_script(CLICK_BY_ID_JS, NAVIGATION_TABS[-1]):
+        return
+    for tab in NAVIGATION_TABS:
+        try:
+            make_wait(driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
+        except Exception:
+            logging.warning(f"Tab {tab} not clickable, skipping.")
+
+# Protocollo and detail button of every dashboard row that carries one, in one round trip
+DASHBOARD_ROWS_JS = """
+const outermostRow = (span) => {
+    // Same row ./ancestor::tr resolves to: the first, i.e. outermost, enclosing tr
+    let row = null;
+    for (let el = span.parentElement; el; el = el.parentElement) {
+        if (el.tagName === "TR") row = el;
+    }
+    return row;
+};
+const table = document.getElementById("module:tblRequestsDashboard");
+const records = [];
+for (const span of table.querySelectorAll("tbody tr span[id*='j_id484']")) {
+    const protocollo = span.innerText.trim();
+    if (!protocollo) continue;
+    const row = outermostRow(span);
+    records.push({protocollo: protocollo, button: row ? row.querySelector("a.icon-search") : null});
+}
+return records;
+"""
 
 # ...replace your ParallelScraper class with this...
 extraction_lock = threading.Lock()
 
 class ParallelScraper:
-    def __init__(self, driver, wait, db_manager, notifier, num_workers=3, queue_size=1000):
-        self.driver = driver
+    def __init__(self, driver, wait, db_manager, notifier, num_workers=3, queue_size=1000, resync_interval=600):
+        self.driver = enlarge_connection_pool(driver, max(num_workers * 2, 20))
         self.wait = wait
         self.db = db_manager
         self.notifier = notifier
-        self.submission_queue = queue.Queue(maxsize=queue_size)
+        self._seen = self.db.load_existing_protocolli()
+        # Queued but maybe not yet committed by a worker, with the time each was queued
+        self._queued = {}
+        self.resync_interval = resync_interval
+        self.last_resync = time.monotonic()
+        self.manager = multiprocessing.Manager()
+        self.submission_queue = self.manager.Queue(maxsize=queue_size)
         self.num_workers = num_workers
-        self.stop_event = threading.Event()
+        self.stop_event = self.manager.Event()
+        # Local gate for the scheduling loop; stop() sets it so the wait returns at once instead of at the next cycle
+        self.shutdown_event = threading.Event()
+        self.executor = None
         self.workers = []
 
+    def resync_seen(self):
+        # A worker may log and drop a row its flush could not write; rebuilding _seen from the table now and
+        # then lets such a protocollo be scraped again. Anything queued since the previous resync may still be
+        # in flight and stays seen; older entries had a whole interval to commit
+        existing = self.db.load_existing_protocolli()
+        self._queued = {p: t for p, t in self._queued.items() if t >= self.last_resync and p not in existing}
+        self._seen = existing | self._queued.keys()
+        self.last_resync = time.monotonic()
+
     def extract_protocollo_records(self):
         logging.info("Extraction started...")
         try:
+            if time.monotonic() - self.last_resync >= self.resync_interval:
+                self.resync_seen()
             self.driver.get(os.getenv("OMNIA_URL"))
-            for tab in ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]:
-                try:
-                    WebDriverWait(self.driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
-                except Exception:
-                    logging.warning(f"Tab {tab} not clickable, skipping.")
+            open_requests_dashboard(self.driver)
 
-            table = WebDriverWait(self.driver, 7).until(EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard")))
-            spans = table.find_elements(By.XPATH, ".//tbody//tr//span[contains(@id,'j_id484')]")
-
-            for span in spans:
-                protocollo = span.text.strip()
-                if not protocollo:
-                    continue
+            make_wait(self.driver, 7).until(EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard")))
+            rows = self.driver.execute_script(DASHBOARD_ROWS_JS)
 
-                if self.db.protocollo_exists(protocollo):
+            for row in rows:
+                protocollo = row["protocollo"]
+                if protocollo in self._seen:
                     logging.debug(f"Skipping existing protocollo {protocollo}")
                     continue
 
-                row = span.find_element(By.XPATH, "./ancestor::tr")
-                button = row.find_element(By.CSS_SELECTOR, "a.icon-search")
+                button = row["button"]
+                if button is None:
+                    logging.warning(f"No detail button for protocollo {protocollo}, skipping.")
+                    continue
                 try:
-                    WebDriverWait(self.driver, 3).until(EC.element_to_be_clickable(button)).click()
+                    make_wait(self.driver, 3).until(EC.element_to_be_clickable(button)).click()
                 except Exception:
                     SeleniumHelper.click(self.driver, button)
 
@@ -644,56 +1028,36 @@ class ParallelScraper:
                     "modulo_fields": modulo_fields,
                     "customer_fields": customer_fields
                 })
+                # A failed modulo extraction writes no modulo_richiesta row, so leave it to be retried next cycle
+                if modulo_fields:
+                    self._seen.add(protocollo)
+                    self._queued[protocollo] = time.monotonic()
         except Exception as e:
             logging.error(f"General extraction error: {e}", exc_info=True)
         finally:
             logging.info("Extraction finished.")
 
-    def driver_factory(self):
-        options = webdriver.ChromeOptions()
-        options.add_argument("--start-maximized")
-        options.add_experimental_option("excludeSwitches", ["enable-logging"])
-        return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-
-    def submission_worker(self):
-        while not self.stop_event.is_set():
-            try:
-                record = self.submission_queue.get(timeout=2)
-            except queue.Empty:
-                continue
-            protocollo = record["protocollo"]
-            richiesta_contratto_data = record["richiesta_contratto"]
-            modulo_fields = record["modulo_fields"]
-            customer_fields = record["customer_fields"]
-
-            try:
-                if richiesta_contratto_data and richiesta_contratto_data.get("protocollo"):
-                    self.db.insert_richiesta_contratto(richiesta_contratto_data)
-                    self.notifier.show(f"Inserted richiesta_contratto for: {protocollo}")
-                if modulo_fields:
-                    self.db.insert_modulo_richiesta(protocollo, modulo_fields)
-                    self.notifier.show(f"Inserted modulo richiesta for: {protocollo}")
-                if customer_fields:
-                    self.db.insert_customer_detail(protocollo, customer_fields)
-                    self.notifier.show(f"Inserted customer detail for: {protocollo}")
-
-                driver = self.driver_factory()
-                try:
-                    submit_to_test_website(driver, WebDriverWait(driver, 20),
-                                           {"protocollo": protocollo, **modulo_fields}, customer_fields, self.notifier)
-                    self.notifier.show(f"Submitted to test website for: {protocollo}")
-                finally:
-                    driver.quit()
-            except Exception as e:
-                logging.error(f"Submission error for {protocollo}: {e}", exc_info=True)
-            finally:
-                self.submission_queue.task_done()
-
     def start_workers(self):
+        db_params = {"batch_size": self.db.batch_size, "flush_interval": self.db.flush_interval,
+                     "minconn": 1, "maxconn": 2}
+        self.executor = ProcessPoolExecutor(max_workers=self.num_workers)
         for _ in range(self.num_workers):
-            t = threading.Thread(target=self.submission_worker, daemon=True)
-            t.start()
-            self.workers.append(t)
+            self.workers.append(self.executor.submit(worker_main, self.submission_queue, self.stop_event, db_params))
+
+    def stop_workers(self):
+        self.stop_event.set()
+        for _ in self.workers:
+            try:
+                # Workers block on get() now, so each one must actually receive its sentinel
+                self.submission_queue.put(None, timeout=5)
+            except queue.Full:
+                pass
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        for future in self.workers:
+            if future.exception() is not None:
+                logging.error(f"Submission worker failed: {future.exception()}")
+        self.manager.shutdown()
 
     def threaded_scrape(self):
         # Only start a new extraction if the previous one is finished
@@ -708,33 +1072,43 @@ class ParallelScraper:
 
         threading.Thread(target=run_extraction_with_lock, name="ExtractThread").start()
 
+    def stop(self, *_):
+        # Also the SIGTERM handler
+        self.shutdown_event.set()
+
     def start(self, interval_seconds=20):
+        signal.signal(signal.SIGTERM, self.stop)
         self.start_workers()
-        schedule.every(interval_seconds).seconds.do(self.threaded_scrape)
         print(f"🧵 Parallel scheduler running every {interval_seconds} seconds with {self.num_workers} workers...\n")
+        next_run = time.monotonic() + interval_seconds
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            while not self.shutdown_event.wait(max(0, next_run - time.monotonic())):
+                self.threaded_scrape()
+                # Keep a fixed cadence; skip slots that were missed rather than bursting to catch up
+                next_run += interval_seconds
+                now = time.monotonic()
+                if next_run <= now:
+                    next_run = now + interval_seconds
         except KeyboardInterrupt:
             print("🛑 Script interrupted. Cleaning up...")
-            self.stop_event.set()
+        finally:
+            self.close()
+
+    def close(self):
+        # An extraction still in flight finishes queueing before the workers are told to drain and exit
+        with extraction_lock:
+            self.stop_workers()
             self.db.close()
             self.driver.quit()
-            print("✅ Script completed successfully.")
+        print("✅ Script completed successfully.")
 
 
 if __name__ == "__main__":
-    options = webdriver.ChromeOptions()
-    options.add_argument("--no-sandbox")
-    options.add_argument("--start-maximized")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    wait = WebDriverWait(driver, 20)
+    driver = driver_factory()
+    wait = make_wait(driver, 20)
 
     db_manager = DatabaseManager()
-    notifier = PopupNotifier()
+    notifier = make_notifier()
     # Use ParallelScraper only!
     parallel_scraper = ParallelScraper(driver, wait, db_manager, notifier, num_workers=3, queue_size=1000)
     parallel_scraper.start(interval_seconds=20)
\ No newline at end of file
@@ -10,6 +10,7 @@ import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from psycopg2.extras import execute_values
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -91,19 +92,17 @@ class DatabaseManager:
                 record["email"],
                 content_hash,
             ))
-        self.cur.executemany(
+        execute_values(
+            self.cur,
             """
             INSERT INTO customer_detail_records (
               protocollo, indirizzo, sesso, ateco,
               codice_fiscale, legale_rappresentante, telefono, settore,
               partita_iva, codice_fiscale_legale_rappresentante, email, content_hash
-            ) VALUES (
-              %s, %s, %s, %s,
-              %s, %s, %s, %s,
-              %s, %s, %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
+            ) VALUES %s ON CONFLICT (protocollo) DO NOTHING
             """,
             insert_data,
+            page_size=500,
         )
         self.conn.commit()
 
@@ -1,27 +1,47 @@
 import os
+import json
 import time
+import queue
 import hashlib
-import schedule
 import psycopg2
 import logging
+import signal
 import threading
 import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import execute_values
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
-from tenacity import retry, stop_after_attempt, wait_fixed
+from selenium.common.exceptions import StaleElementReferenceException, ElementClickInterceptedException, NoSuchElementException
+from tenacity import retry, stop_after_attempt, wait_exponential, wait_random, retry_if_exception_type
 
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO)
 scrape_lock = threading.Lock()
 
+# Post-click panels show up in 50-200ms, so poll well under the 500ms default; only
+# swallow the lookup misses, anything else should surface from until()
+def fast_wait(driver, timeout):
+    return WebDriverWait(
+        driver, timeout, poll_frequency=0.1,
+        ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+    )
+
+# Short jittered backoff, and only for the DOM blips that a retry can actually fix
+transient_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.2, min=0.2, max=2) + wait_random(0, 0.2),
+    retry=retry_if_exception_type((StaleElementReferenceException, ElementClickInterceptedException))
+)
+
 DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
@@ -60,6 +80,157 @@ MODULO_RICHIESTA_FIELDS = [
     "note_sezione_incendio", "note_sezione_rc", "note_sezione_furto", "note_sezione_assistenza", "note_sezione_tutela_legale"
 ]
 
+# (field, kind, element id) for every modulo richiesta field, read in one script call
+MODULO_RICHIESTA_INPUTS = [
+    ("comune", "input", "module:j_id1488:0:j_id1849"),
+    ("provincia", "input", "module:j_id1488:0:j_id1851"),
+    ("indirizzo", "input", "module:j_id1488:0:j_id1853"),
+    ("cap", "input", "module:j_id1488:0:j_id1855"),
+    ("piano", "input", "module:j_id1488:0:j_id1857"),
+
+    ("appartamento_in_cond", "checkbox", "module:j_id1488:0:j_id1865"),
+    ("villa_a_schiera", "checkbox", "module:j_id1488:0:j_id1868"),
+    ("villa_isolata", "checkbox", "module:j_id1488:0:j_id1871"),
+    ("dimora_abituale", "checkbox", "module:j_id1488:0:j_id1874"),
+    ("dimora_saltuaria", "checkbox", "module:j_id1488:0:j_id1877"),
+    ("dimora_locata_a_terzi", "checkbox", "module:j_id1488:0:j_id1880"),
+
+    ("anno_di_costruzione", "input", "module:j_id1488:0:annoCostruzione"),
+    ("anno_ristrutturazione_impianti", "input", "module:j_id1488:0:annoRistrutturazioneImpianti"),
+
+    ("struttura_portante_in_muratura", "checkbox", "module:j_id1488:0:j_id1890"),
+    ("cappotto_termico", "checkbox", "module:j_id1488:0:j_id1893"),
+    ("struttura_portante_in_cemento_armato", "checkbox", "module:j_id1488:0:j_id1896"),
+    ("pannelli_solari_e_o_fotovoltaici", "checkbox", "module:j_id1488:0:j_id1899"),
+    ("struttura_portante_in_acciaio", "checkbox", "module:j_id1488:0:j_id1902"),
+    ("antisismico", "checkbox", "module:j_id1488:0:j_id1905"),
+    ("presenza_struttura_commerciale_e_o_ricreative", "checkbox", "module:j_id1488:0:j_id1908"),
+
+    ("vincolo", "checkbox", "module:j_id1488:0:j_id1926"),
+    ("ente_vincolatario", "input", "module:j_id1488:0:j_id1929"),
+    ("scadenza", "input", "module:j_id1488:0:j_id1931"),
+
+    ("immobile", "textarea", "module:j_id1488:0:j_id1937"),
+
+    # Sezione Incendio
+    ("incendio_fabbricato", "checkbox", "module:j_id1488:0:j_id1947"),
+    ("incendio_fabbricato_importo", "input", "module:j_id1488:0:j_id1949"),
+    ("incendio_contenuto", "checkbox", "module:j_id1488:0:j_id1951"),
+    ("incendio_contenuto_importo", "input", "module:j_id1488:0:j_id1953"),
+    ("rischio_locativo", "checkbox", "module:j_id1488:0:j_id1955"),
+    ("rischio_locativo_importo", "input", "module:j_id1488:0:j_id1957"),
+    ("ricorso_terzi", "checkbox", "module:j_id1488:0:j_id1959"),
+    ("ricorso_terzi_importo", "input", "module:j_id1488:0:j_id1961"),
+    ("fenomeno_elettrico", "checkbox", "module:j_id1488:0:j_id1963"),
+    ("fenomeno_elettrico_importo", "input", "module:j_id1488:0:j_id1965"),
+    ("acqua_condotta", "checkbox", "module:j_id1488:0:j_id1967"),
+    ("acqua_condotta_importo", "input", "module:j_id1488:0:j_id1969"),
+    ("spese_ricerca_e_riparazione_guasti", "checkbox", "module:j_id1488:0:j_id1971"),
+    ("spese_ricerca_e_riparazione_guasti_importo", "input", "module:j_id1488:0:j_id1973"),
+    ("cristalli", "checkbox", "module:j_id1488:0:j_id1975"),
+    ("cristalli_importo", "input", "module:j_id1488:0:j_id1977"),
+    ("eventi_atmosferici", "checkbox", "module:j_id1488:0:j_id1979"),
+    ("eventi_atmosferici_importo", "input", "module:j_id1488:0:j_id1981"),
+    ("eventi_sociopolitici", "checkbox", "module:j_id1488:0:j_id1983"),
+    ("eventi_sociopolitici_importo", "input", "module:j_id1488:0:j_id1985"),
+    ("pacchetto_extra", "checkbox", "module:j_id1488:0:j_id1987"),
+    ("pacchetto_extra_importo", "input", "module:j_id1488:0:j_id1989"),
+
+    # Sezione RC
+    ("rct", "checkbox", "module:j_id1488:0:j_id1999"),
+    ("rct_importo", "input", "module:j_id1488:0:j_id2001"),
+
+    # Sezione Furto
+    ("furto_contenuto", "checkbox", "module:j_id1488:0:j_id2011"),
+    ("furto_contenuto_importo", "input", "module:j_id1488:0:j_id2013"),
+    ("furto_gioielli_e_valori", "checkbox", "module:j_id1488:0:j_id2015"),
+    ("furto_gioielli_e_valori_importo", "input", "module:j_id1488:0:j_id2017"),
+    ("furto_rapina_estorsione", "checkbox", "module:j_id1488:0:j_id2019"),
+    ("furto_rapina_estorsione_importo", "input", "module:j_id1488:0:j_id2021"),
+
+    # Sezione Assistenza
+    ("allagamento_locali", "checkbox", "module:j_id1488:0:j_id2031"),
+    ("allagamento_locali_importo", "input", "module:j_id1488:0:j_id2033"),
+    ("pronto_intervento_per_danni_acqua", "checkbox", "module:j_id1488:0:j_id2035"),
+    ("pronto_intervento_per_danni_acqua_importo", "input", "module:j_id1488:0:j_id2037"),
+    ("invio_fabbro_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2039"),
+    ("invio_fabbro_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2041"),
+    ("invio_elettricista_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2043"),
+    ("invio_elettricista_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2045"),
+
+    # Sezione Tutela Legale
+    ("tutela_legale", "checkbox", "module:j_id1488:0:j_id2055"),
+    ("tutela_legale_importo", "input", "module:j_id1488:0:j_id2057"),
+
+    # Note (textarea)
+    ("note_sezione_incendio", "textarea", "module:j_id1488:0:j_id2064"),
+    ("note_sezione_rc", "textarea", "module:j_id1488:0:j_id2066"),
+    ("note_sezione_furto", "textarea", "module:j_id1488:0:j_id2068"),
+    ("note_sezione_assistenza", "textarea", "module:j_id1488:0:j_id2070"),
+    ("note_sezione_tutela_legale", "textarea", "module:j_id1488:0:j_id2072")
+]
+
+MODULO_RICHIESTA_JS = """
+return arguments[0].map(([name, kind, id]) => {
+    const elem = document.getElementById(id);
+    if (kind === "checkbox") {
+        return elem && elem.checked ? "checked" : "unchecked";
+    } else if (!elem) {
+        return "";
+    } else if (kind === "textarea") {
+        return elem.value || elem.textContent || "";
+    }
+    return (elem.value || "").trim();
+});
+"""
+
+NAVIGATION_TABS = ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]
+
+# Click an element by id inside the page; false when it is not rendered
+CLICK_BY_ID_JS = """
+const elem = document.getElementById(arguments[0]);
+if (!elem) return false;
+elem.click();
+return true;
+"""
+
+# Protocollo text and detail button of every dashboard row, in one round trip
+DASHBOARD_ROWS_JS = """
+const outermostRow = (span) => {
+    // Same row ./ancestor::tr resolves to: the first, i.e. outermost, enclosing tr
+    let row = null;
+    for (let el = span.parentElement; el; el = el.parentElement) {
+        if (el.tagName === "TR") row = el;
+    }
+    return row;
+};
+return Array.from(arguments[0].querySelectorAll("tbody tr span[id*='j_id484']"), (span) => {
+    const row = outermostRow(span);
+    return {protocollo: span.innerText.trim(), button: row ? row.querySelector("a.icon-search") : null};
+});
+"""
+
+# Detail titles and the cell texts of every icePnlGrdRow2 row, in one round trip;
+# null until the panel is rendered and visible, so it doubles as the wait condition
+DETAIL_DATA_JS = """
+const panel = document.getElementById("module:j_id1410");
+if (!panel || !panel.offsetParent) return null;
+const keys = Array.from(panel.querySelectorAll("span.detail-title"), (span) => span.innerText.trim().toLowerCase());
+const values = [];
+for (const row of panel.getElementsByClassName("icePnlGrdRow2")) {
+    for (const cell of row.getElementsByTagName("td")) {
+        values.push(cell.innerText.trim());
+    }
+}
+values.shift();
+return {keys: keys, values: values};
+"""
+
+# Server-side prepared lookups, parsed and planned once per connection
+PREPARED_STATEMENTS = {
+    "existing_protocolli": "SELECT protocollo FROM scraped_records_test WHERE protocollo = ANY($1::text[])"
+}
+
 class DatabaseManager:
     def __init__(self):
         self.conn = psycopg2.connect(
@@ -70,11 +241,13 @@ class DatabaseManager:
             port=DB_PORT
         )
         self.cur = self.conn.cursor()
-        self.create_table()
-        self.create_modulo_richiesta_table()
+        self.create_tables()
 
-    def create_table(self):
-        self.cur.execute("""
+    def create_tables(self):
+        # Both CREATEs and the PREPAREs go over in a single semicolon-joined round trip
+        columns = ",\n".join([f"{field} TEXT" for field in MODULO_RICHIESTA_FIELDS])
+        prepares = "".join(f"PREPARE {name} AS {sql};\n" for name, sql in PREPARED_STATEMENTS.items())
+        self.cur.execute(f"""
             CREATE TABLE IF NOT EXISTS scraped_records_test (
               protocollo TEXT PRIMARY KEY,
               avanzamento TEXT,
@@ -87,33 +260,19 @@ class DatabaseManager:
               progetto TEXT,
               collegato_a TEXT,
               content_hash TEXT UNIQUE
-            )
-        """)
-        self.conn.commit()
-
-    def create_modulo_richiesta_table(self):
-        # Build SQL for 43 fields + protocollo as PK
-        columns = ",\n".join([f"{field} TEXT" for field in MODULO_RICHIESTA_FIELDS])
-        sql = f"""
+            );
             CREATE TABLE IF NOT EXISTS modulo_richiesta (
                 protocollo TEXT PRIMARY KEY,
                 {columns}
-            )
-        """
-        self.cur.execute(sql)
+            );
+            {prepares}
+        """)
         self.conn.commit()
 
-    def protocollo_exists(self, protocollo):
-        self.cur.execute(
-            "SELECT 1 FROM scraped_records_test WHERE protocollo = %s", (protocollo,)
-        )
-        return self.cur.fetchone() is not None
-
-    def hash_exists(self, content_hash):
-        self.cur.execute(
-            "SELECT 1 FROM scraped_records_test WHERE content_hash = %s", (content_hash,)
-        )
-        return self.cur.fetchone() is not None
+    def existing_protocolli(self, protocolli):
+        # One = ANY(%s) query for the whole dashboard instead of a SELECT per row
+        self.cur.execute("EXECUTE existing_protocolli(%s)", (list(protocolli),))
+        return {row[0] for row in self.cur.fetchall()}
 
     def insert_records_batch(self, records):
         insert_data = []
@@ -131,23 +290,24 @@ class DatabaseManager:
                 record["collegato a"],
                 content_hash,
             ))
-        self.cur.executemany(
+        inserted = execute_values(
+            self.cur,
             """
             INSERT INTO scraped_records_test (
               protocollo, avanzamento, inserita_il,
               prodotto, assegnata_a, richiedente,
               referente, cliente, progetto,
               collegato_a, content_hash
-            ) VALUES (
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
+            ) VALUES %s ON CONFLICT DO NOTHING
+            RETURNING protocollo
             """,
             insert_data,
+            page_size=500,
+            fetch=True,
         )
         self.conn.commit()
+        # Rows skipped for a duplicate protocollo or content_hash don't come back
+        return {row[0] for row in inserted}
 
     def insert_modulo_richiesta(self, protocollo, fields_dict):
         # Prepare columns and values for insert
@@ -167,17 +327,58 @@ class DatabaseManager:
         self.conn.close()
 
 class PopupNotifier:
+    # One hidden Tk root per process, owned by a daemon thread; show() only enqueues
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.queue = queue.Queue()
+                instance.root = None
+                instance.thread = None
+                instance.open_popups = []
+                cls._instance = instance
+        return cls._instance
+
     def show(self, msg, title="Success"):
-        root = tk.Tk()
-        root.overrideredirect(True)
-        root.attributes("-topmost", True)
+        with self._instance_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="PopupNotifier", daemon=True)
+                self.thread.start()
+        self.queue.put((msg, title))
+
+    def _run(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.root.after(50, self._pump)
+        self.root.mainloop()
+
+    def _pump(self):
+        while True:
+            try:
+                msg, title = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._popup(msg, title)
+        self.root.after(50, self._pump)
+
+    def _close(self, popup):
+        self.open_popups.remove(popup)
+        popup.destroy()
+
+    def _popup(self, msg, title):
+        popup = tk.Toplevel(self.root)
+        popup.overrideredirect(True)
+        popup.attributes("-topmost", True)
         width, height = 360, 110
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
+        screen_width = popup.winfo_screenwidth()
+        screen_height = popup.winfo_screenheight()
         x = screen_width - width - 20
-        y = screen_height - height - 120
-        root.geometry(f"{width}x{height}+{x}+{y}")
-        container = tk.Frame(root, bg="white", bd=0)
+        y = screen_height - height - 120 - len(self.open_popups) * (height + 10)
+        popup.geometry(f"{width}x{height}+{x}+{y}")
+        container = tk.Frame(popup, bg="white", bd=0)
         container.place(relwidth=1, relheight=1)
         stripe_margin_x = 8
         stripe_margin_y = 12
@@ -205,12 +406,12 @@ class PopupNotifier:
             wraplength=300
         )
         message.place(x=28, y=50)
-        root.after(4000, root.destroy)
-        root.mainloop()
+        self.open_popups.append(popup)
+        popup.after(4000, lambda: self._close(popup))
 
 class SeleniumHelper:
     @staticmethod
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
+    @transient_retry
     def click(driver_or_elem, element=None):
         if element:
             element.click()
@@ -218,12 +419,27 @@ class SeleniumHelper:
             driver_or_elem.click()
 
     @staticmethod
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
+    @transient_retry
     def safe_send_keys(element, text):
         element.send_keys(text)
 
     @staticmethod
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
+    def by_id(driver, el_id):
+        # document.getElementById in the page; By.ID goes through the CSS selector engine. None when missing.
+        return driver.execute_script("return document.getElementById(arguments[0])", el_id)
+
+    @staticmethod
+    def evaluate(driver, script, *args):
+        # Runtime.evaluate over CDP with plain JSON args/result; no element refs either way
+        expression = f"(function() {{ {script} }}).apply(null, {json.dumps(args)})"
+        response = driver.execute_cdp_cmd(
+            "Runtime.evaluate", {"expression": expression, "returnByValue": True}
+        )
+        if "exceptionDetails" in response:
+            raise RuntimeError(response["exceptionDetails"].get("text", "Runtime.evaluate failed"))
+        return response["result"].get("value")
+
+    @staticmethod
     def extract_modulo_richiesta(wait, driver):
         try:
             tab = wait.until(
@@ -232,147 +448,25 @@ class SeleniumHelper:
             tab.click()
 
             # --- ADD THIS WAIT: Wait for Comune field to be present ---
-            wait.until(EC.presence_of_element_located((By.ID, "module:j_id1488:0:j_id1849")))
+            wait.until(lambda d: SeleniumHelper.by_id(d, "module:j_id1488:0:j_id1849"))
 
-            panel = wait.until(
+            wait.until(
                 EC.visibility_of_element_located((By.ID, "module:j_id1488:0td2"))
             )
-            fields = {}
-
-            # --- Text fields by label id ---
-            def get_input_value(input_id):
-                try:
-                    print(f"Looking for input: {input_id}")
-                    elem = panel.find_element(By.ID, input_id)
-                    print(f"Found input: {input_id}, value: {elem.get_attribute('value')}")
-                    return elem.get_attribute("value").strip()
-                except Exception as e:
-                    print(f"Could not find input: {input_id} ({e})")
-                    return ""
-
-            def get_checkbox_value(input_id):
-                try:
-                    return "checked" if panel.find_element(By.ID, input_id).is_selected() else "unchecked"
-                except Exception:
-                    return "unchecked"
-
-            def get_textarea_value(textarea_id):
-                try:
-                    elem = panel.find_element(By.ID, textarea_id)
-                    return elem.get_attribute("value") or elem.text or ""
-                except Exception:
-                    return ""
-
-            # Fill all 43 fields by their HTML id (from your extract.html)
-            fields["comune"] = get_input_value("module:j_id1488:0:j_id1849")
-            fields["provincia"] = get_input_value("module:j_id1488:0:j_id1851")
-            fields["indirizzo"] = get_input_value("module:j_id1488:0:j_id1853")
-            fields["cap"] = get_input_value("module:j_id1488:0:j_id1855")
-            fields["piano"] = get_input_value("module:j_id1488:0:j_id1857")
-
-            fields["appartamento_in_cond"] = get_checkbox_value("module:j_id1488:0:j_id1865")
-            fields["villa_a_schiera"] = get_checkbox_value("module:j_id1488:0:j_id1868")
-            fields["villa_isolata"] = get_checkbox_value("module:j_id1488:0:j_id1871")
-            fields["dimora_abituale"] = get_checkbox_value("module:j_id1488:0:j_id1874")
-            fields["dimora_saltuaria"] = get_checkbox_value("module:j_id1488:0:j_id1877")
-            fields["dimora_locata_a_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1880")
-
-            fields["anno_di_costruzione"] = get_input_value("module:j_id1488:0:annoCostruzione")
-            fields["anno_ristrutturazione_impianti"] = get_input_value("module:j_id1488:0:annoRistrutturazioneImpianti")
-
-            fields["struttura_portante_in_muratura"] = get_checkbox_value("module:j_id1488:0:j_id1890")
-            fields["cappotto_termico"] = get_checkbox_value("module:j_id1488:0:j_id1893")
-            fields["struttura_portante_in_cemento_armato"] = get_checkbox_value("module:j_id1488:0:j_id1896")
-            fields["pannelli_solari_e_o_fotovoltaici"] = get_checkbox_value("module:j_id1488:0:j_id1899")
-            fields["struttura_portante_in_acciaio"] = get_checkbox_value("module:j_id1488:0:j_id1902")
-            fields["antisismico"] = get_checkbox_value("module:j_id1488:0:j_id1905")
-            fields["presenza_struttura_commerciale_e_o_ricreative"] = get_checkbox_value("module:j_id1488:0:j_id1908")
-
-            fields["vincolo"] = get_checkbox_value("module:j_id1488:0:j_id1926")
-            fields["ente_vincolatario"] = get_input_value("module:j_id1488:0:j_id1929")
-            fields["scadenza"] = get_input_value("module:j_id1488:0:j_id1931")
-
-            fields["immobile"] = get_textarea_value("module:j_id1488:0:j_id1937")
-
-            # Sezione Incendio
-            fields["incendio_fabbricato"] = get_checkbox_value("module:j_id1488:0:j_id1947")
-            fields["incendio_fabbricato_importo"] = get_input_value("module:j_id1488:0:j_id1949")
-            fields["incendio_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id1951")
-            fields["incendio_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id1953")
-            fields["rischio_locativo"] = get_checkbox_value("module:j_id1488:0:j_id1955")
-            fields["rischio_locativo_importo"] = get_input_value("module:j_id1488:0:j_id1957")
-            fields["ricorso_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1959")
-            fields["ricorso_terzi_importo"] = get_input_value("module:j_id1488:0:j_id1961")
-            fields["fenomeno_elettrico"] = get_checkbox_value("module:j_id1488:0:j_id1963")
-            fields["fenomeno_elettrico_importo"] = get_input_value("module:j_id1488:0:j_id1965")
-            fields["acqua_condotta"] = get_checkbox_value("module:j_id1488:0:j_id1967")
-            fields["acqua_condotta_importo"] = get_input_value("module:j_id1488:0:j_id1969")
-            fields["spese_ricerca_e_riparazione_guasti"] = get_checkbox_value("module:j_id1488:0:j_id1971")
-            fields["spese_ricerca_e_riparazione_guasti_importo"] = get_input_value("module:j_id1488:0:j_id1973")
-            fields["cristalli"] = get_checkbox_value("module:j_id1488:0:j_id1975")
-            fields["cristalli_importo"] = get_input_value("module:j_id1488:0:j_id1977")
-            fields["eventi_atmosferici"] = get_checkbox_value("module:j_id1488:0:j_id1979")
-            fields["eventi_atmosferici_importo"] = get_input_value("module:j_id1488:0:j_id1981")
-            fields["eventi_sociopolitici"] = get_checkbox_value("module:j_id1488:0:j_id1983")
-            fields["eventi_sociopolitici_importo"] = get_input_value("module:j_id1488:0:j_id1985")
-            fields["pacchetto_extra"] = get_checkbox_value("module:j_id1488:0:j_id1987")
-            fields["pacchetto_extra_importo"] = get_input_value("module:j_id1488:0:j_id1989")
-
-            # Sezione RC
-            fields["rct"] = get_checkbox_value("module:j_id1488:0:j_id1999")
-            fields["rct_importo"] = get_input_value("module:j_id1488:0:j_id2001")
-
-            # Sezione Furto
-            fields["furto_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id2011")
-            fields["furto_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id2013")
-            fields["furto_gioielli_e_valori"] = get_checkbox_value("module:j_id1488:0:j_id2015")
-            fields["furto_gioielli_e_valori_importo"] = get_input_value("module:j_id1488:0:j_id2017")
-            fields["furto_rapina_estorsione"] = get_checkbox_value("module:j_id1488:0:j_id2019")
-            fields["furto_rapina_estorsione_importo"] = get_input_value("module:j_id1488:0:j_id2021")
-
-            # Sezione Assistenza
-            fields["allagamento_locali"] = get_checkbox_value("module:j_id1488:0:j_id2031")
-            fields["allagamento_locali_importo"] = get_input_value("module:j_id1488:0:j_id2033")
-            fields["pronto_intervento_per_danni_acqua"] = get_checkbox_value("module:j_id1488:0:j_id2035")
-            fields["pronto_intervento_per_danni_acqua_importo"] = get_input_value("module:j_id1488:0:j_id2037")
-            fields["invio_fabbro_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2039")
-            fields["invio_fabbro_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2041")
-            fields["invio_elettricista_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2043")
-            fields["invio_elettricista_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2045")
-
-            # Sezione Tutela Legale
-            fields["tutela_legale"] = get_checkbox_value("module:j_id1488:0:j_id2055")
-            fields["tutela_legale_importo"] = get_input_value("module:j_id1488:0:j_id2057")
-
-            # Note (textarea)
-            fields["note_sezione_incendio"] = get_textarea_value("module:j_id1488:0:j_id2064")
-            fields["note_sezione_rc"] = get_textarea_value("module:j_id1488:0:j_id2066")
-            fields["note_sezione_furto"] = get_textarea_value("module:j_id1488:0:j_id2068")
-            fields["note_sezione_assistenza"] = get_textarea_value("module:j_id1488:0:j_id2070")
-            fields["note_sezione_tutela_legale"] = get_textarea_value("module:j_id1488:0:j_id2072")
-
-            return fields
+            values = SeleniumHelper.evaluate(driver, MODULO_RICHIESTA_JS, MODULO_RICHIESTA_INPUTS)
+            return {name: value for (name, _, _), value in zip(MODULO_RICHIESTA_INPUTS, values)}
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
             return {}
 
     @staticmethod
-    @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
-    def extract_detail_data(wait):
+    def extract_detail_data(wait, driver):
         try:
-            panel = wait.until(
-                EC.visibility_of_element_located((By.ID, "module:j_id1410"))
-            )
-            keys = panel.find_elements(By.CSS_SELECTOR, "span.detail-title")
-            rows = panel.find_elements(By.CLASS_NAME, "icePnlGrdRow2")
-            values = []
-            for row in rows:
-                for cell in row.find_elements(By.TAG_NAME, "td"):
-                    values.append(cell.text.strip())
-            values.pop(0)
+            result = wait.until(lambda d: SeleniumHelper.evaluate(d, DETAIL_DATA_JS))
+            values = result["values"]
             data = {}
-            for i, key in enumerate(keys):
-                data[key.text.strip().lower()] = values[i]
+            for i, key in enumerate(result["keys"]):
+                data[key] = values[i]
             return data
         except Exception as e:
             logging.error(f"Extraction error: {e}", exc_info=True)
@@ -383,70 +477,120 @@ class Scraper:
         self.driver = driver
         self.driver1 = driver1
         self.wait = wait
+        self.wait1 = fast_wait(driver1, 20)
         self.db = db_manager
         self.notifier = notifier
         self.success_log = []
         self.failed_log = []
 
-    def scrape(self):
-        logging.info("Scraping started...")
-        new_data_to_send = []
-        batch_records = []
-
-        try:
-            self.driver.get(os.getenv("OMNIA_URL"))
+    def open_dashboard(self, driver):
+        driver.get(os.getenv("OMNIA_URL"))
 
-            for tab in ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]:
+        # When the dashboard tab is already on the landing page, one scripted click replaces the tab walk
+        if not driver.execute_script(CLICK_BY_ID_JS, NAVIGATION_TABS[-1]):
+            for tab in NAVIGATION_TABS:
                 try:
-                    WebDriverWait(self.driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
+                    fast_wait(driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
                 except Exception:
                     logging.warning(f"Tab {tab} not clickable, skipping.")
 
-            table = WebDriverWait(self.driver, 7).until(EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard")))
+        return fast_wait(driver, 7).until(lambda d: SeleniumHelper.by_id(d, "module:tblRequestsDashboard"))
+
+    def extract_rows(self, driver, wait, protocolli, buttons=None):
+        # Browser work only; the caller does all DB writes so the connection stays on one thread
+        if buttons is None:
+            table = self.open_dashboard(driver)
+            buttons = {row["protocollo"]: row["button"] for row in driver.execute_script(DASHBOARD_ROWS_JS, table)}
+        results = []
+        for protocollo in protocolli:
+            button = buttons.get(protocollo)
+            if button is None:
+                logging.warning(f"No detail button for protocollo {protocollo}, skipping.")
+                continue
+            try:
+                fast_wait(driver, 3).until(EC.element_to_be_clickable(button)).click()
+            except Exception:
+                SeleniumHelper.click(driver, button)
+
+            # 1. Click modulo richiesta and extract all fields
+            modulo_fields = SeleniumHelper.extract_modulo_richiesta(wait, driver)
+            # 2. Extract detail data (already present functionality)
+            record = SeleniumHelper.extract_detail_data(wait, driver)
+            results.append((protocollo, modulo_fields, record))
+        return results
 
-            spans = table.find_elements(By.XPATH, ".//tbody//tr//span[contains(@id,'j_id484')]")
+    def scrape(self):
+        logging.info("Scraping started...")
+        new_data_to_send = []
+        batch_records = []
 
-            for span in spans:
-                protocollo = span.text.strip()
+        try:
+            table = self.open_dashboard(self.driver)
+            rows = self.driver.execute_script(DASHBOARD_ROWS_JS, table)
+            existing_protocolli = self.db.existing_protocolli([row["protocollo"] for row in rows if row["protocollo"]])
+
+            pending = []
+            buttons = {}
+            for row in rows:
+                protocollo = row["protocollo"]
                 if not protocollo:
                     continue
 
-                if self.db.protocollo_exists(protocollo):
+                if protocollo in existing_protocolli:
                     print(f"Skipping existing protocollo {protocollo}")
                     logging.debug(f"Skipping existing protocollo {protocollo}")
                     continue
 
-                row = span.find_element(By.XPATH, "./ancestor::tr")
-                button = row.find_element(By.CSS_SELECTOR, "a.icon-search")
-                try:
-                    WebDriverWait(self.driver, 3).until(EC.element_to_be_clickable(button)).click()
-                except Exception:
-                    SeleniumHelper.click(self.driver, button)
-
-                # 1. Click modulo richiesta and extract all fields, insert to DB
-                modulo_fields = SeleniumHelper.extract_modulo_richiesta(self.wait, self.driver)
+                pending.append(protocollo)
+                buttons[protocollo] = row["button"]
+
+            # Split the new rows across both browsers; driver1 opens its own copy of the dashboard
+            extracted = []
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(self.extract_rows, self.driver, self.wait, pending[0::2], buttons)]
+                if pending[1::2]:
+                    futures.append(pool.submit(self.extract_rows, self.driver1, self.wait1, pending[1::2]))
+                for future in futures:
+                    try:
+                        extracted.extend(future.result())
+                    except Exception as e:
+                        logging.error(f"Row extraction error: {e}", exc_info=True)
+
+            for protocollo, modulo_fields, record in extracted:
                 if modulo_fields:
                     print(modulo_fields)
                     self.db.insert_modulo_richiesta(protocollo, modulo_fields)
                     self.notifier.show(f"Inserted modulo richiesta for: {protocollo}")
 
-                # 2. Extract detail data (already present functionality)
-                record = SeleniumHelper.extract_detail_data(self.wait)
                 if not record:
                     continue
 
                 record["protocollo"] = protocollo
-                content_hash = hashlib.sha256(
-                    "|".join(str(record.get(k, "")) for k in record if k != "protocollo").encode("utf-8")
-                ).hexdigest()
-
-                if self.db.hash_exists(content_hash):
-                    print(f"Duplicate hash for {protocollo}, skipping insert")
-                    logging.warning(f"Duplicate hash for {protocollo}, skipping insert")
-                    continue
+                # Dedup key only: 128-bit BLAKE2b is plenty and cheaper than SHA-256.
+                # Sorted keys keep it stable whatever order the panel was read in.
+                hasher = hashlib.blake2b(digest_size=16)
+                for key in sorted(record):
+                    if key == "protocollo":
+                        continue
+                    hasher.update(key.encode("utf-8"))
+                    hasher.update(b"\x00")
+                    hasher.update(str(record[key]).encode("utf-8"))
+                    hasher.update(b"\x01")
+                content_hash = hasher.hexdigest()
 
                 batch_records.append((record, content_hash))
 
+            # Batch insert at the end; duplicates are dropped by the unique constraints
+            if batch_records:
+                inserted = self.db.insert_records_batch(batch_records)
+                logging.info(f"Inserted {len(inserted)} new records in batch.")
+
+            for record, _ in batch_records:
+                if record["protocollo"] not in inserted:
+                    print(f"Duplicate hash for {record['protocollo']}, skipping insert")
+                    logging.warning(f"Duplicate hash for {record['protocollo']}, skipping insert")
+                    continue
+
                 new_data_to_send.append({
                     "avanzamento": record["avanzamento"],
                     "inserita-il": datetime.strptime(record["inserita il"], "%d/%m/%Y %H:%M").date(),
@@ -461,11 +605,6 @@ class Scraper:
 
                 self.notifier.show(f"Inserted new record: {record['progetto']}")
 
-            # Batch insert at the end
-            if batch_records:
-                self.db.insert_records_batch(batch_records)
-                logging.info(f"Inserted {len(batch_records)} new records in batch.")
-
         except Exception as e:
             logging.error(f"General scraping error: {e}", exc_info=True)
 
@@ -478,6 +617,7 @@ class Scraper:
 class ScrapeScheduler:
     def __init__(self, scraper):
         self.scraper = scraper
+        self.shutdown_event = threading.Event()
 
     def threaded_scrape(self):
         if scrape_lock.locked():
@@ -490,33 +630,56 @@ class ScrapeScheduler:
 
         threading.Thread(target=run_task, name="ScrapeThread").start()
 
+    def stop(self, *_):
+        # Wakes the wait in start() at once; also the SIGTERM handler
+        self.shutdown_event.set()
+
     def start(self, interval_seconds=20):
-        schedule.every(interval_seconds).seconds.do(self.threaded_scrape)
+        signal.signal(signal.SIGTERM, self.stop)
         print(f"🧵 Multithreaded scheduler is running every {interval_seconds} seconds...\n")
+        next_run = time.monotonic() + interval_seconds
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            # Sleep until the next cycle is due or stop() is called, instead of waking every second to poll
+            while not self.shutdown_event.wait(max(0, next_run - time.monotonic())):
+                self.threaded_scrape()
+                next_run += interval_seconds
+                now = time.monotonic()
+                if next_run <= now:
+                    next_run = now + interval_seconds
         except KeyboardInterrupt:
             print("🛑 Script interrupted. Cleaning up...")
+        finally:
+            self.close()
+
+    def close(self):
+        # A scrape still in flight finishes before its browsers and connection go away
+        with scrape_lock:
             self.scraper.db.close()
             self.scraper.driver.quit()
             self.scraper.driver1.quit()
-            print("✅ Script completed successfully.")
+        print("✅ Script completed successfully.")
 
 if __name__ == "__main__":
+    service_path = ChromeDriverManager().install()
+    # Both scrape drivers only read the DOM: don't wait on subresources or download images
+    blank_images = {"profile.managed_default_content_settings.images": 2}
+
     options = webdriver.ChromeOptions()
+    options.page_load_strategy = "eager"
+    options.add_experimental_option("prefs", blank_images)
     #options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--start-maximized")
     options.add_argument("--disable-dev-shm-usage")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    wait = WebDriverWait(driver, 20)
+    driver = webdriver.Chrome(service=Service(service_path), options=options)
+    wait = fast_wait(driver, 20)
 
     options1 = webdriver.ChromeOptions()
+    options1.page_load_strategy = "eager"
+    options1.add_experimental_option("prefs", blank_images)
     options1.add_argument("--start-maximized")
-    driver1 = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options1)
+    driver1 = webdriver.Chrome(service=Service(service_path), options=options1)
 
     db_manager = DatabaseManager()
     notifier = PopupNotifier()
@@ -1,15 +1,18 @@
 import os
 import json
 import time
-import hashlib
+import queue
+import xxhash
 import schedule
-import psycopg2
 import logging
 import threading
 import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from contextlib import contextmanager
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -29,64 +32,151 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 
+# Header/value rows of every detail-panel table, read in one script call
+CUSTOMER_DETAIL_PANEL_JS = """
+const data = {};
+for (const table of arguments[0].querySelectorAll("table")) {
+    const rows = table.querySelectorAll("tr");
+    if (rows.length < 2) continue;
+    const headers = rows[0].querySelectorAll(":scope > td");
+    const values = rows[1].querySelectorAll(":scope > td");
+    if (!headers.length || !values.length) continue;
+    const names = Array.from(headers, (td) => {
+        const span = td.querySelector("span.detail-title");
+        return (span || td).innerText.trim().toLowerCase().replaceAll(" ", "_");
+    });
+    const texts = Array.from(values, (td) => {
+        const span = td.querySelector("span.iceOutTxt");
+        if (!span) return td.innerText.trim();
+        let value = span.innerText.trim();
+        for (const div of span.querySelectorAll("div")) {
+            const divText = div.innerText.trim();
+            if (divText) value = value.split(divText).join("");
+        }
+        return value.trim();
+    });
+    names.forEach((name, i) => { if (i < texts.length) data[name] = texts[i]; });
+}
+return data;
+"""
+
+# Label/value pairs for the panel's inputs, selects and textareas, first label wins
+MODULO_RICHIESTA_PANEL_JS = """
+const panel = arguments[0];
+const siblingSpan = (el, prop) => {
+    for (let sib = el[prop]; sib; sib = sib[prop]) {
+        if (sib.tagName === "SPAN") return sib;
+    }
+    return null;
+};
+const label = (el, fallback) => {
+    const span = siblingSpan(el, "previousElementSibling") || (fallback ? siblingSpan(el, "nextElementSibling") : null);
+    return span ? span.innerText.trim() : (el.getAttribute("name") || el.getAttribute("id"));
+};
+const data = [];
+for (const inp of panel.querySelectorAll("input")) {
+    let value;
+    if (inp.type === "checkbox") value = inp.checked ? "checked" : "unchecked";
+    else if (inp.type === "radio") value = inp.checked ? "selected" : "unselected";
+    else value = inp.value || "";
+    data.push([label(inp, true), value]);
+}
+for (const sel of panel.querySelectorAll("select")) {
+    const option = sel.querySelector(":scope > option[selected]");
+    data.push([label(sel, false), option ? option.innerText.trim() : (sel.value || "")]);
+}
+for (const ta of panel.querySelectorAll("textarea")) {
+    data.push([label(ta, false), ta.value || ta.innerText || ""]);
+}
+const seen = new Set();
+return data.filter(([name]) => !seen.has(name) && seen.add(name));
+"""
+
 class DatabaseManager:
-    def __init__(self):
-        self.conn = psycopg2.connect(
+    def __init__(self, minconn=1, maxconn=4):
+        self.pool = ThreadedConnectionPool(
+            minconn,
+            maxconn,
             dbname=DB_NAME,
             user=DB_USER,
             password=DB_PASSWORD,
             host=DB_HOST,
             port=DB_PORT
         )
-        self.cur = self.conn.cursor()
         self.create_tables()
+        self.load_existing_keys()
+
+    @contextmanager
+    def cursor(self):
+        # One transaction per block: commit on success, roll back on error, always return the connection
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
 
     def create_tables(self):
-        self.cur.execute("""
-            CREATE TABLE IF NOT EXISTS customer_detail_records (
-              protocollo TEXT PRIMARY KEY,
-              indirizzo TEXT,
-              sesso TEXT,
-              ateco TEXT,
-              codice_fiscale TEXT,
-              legale_rappresentante TEXT,
-              telefono TEXT,
-              settore TEXT,
-              partita_iva TEXT,
-              codice_fiscale_legale_rappresentante TEXT,
-              email TEXT,
-              content_hash TEXT UNIQUE
-            )
-        """)
-        self.cur.execute("""
-            CREATE TABLE IF NOT EXISTS modulo_richiesta_records (
-              protocollo TEXT,
-              field_name TEXT,
-              field_value TEXT,
-              content_hash TEXT UNIQUE
-            )
-        """)
-        self.conn.commit()
+        with self.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS customer_detail_records (
+                  protocollo TEXT PRIMARY KEY,
+                  indirizzo TEXT,
+                  sesso TEXT,
+                  ateco TEXT,
+                  codice_fiscale TEXT,
+                  legale_rappresentante TEXT,
+                  telefono TEXT,
+                  settore TEXT,
+                  partita_iva TEXT,
+                  codice_fiscale_legale_rappresentante TEXT,
+                  email TEXT,
+                  content_hash TEXT UNIQUE
+                )
+            """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS modulo_richiesta_records (
+                  protocollo TEXT,
+                  field_name TEXT,
+                  field_value TEXT,
+                  content_hash TEXT UNIQUE
+                )
+            """)
+
+    def load_existing_keys(self):
+        # One read per table at startup; the existence checks below are then set lookups
+        with self.cursor() as cur:
+            cur.execute("SELECT protocollo, content_hash FROM customer_detail_records")
+            rows = cur.fetchall()
+            self._proto_set = {r[0] for r in rows}
+            self._cust_hash_set = {r[1] for r in rows if r[1]}
+            cur.execute("SELECT content_hash FROM modulo_richiesta_records")
+            self._modulo_hash_set = {r[0] for r in cur.fetchall() if r[0]}
 
     def protocollo_exists(self, protocollo):
-        self.cur.execute(
-            "SELECT 1 FROM customer_detail_records WHERE protocollo = %s", (protocollo,)
-        )
-        return self.cur.fetchone() is not None
-
-    def hash_exists_customer(self, content_hash):
-        self.cur.execute(
-            "SELECT 1 FROM customer_detail_records WHERE content_hash = %s", (content_hash,)
-        )
-        return self.cur.fetchone() is not None
-
-    def hash_exists_modulo(self, content_hash):
-        self.cur.execute(
-            "SELECT 1 FROM modulo_richiesta_records WHERE content_hash = %s", (content_hash,)
+        return protocollo in self._proto_set
+
+    def _existing(self, cache, query, keys):
+        # Anything not already cached is resolved with a single = ANY(%s) round trip
+        unknown = list({k for k in keys if k not in cache})
+        if unknown:
+            with self.cursor() as cur:
+                cur.execute(query, (unknown,))
+                cache.update(r[0] for r in cur.fetchall())
+        return {k for k in keys if k in cache}
+
+    def existing_protocolli(self, protocolli):
+        return self._existing(
+            self._proto_set,
+            "SELECT protocollo FROM customer_detail_records WHERE protocollo = ANY(%s)",
+            protocolli
         )
-        return self.cur.fetchone() is not None
 
-    def insert_customer_batch(self, records):
+    def _insert_customer_rows(self, cur, records):
         insert_data = []
         for record, content_hash in records:
             insert_data.append((
@@ -103,23 +193,21 @@ class DatabaseManager:
                 record["email"],
                 content_hash,
             ))
-        self.cur.executemany(
+        return execute_values(
+            cur,
             """
             INSERT INTO customer_detail_records (
               protocollo, indirizzo, sesso, ateco,
               codice_fiscale, legale_rappresentante, telefono, settore,
               partita_iva, codice_fiscale_legale_rappresentante, email, content_hash
-            ) VALUES (
-              %s, %s, %s, %s,
-              %s, %s, %s, %s,
-              %s, %s, %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
+            ) VALUES %s ON CONFLICT DO NOTHING RETURNING protocollo
             """,
             insert_data,
+            page_size=500,
+            fetch=True,
         )
-        self.conn.commit()
 
-    def insert_modulo_batch(self, records):
+    def _insert_modulo_rows(self, cur, records):
         insert_data = []
         for record in records:
             insert_data.append((
@@ -128,44 +216,107 @@ class DatabaseManager:
                 record["field_value"],
                 record["content_hash"]
             ))
-        self.cur.executemany(
+        return execute_values(
+            cur,
             """
             INSERT INTO modulo_richiesta_records (
               protocollo, field_name, field_value, content_hash
-            ) VALUES (
-              %s, %s, %s, %s
-            ) ON CONFLICT (content_hash) DO NOTHING
+            ) VALUES %s ON CONFLICT (content_hash) DO NOTHING RETURNING content_hash
             """,
             insert_data,
+            page_size=500,
+            fetch=True,
+        )
+
+    def insert_batches(self, customer_records, modulo_records):
+        # Both tables in one transaction, so a scrape cycle costs a single commit.
+        # Postgres does the dedup: ON CONFLICT DO NOTHING RETURNING reports what was really inserted.
+        customer_records = [(r, h) for r, h in customer_records if h not in self._cust_hash_set]
+        modulo_records = [r for r in modulo_records if r["content_hash"] not in self._modulo_hash_set]
+        inserted_protocolli, inserted_modulo = set(), set()
+        with self.cursor() as cur:
+            if customer_records:
+                inserted_protocolli = {r[0] for r in self._insert_customer_rows(cur, customer_records)}
+            if modulo_records:
+                inserted_modulo = {r[0] for r in self._insert_modulo_rows(cur, modulo_records)}
+        # Skipped hashes exist in the table already, so every candidate hash is now known
+        self._proto_set.update(inserted_protocolli)
+        self._cust_hash_set.update(h for _, h in customer_records)
+        self._modulo_hash_set.update(r["content_hash"] for r in modulo_records)
+        return (
+            [(r, h) for r, h in customer_records if r["protocollo"] in inserted_protocolli],
+            [r for r in modulo_records if r["content_hash"] in inserted_modulo]
         )
-        self.conn.commit()
+
+    def insert_customer_batch(self, records):
+        return self.insert_batches(records, [])[0]
+
+    def insert_modulo_batch(self, records):
+        return self.insert_batches([], records)[1]
 
     def close(self):
-        self.conn.close()
+        self.pool.closeall()
 
 class PopupNotifier:
-    def show(self, msg, title="Success"):
-        root = tk.Tk()
-        root.overrideredirect(True)
-        root.attributes("-topmost", True)
+    # One hidden Tk root per process, owned by a daemon thread; show() only enqueues
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.queue = queue.Queue()
+                instance.root = None
+                instance.thread = None
+                instance.open_popups = []
+                cls._instance = instance
+        return cls._instance
 
+    def show(self, msg, title="Success"):
+        with self._instance_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="PopupNotifier", daemon=True)
+                self.thread.start()
+        self.queue.put((msg, title))
+
+    def _run(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.root.after(50, self._pump)
+        self.root.mainloop()
+
+    def _pump(self):
+        while True:
+            try:
+                msg, title = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._popup(msg, title)
+        self.root.after(50, self._pump)
+
+    def _close(self, popup):
+        self.open_popups.remove(popup)
+        popup.destroy()
+
+    def _popup(self, msg, title):
+        popup = tk.Toplevel(self.root)
+        popup.overrideredirect(True)
+        popup.attributes("-topmost", True)
         width, height = 360, 110
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
+        screen_width = popup.winfo_screenwidth()
+        screen_height = popup.winfo_screenheight()
         x = screen_width - width - 20
-        y = screen_height - height - 120
-        root.geometry(f"{width}x{height}+{x}+{y}")
-
-        container = tk.Frame(root, bg="white", bd=0)
+        y = screen_height - height - 120 - len(self.open_popups) * (height + 10)
+        popup.geometry(f"{width}x{height}+{x}+{y}")
+        container = tk.Frame(popup, bg="white", bd=0)
         container.place(relwidth=1, relheight=1)
-
         stripe_margin_x = 8
         stripe_margin_y = 12
         stripe_height = height - stripe_margin_y * 2
         stripe = tk.Canvas(container, width=12, height=stripe_height, bg="white", highlightthickness=0)
         stripe.place(x=stripe_margin_x, y=stripe_margin_y)
         stripe.create_rectangle(0, 0, 12, stripe_height, fill="#27ae60", outline="")
-
         title_label = tk.Label(
             container,
             text=title,
@@ -175,7 +326,6 @@ class PopupNotifier:
             anchor="w"
         )
         title_label.place(x=28, y=18)
-
         message = tk.Label(
             container,
             text=msg,
@@ -187,9 +337,8 @@ class PopupNotifier:
             wraplength=300
         )
         message.place(x=28, y=50)
-
-        root.after(4000, root.destroy)
-        root.mainloop()
+        self.open_popups.append(popup)
+        popup.after(4000, lambda: self._close(popup))
 
 class SeleniumHelper:
     @staticmethod
@@ -220,54 +369,12 @@ class SeleniumHelper:
 
     @staticmethod
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
-    def extract_customer_detail_panel(wait):
+    def extract_customer_detail_panel(wait, driver):
         try:
             panel = wait.until(
                 EC.visibility_of_element_located((By.CLASS_NAME, "detail-panel"))
             )
-            tables = panel.find_elements(By.TAG_NAME, "table")
-            data = {}
-            for table in tables:
-                rows = table.find_elements(By.TAG_NAME, "tr")
-                if len(rows) < 2:
-                    continue
-                tds_header = table.find_elements(By.XPATH, ".//tr[1]/td")
-                tds_values = table.find_elements(By.XPATH, ".//tr[2]/td")
-                if not tds_header or not tds_values:
-                    continue
-                field_names = []
-                for idx in range(len(tds_header)):
-                    try:
-                        td = table.find_element(By.XPATH, f".//tr[1]/td[{idx+1}]")
-                        try:
-                            span = td.find_element(By.XPATH, ".//span[contains(@class, 'detail-title')]")
-                            field_names.append(span.text.strip().lower().replace(" ", "_"))
-                        except Exception:
-                            field_names.append(td.text.strip().lower().replace(" ", "_"))
-                    except Exception:
-                        field_names.append(f"field_{idx}")
-                field_values = []
-                for idx in range(len(tds_values)):
-                    try:
-                        td = table.find_element(By.XPATH, f".//tr[2]/td[{idx+1}]")
-                        try:
-                            value_span = td.find_element(By.XPATH, ".//span[contains(@class, 'iceOutTxt')]")
-                            value = value_span.text.strip()
-                            divs = value_span.find_elements(By.TAG_NAME, "div")
-                            for div in divs:
-                                div_text = div.text.strip()
-                                if div_text:
-                                    value = value.replace(div_text, "")
-                            value = value.strip()
-                        except Exception:
-                            value = td.text.strip()
-                        field_values.append(value)
-                    except Exception:
-                        field_values.append("")
-                for i, key in enumerate(field_names):
-                    if i < len(field_values):
-                        data[key] = field_values[i]
-            return data
+            return driver.execute_script(CUSTOMER_DETAIL_PANEL_JS, panel)
         except Exception as e:
             logging.error(f"Customer detail extraction error: {e}", exc_info=True)
             return None
@@ -280,91 +387,10 @@ class SeleniumHelper:
                 EC.element_to_be_clickable((By.XPATH, '//*[@id="module:j_id1488:0.1"]'))
             )
             tab.click()
-
-            def get_panel():
-                return wait.until(
-                    EC.visibility_of_element_located((By.XPATH, '//*[@id="module:j_id1488:0td2"]'))
-                )
-
-            data = []
-
-            # Inputs
-            panel = get_panel()
-            inputs = panel.find_elements(By.XPATH, ".//input")
-            for inp in inputs:
-                try:
-                    field_id = inp.get_attribute("id")
-                    field_name = inp.get_attribute("name")
-                    field_type = inp.get_attribute("type")
-                    label = ""
-                    try:
-                        label_elem = inp.find_element(By.XPATH, "preceding-sibling::span[1]")
-                        label = label_elem.text.strip()
-                    except Exception:
-                        try:
-                            label_elem = inp.find_element(By.XPATH, "following-sibling::span[1]")
-                            label = label_elem.text.strip()
-                        except Exception:
-                            label = field_name or field_id
-                    if field_type == "checkbox":
-                        value = "checked" if inp.is_selected() else "unchecked"
-                    elif field_type == "radio":
-                        value = "selected" if inp.is_selected() else "unselected"
-                    else:
-                        value = inp.get_attribute("value") or ""
-                    data.append((label, value))
-                except Exception as e:
-                    logging.warning(f"Stale input skipped: {e}")
-
-            # Selects
-            panel = get_panel()
-            selects = panel.find_elements(By.XPATH, ".//select")
-            for sel in selects:
-                try:
-                    field_id = sel.get_attribute("id")
-                    field_name = sel.get_attribute("name")
-                    label = ""
-                    try:
-                        label_elem = sel.find_element(By.XPATH, "preceding-sibling::span[1]")
-                        label = label_elem.text.strip()
-                    except Exception:
-                        label = field_name or field_id
-                    try:
-                        selected_option = sel.find_element(By.XPATH, "./option[@selected]")
-                        value = selected_option.text.strip()
-                    except Exception:
-                        value = sel.get_attribute("value") or ""
-                    data.append((label, value))
-                except Exception as e:
-                    logging.warning(f"Stale select skipped: {e}")
-
-            # Textareas
-            panel = get_panel()
-            textareas = panel.find_elements(By.XPATH, ".//textarea")
-            for ta in textareas:
-                try:
-                    field_id = ta.get_attribute("id")
-                    field_name = ta.get_attribute("name")
-                    label = ""
-                    try:
-                        label_elem = ta.find_element(By.XPATH, "preceding-sibling::span[1]")
-                        label = label_elem.text.strip()
-                    except Exception:
-                        label = field_name or field_id
-                    value = ta.get_attribute("value") or ta.text or ""
-                    data.append((label, value))
-                except Exception as e:
-                    logging.warning(f"Stale textarea skipped: {e}")
-
-            # Remove duplicates
-            seen = set()
-            unique_data = []
-            for label, value in data:
-                if label not in seen:
-                    unique_data.append((label, value))
-                    seen.add(label)
-
-            return unique_data
+            panel = wait.until(
+                EC.visibility_of_element_located((By.XPATH, '//*[@id="module:j_id1488:0td2"]'))
+            )
+            return [tuple(pair) for pair in driver.execute_script(MODULO_RICHIESTA_PANEL_JS, panel)]
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
             return []
@@ -372,14 +398,46 @@ class SeleniumHelper:
 class HashUtil:
     @staticmethod
     def hash_content(data_dict):
-        filtered_dict = {k: v for k, v in data_dict.items() if k != "protocollo"}
-        content_str = "|".join(str(v) for v in filtered_dict.values())
-        return hashlib.sha256(content_str.encode("utf-8")).hexdigest()
+        # Stream the fields into the hasher; the digest matches hashing "|".join(values)
+        h = xxhash.xxh128()
+        sep = b""
+        for k, v in data_dict.items():
+            if k == "protocollo":
+                continue
+            h.update(sep)
+            h.update(str(v).encode("utf-8"))
+            sep = b"|"
+        return h.hexdigest()
 
     @staticmethod
     def hash_modulo(protocollo, field_name, field_value):
-        content_str = f"{protocollo}|{field_name}|{field_value}"
-        return hashlib.sha256(content_str.encode("utf-8")).hexdigest()
+        h = xxhash.xxh128()
+        h.update(str(protocollo).encode("utf-8"))
+        h.update(b"|")
+        h.update(str(field_name).encode("utf-8"))
+        h.update(b"|")
+        h.update(str(field_value).encode("utf-8"))
+        return h.hexdigest()
+
+NAVIGATION_TABS = ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]
+
+# Click an element by id inside the page; false when it is not rendered
+CLICK_BY_ID_JS = """
+const elem = document.getElementById(arguments[0]);
+if (!elem) return false;
+elem.click();
+return true;
+"""
+
+def open_requests_dashboard(driver):
+    # When the dashboard tab is already on the landing page, one scripted click replaces the tab walk
+    if driver.execute_script(CLICK_BY_ID_JS, NAVIGATION_TABS[-1]):
+        return
+    for tab in NAVIGATION_TABS:
+        try:
+            WebDriverWait(driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
+        except Exception:
+            logging.warning(f"Tab {tab} not clickable, skipping.")
 
 class Scraper:
     def __init__(self, driver, driver1, wait, db_manager, notifier):
@@ -396,26 +454,25 @@ class Scraper:
         new_data_to_send = []
         batch_customer_records = []
         batch_modulo_records = []
+        customer_candidates = []
+        modulo_candidates = []
 
         try:
             self.driver.get(os.getenv("OMNIA_URL"))
 
-            for tab in ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]:
-                try:
-                    WebDriverWait(self.driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
-                except Exception:
-                    logging.warning(f"Tab {tab} not clickable, skipping.")
+            open_requests_dashboard(self.driver)
 
             table = WebDriverWait(self.driver, 7).until(EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard")))
 
             spans = table.find_elements(By.XPATH, ".//tbody//tr//span[contains(@id,'j_id484')]")
+            span_protocolli = [(span, span.text.strip()) for span in spans]
+            existing_protocolli = self.db.existing_protocolli([p for _, p in span_protocolli if p])
 
-            for span in spans:
-                protocollo = span.text.strip()
+            for span, protocollo in span_protocolli:
                 if not protocollo:
                     continue
 
-                if self.db.protocollo_exists(protocollo):
+                if protocollo in existing_protocolli:
                     print(f"Skipping existing protocollo {protocollo}")
                     logging.debug(f"Skipping existing protocollo {protocollo}")
                     continue
@@ -437,14 +494,12 @@ class Scraper:
                     logging.error(f"Could not extract modulo richiesta: {e}", exc_info=True)
 
                 for field_name, field_value in modulo_data:
-                    modulo_hash = HashUtil.hash_modulo(protocollo, field_name, field_value)
-                    if not self.db.hash_exists_modulo(modulo_hash):
-                        batch_modulo_records.append({
-                            "protocollo": protocollo,
-                            "field_name": field_name,
-                            "field_value": field_value,
-                            "content_hash": modulo_hash
-                        })
+                    modulo_candidates.append({
+                        "protocollo": protocollo,
+                        "field_name": field_name,
+                        "field_value": field_value,
+                        "content_hash": HashUtil.hash_modulo(protocollo, field_name, field_value)
+                    })
 
                 # 2. Click on the client name to expose details
                 try:
@@ -455,40 +510,41 @@ class Scraper:
                     continue
 
                 # 3. Extract customer detail panel data
-                customer_data = SeleniumHelper.extract_customer_detail_panel(self.wait)
+                customer_data = SeleniumHelper.extract_customer_detail_panel(self.wait, self.driver)
                 if not customer_data:
                     continue
 
                 customer_data["protocollo"] = protocollo
-                content_hash = HashUtil.hash_content(customer_data)
-
-                if self.db.hash_exists_customer(content_hash):
-                    print(f"Duplicate hash for {protocollo}, skipping insert")
-                    logging.warning(f"Duplicate hash for {protocollo}, skipping insert")
-                else:
-                    batch_customer_records.append((customer_data, content_hash))
-                    new_data_to_send.append({
-                        "indirizzo": customer_data.get("indirizzo", ""),
-                        "sesso": customer_data.get("sesso", ""),
-                        "ateco": customer_data.get("ateco", ""),
-                        "codice_fiscale": customer_data.get("codice_fiscale", ""),
-                        "legale_rappresentante": customer_data.get("legale_rappresentante", ""),
-                        "telefono": customer_data.get("telefono", ""),
-                        "settore": customer_data.get("settore", ""),
-                        "partita_iva": customer_data.get("partita_iva", ""),
-                        "codice_fiscale_legale_rappresentante": customer_data.get("codice_fiscale_legale_rappresentante", ""),
-                        "email": customer_data.get("email", "")
-                    })
-                    self.notifier.show(f"Inserted new customer record: {customer_data.get('indirizzo', '')}")
+                customer_candidates.append((customer_data, HashUtil.hash_content(customer_data)))
 
-            if batch_customer_records:
-                self.db.insert_customer_batch(batch_customer_records)
+            if customer_candidates or modulo_candidates:
+                batch_customer_records, batch_modulo_records = self.db.insert_batches(
+                    customer_candidates, modulo_candidates
+                )
                 logging.info(f"Inserted {len(batch_customer_records)} new customer records in batch.")
-
-            if batch_modulo_records:
-                self.db.insert_modulo_batch(batch_modulo_records)
                 logging.info(f"Inserted {len(batch_modulo_records)} new modulo richiesta records in batch.")
 
+            inserted = {record["protocollo"] for record, _ in batch_customer_records}
+            for customer_data, _ in customer_candidates:
+                if customer_data["protocollo"] not in inserted:
+                    print(f"Duplicate record for {customer_data['protocollo']}, skipping insert")
+                    logging.warning(f"Duplicate record for {customer_data['protocollo']}, skipping insert")
+
+            for customer_data, _ in batch_customer_records:
+                new_data_to_send.append({
+                    "indirizzo": customer_data.get("indirizzo", ""),
+                    "sesso": customer_data.get("sesso", ""),
+                    "ateco": customer_data.get("ateco", ""),
+                    "codice_fiscale": customer_data.get("codice_fiscale", ""),
+                    "legale_rappresentante": customer_data.get("legale_rappresentante", ""),
+                    "telefono": customer_data.get("telefono", ""),
+                    "settore": customer_data.get("settore", ""),
+                    "partita_iva": customer_data.get("partita_iva", ""),
+                    "codice_fiscale_legale_rappresentante": customer_data.get("codice_fiscale_legale_rappresentante", ""),
+                    "email": customer_data.get("email", "")
+                })
+                self.notifier.show(f"Inserted new customer record: {customer_data.get('indirizzo', '')}")
+
         except Exception as e:
             logging.error(f"General scraping error: {e}", exc_info=True)
 
@@ -542,18 +598,20 @@ class ScrapeScheduler:
             print("✅ Script completed successfully.")
 
 if __name__ == "__main__":
+    # Both drivers share one resolved binary instead of each re-running the version check
+    service_path = ChromeDriverManager().install()
     options = webdriver.ChromeOptions()
     #options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--start-maximized")
     options.add_argument("--disable-dev-shm-usage")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = webdriver.Chrome(service=Service(service_path), options=options)
     wait = WebDriverWait(driver, 20)
 
     options1 = webdriver.ChromeOptions()
     options1.add_argument("--start-maximized")
-    driver1 = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options1)
+    driver1 = webdriver.Chrome(service=Service(service_path), options=options1)
 
     db_manager = DatabaseManager()
     notifier = PopupNotifier()
@@ -9,6 +9,7 @@ import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from psycopg2.extras import execute_values
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -65,6 +66,110 @@ CUSTOMER_DETAIL_FIELDS = [
     "settore", "partita_iva", "codice_fiscale_legale_rappresentante", "email"
 ]
 
+# (field, kind, element id) for every modulo richiesta field, read from the page in one script call
+MODULO_RICHIESTA_INPUTS = [
+    ("comune", "input", "module:j_id1488:0:j_id1849"),
+    ("provincia", "input", "module:j_id1488:0:j_id1851"),
+    ("indirizzo", "input", "module:j_id1488:0:j_id1853"),
+    ("cap", "input", "module:j_id1488:0:j_id1855"),
+    ("piano", "input", "module:j_id1488:0:j_id1857"),
+
+    ("appartamento_in_cond", "checkbox", "module:j_id1488:0:j_id1865"),
+    ("villa_a_schiera", "checkbox", "module:j_id1488:0:j_id1868"),
+    ("villa_isolata", "checkbox", "module:j_id1488:0:j_id1871"),
+    ("dimora_abituale", "checkbox", "module:j_id1488:0:j_id1874"),
+    ("dimora_saltuaria", "checkbox", "module:j_id1488:0:j_id1877"),
+    ("dimora_locata_a_terzi", "checkbox", "module:j_id1488:0:j_id1880"),
+
+    ("anno_di_costruzione", "input", "module:j_id1488:0:annoCostruzione"),
+    ("anno_ristrutturazione_impianti", "input", "module:j_id1488:0:annoRistrutturazioneImpianti"),
+
+    ("struttura_portante_in_muratura", "checkbox", "module:j_id1488:0:j_id1890"),
+    ("cappotto_termico", "checkbox", "module:j_id1488:0:j_id1893"),
+    ("struttura_portante_in_cemento_armato", "checkbox", "module:j_id1488:0:j_id1896"),
+    ("pannelli_solari_e_o_fotovoltaici", "checkbox", "module:j_id1488:0:j_id1899"),
+    ("struttura_portante_in_acciaio", "checkbox", "module:j_id1488:0:j_id1902"),
+    ("antisismico", "checkbox", "module:j_id1488:0:j_id1905"),
+    ("presenza_struttura_commerciale_e_o_ricreative", "checkbox", "module:j_id1488:0:j_id1908"),
+
+    ("vincolo", "checkbox", "module:j_id1488:0:j_id1926"),
+    ("ente_vincolatario", "input", "module:j_id1488:0:j_id1929"),
+    ("scadenza", "input", "module:j_id1488:0:j_id1931"),
+
+    ("immobile", "textarea", "module:j_id1488:0:j_id1937"),
+
+    # Sezione Incendio
+    ("incendio_fabbricato", "checkbox", "module:j_id1488:0:j_id1947"),
+    ("incendio_fabbricato_importo", "input", "module:j_id1488:0:j_id1949"),
+    ("incendio_contenuto", "checkbox", "module:j_id1488:0:j_id1951"),
+    ("incendio_contenuto_importo", "input", "module:j_id1488:0:j_id1953"),
+    ("rischio_locativo", "checkbox", "module:j_id1488:0:j_id1955"),
+    ("rischio_locativo_importo", "input", "module:j_id1488:0:j_id1957"),
+    ("ricorso_terzi", "checkbox", "module:j_id1488:0:j_id1959"),
+    ("ricorso_terzi_importo", "input", "module:j_id1488:0:j_id1961"),
+    ("fenomeno_elettrico", "checkbox", "module:j_id1488:0:j_id1963"),
+    ("fenomeno_elettrico_importo", "input", "module:j_id1488:0:j_id1965"),
+    ("acqua_condotta", "checkbox", "module:j_id1488:0:j_id1967"),
+    ("acqua_condotta_importo", "input", "module:j_id1488:0:j_id1969"),
+    ("spese_ricerca_e_riparazione_guasti", "checkbox", "module:j_id1488:0:j_id1971"),
+    ("spese_ricerca_e_riparazione_guasti_importo", "input", "module:j_id1488:0:j_id1973"),
+    ("cristalli", "checkbox", "module:j_id1488:0:j_id1975"),
+    ("cristalli_importo", "input", "module:j_id1488:0:j_id1977"),
+    ("eventi_atmosferici", "checkbox", "module:j_id1488:0:j_id1979"),
+    ("eventi_atmosferici_importo", "input", "module:j_id1488:0:j_id1981"),
+    ("eventi_sociopolitici", "checkbox", "module:j_id1488:0:j_id1983"),
+    ("eventi_sociopolitici_importo", "input", "module:j_id1488:0:j_id1985"),
+    ("pacchetto_extra", "checkbox", "module:j_id1488:0:j_id1987"),
+    ("pacchetto_extra_importo", "input", "module:j_id1488:0:j_id1989"),
+
+    # Sezione RC
+    ("rct", "checkbox", "module:j_id1488:0:j_id1999"),
+    ("rct_importo", "input", "module:j_id1488:0:j_id2001"),
+
+    # Sezione Furto
+    ("furto_contenuto", "checkbox", "module:j_id1488:0:j_id2011"),
+    ("furto_contenuto_importo", "input", "module:j_id1488:0:j_id2013"),
+    ("furto_gioielli_e_valori", "checkbox", "module:j_id1488:0:j_id2015"),
+    ("furto_gioielli_e_valori_importo", "input", "module:j_id1488:0:j_id2017"),
+    ("furto_rapina_estorsione", "checkbox", "module:j_id1488:0:j_id2019"),
+    ("furto_rapina_estorsione_importo", "input", "module:j_id1488:0:j_id2021"),
+
+    # Sezione Assistenza
+    ("allagamento_locali", "checkbox", "module:j_id1488:0:j_id2031"),
+    ("allagamento_locali_importo", "input", "module:j_id1488:0:j_id2033"),
+    ("pronto_intervento_per_danni_acqua", "checkbox", "module:j_id1488:0:j_id2035"),
+    ("pronto_intervento_per_danni_acqua_importo", "input", "module:j_id1488:0:j_id2037"),
+    ("invio_fabbro_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2039"),
+    ("invio_fabbro_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2041"),
+    ("invio_elettricista_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2043"),
+    ("invio_elettricista_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2045"),
+
+    # Sezione Tutela Legale
+    ("tutela_legale", "checkbox", "module:j_id1488:0:j_id2055"),
+    ("tutela_legale_importo", "input", "module:j_id1488:0:j_id2057"),
+
+    # Note (textarea)
+    ("note_sezione_incendio", "textarea", "module:j_id1488:0:j_id2064"),
+    ("note_sezione_rc", "textarea", "module:j_id1488:0:j_id2066"),
+    ("note_sezione_furto", "textarea", "module:j_id1488:0:j_id2068"),
+    ("note_sezione_assistenza", "textarea", "module:j_id1488:0:j_id2070"),
+    ("note_sezione_tutela_legale", "textarea", "module:j_id1488:0:j_id2072")
+]
+
+MODULO_RICHIESTA_JS = """
+return arguments[0].map(([name, kind, id]) => {
+    const elem = document.getElementById(id);
+    if (kind === "checkbox") {
+        return elem && elem.checked ? "checked" : "unchecked";
+    } else if (!elem) {
+        return "";
+    } else if (kind === "textarea") {
+        return elem.value || elem.textContent || "";
+    }
+    return (elem.value || "").trim();
+});
+"""
+
 class DatabaseManager:
     def __init__(self):
         self.conn = psycopg2.connect(
@@ -147,21 +252,18 @@ class DatabaseManager:
                 record["collegato a"],
                 content_hash,
             ))
-        self.cur.executemany(
+        execute_values(
+            self.cur,
             """
             INSERT INTO scraped_records_test (
               protocollo, avanzamento, inserita_il,
               prodotto, assegnata_a, richiedente,
               referente, cliente, progetto,
               collegato_a, content_hash
-            ) VALUES (
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
+            ) VALUES %s ON CONFLICT (protocollo) DO NOTHING
             """,
             insert_data,
+            page_size=500,
         )
         self.conn.commit()
 
@@ -259,120 +361,11 @@ class SeleniumHelper:
             )
             tab.click()
             wait.until(EC.presence_of_element_located((By.ID, "module:j_id1488:0:j_id1849")))
-            panel = wait.until(
+            wait.until(
                 EC.visibility_of_element_located((By.ID, "module:j_id1488:0td2"))
             )
-            fields = {}
-
-            def get_input_value(input_id):
-                try:
-                    elem = panel.find_element(By.ID, input_id)
-                    return elem.get_attribute("value").strip()
-                except Exception:
-                    return ""
-
-            def get_checkbox_value(input_id):
-                try:
-                    return "checked" if panel.find_element(By.ID, input_id).is_selected() else "unchecked"
-                except Exception:
-                    return "unchecked"
-
-            def get_textarea_value(textarea_id):
-                try:
-                    elem = panel.find_element(By.ID, textarea_id)
-                    return elem.get_attribute("value") or elem.text or ""
-                except Exception:
-                    return ""
-
-            # Fill all 43 fields by their HTML id (from your extract.html)
-            fields["comune"] = get_input_value("module:j_id1488:0:j_id1849")
-            fields["provincia"] = get_input_value("module:j_id1488:0:j_id1851")
-            fields["indirizzo"] = get_input_value("module:j_id1488:0:j_id1853")
-            fields["cap"] = get_input_value("module:j_id1488:0:j_id1855")
-            fields["piano"] = get_input_value("module:j_id1488:0:j_id1857")
-
-            fields["appartamento_in_cond"] = get_checkbox_value("module:j_id1488:0:j_id1865")
-            fields["villa_a_schiera"] = get_checkbox_value("module:j_id1488:0:j_id1868")
-            fields["villa_isolata"] = get_checkbox_value("module:j_id1488:0:j_id1871")
-            fields["dimora_abituale"] = get_checkbox_value("module:j_id1488:0:j_id1874")
-            fields["dimora_saltuaria"] = get_checkbox_value("module:j_id1488:0:j_id1877")
-            fields["dimora_locata_a_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1880")
-
-            fields["anno_di_costruzione"] = get_input_value("module:j_id1488:0:annoCostruzione")
-            fields["anno_ristrutturazione_impianti"] = get_input_value("module:j_id1488:0:annoRistrutturazioneImpianti")
-
-            fields["struttura_portante_in_muratura"] = get_checkbox_value("module:j_id1488:0:j_id1890")
-            fields["cappotto_termico"] = get_checkbox_value("module:j_id1488:0:j_id1893")
-            fields["struttura_portante_in_cemento_armato"] = get_checkbox_value("module:j_id1488:0:j_id1896")
-            fields["pannelli_solari_e_o_fotovoltaici"] = get_checkbox_value("module:j_id1488:0:j_id1899")
-            fields["struttura_portante_in_acciaio"] = get_checkbox_value("module:j_id1488:0:j_id1902")
-            fields["antisismico"] = get_checkbox_value("module:j_id1488:0:j_id1905")
-            fields["presenza_struttura_commerciale_e_o_ricreative"] = get_checkbox_value("module:j_id1488:0:j_id1908")
-
-            fields["vincolo"] = get_checkbox_value("module:j_id1488:0:j_id1926")
-            fields["ente_vincolatario"] = get_input_value("module:j_id1488:0:j_id1929")
-            fields["scadenza"] = get_input_value("module:j_id1488:0:j_id1931")
-
-            fields["immobile"] = get_textarea_value("module:j_id1488:0:j_id1937")
-
-            # Sezione Incendio
-            fields["incendio_fabbricato"] = get_checkbox_value("module:j_id1488:0:j_id1947")
-            fields["incendio_fabbricato_importo"] = get_input_value("module:j_id1488:0:j_id1949")
-            fields["incendio_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id1951")
-            fields["incendio_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id1953")
-            fields["rischio_locativo"] = get_checkbox_value("module:j_id1488:0:j_id1955")
-            fields["rischio_locativo_importo"] = get_input_value("module:j_id1488:0:j_id1957")
-            fields["ricorso_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1959")
-            fields["ricorso_terzi_importo"] = get_input_value("module:j_id1488:0:j_id1961")
-            fields["fenomeno_elettrico"] = get_checkbox_value("module:j_id1488:0:j_id1963")
-            fields["fenomeno_elettrico_importo"] = get_input_value("module:j_id1488:0:j_id1965")
-            fields["acqua_condotta"] = get_checkbox_value("module:j_id1488:0:j_id1967")
-            fields["acqua_condotta_importo"] = get_input_value("module:j_id1488:0:j_id1969")
-            fields["spese_ricerca_e_riparazione_guasti"] = get_checkbox_value("module:j_id1488:0:j_id1971")
-            fields["spese_ricerca_e_riparazione_guasti_importo"] = get_input_value("module:j_id1488:0:j_id1973")
-            fields["cristalli"] = get_checkbox_value("module:j_id1488:0:j_id1975")
-            fields["cristalli_importo"] = get_input_value("module:j_id1488:0:j_id1977")
-            fields["eventi_atmosferici"] = get_checkbox_value("module:j_id1488:0:j_id1979")
-            fields["eventi_atmosferici_importo"] = get_input_value("module:j_id1488:0:j_id1981")
-            fields["eventi_sociopolitici"] = get_checkbox_value("module:j_id1488:0:j_id1983")
-            fields["eventi_sociopolitici_importo"] = get_input_value("module:j_id1488:0:j_id1985")
-            fields["pacchetto_extra"] = get_checkbox_value("module:j_id1488:0:j_id1987")
-            fields["pacchetto_extra_importo"] = get_input_value("module:j_id1488:0:j_id1989")
-
-            # Sezione RC
-            fields["rct"] = get_checkbox_value("module:j_id1488:0:j_id1999")
-            fields["rct_importo"] = get_input_value("module:j_id1488:0:j_id2001")
-
-            # Sezione Furto
-            fields["furto_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id2011")
-            fields["furto_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id2013")
-            fields["furto_gioielli_e_valori"] = get_checkbox_value("module:j_id1488:0:j_id2015")
-            fields["furto_gioielli_e_valori_importo"] = get_input_value("module:j_id1488:0:j_id2017")
-            fields["furto_rapina_estorsione"] = get_checkbox_value("module:j_id1488:0:j_id2019")
-            fields["furto_rapina_estorsione_importo"] = get_input_value("module:j_id1488:0:j_id2021")
-
-            # Sezione Assistenza
-            fields["allagamento_locali"] = get_checkbox_value("module:j_id1488:0:j_id2031")
-            fields["allagamento_locali_importo"] = get_input_value("module:j_id1488:0:j_id2033")
-            fields["pronto_intervento_per_danni_acqua"] = get_checkbox_value("module:j_id1488:0:j_id2035")
-            fields["pronto_intervento_per_danni_acqua_importo"] = get_input_value("module:j_id1488:0:j_id2037")
-            fields["invio_fabbro_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2039")
-            fields["invio_fabbro_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2041")
-            fields["invio_elettricista_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2043")
-            fields["invio_elettricista_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2045")
-
-            # Sezione Tutela Legale
-            fields["tutela_legale"] = get_checkbox_value("module:j_id1488:0:j_id2055")
-            fields["tutela_legale_importo"] = get_input_value("module:j_id1488:0:j_id2057")
-
-            # Note (textarea)
-            fields["note_sezione_incendio"] = get_textarea_value("module:j_id1488:0:j_id2064")
-            fields["note_sezione_rc"] = get_textarea_value("module:j_id1488:0:j_id2066")
-            fields["note_sezione_furto"] = get_textarea_value("module:j_id1488:0:j_id2068")
-            fields["note_sezione_assistenza"] = get_textarea_value("module:j_id1488:0:j_id2070")
-            fields["note_sezione_tutela_legale"] = get_textarea_value("module:j_id1488:0:j_id2072")
-
-            return fields
+            values = driver.execute_script(MODULO_RICHIESTA_JS, MODULO_RICHIESTA_INPUTS)
+            return {name: value for (name, _, _), value in zip(MODULO_RICHIESTA_INPUTS, values)}
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
             return {}
@@ -1,15 +1,20 @@
 import os
 import json
 import time
-import hashlib
-import schedule
-import psycopg2
+import queue
+import xxhash
 import logging
+import signal
 import threading
 import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from functools import lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -29,6 +34,15 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 
+# customer_detail_records columns between protocollo and content_hash, in table order
+CUSTOMER_DETAIL_FIELDS = [
+    "indirizzo", "sesso", "ateco", "codice_fiscale", "legale_rappresentante", "telefono",
+    "settore", "partita_iva", "codice_fiscale_legale_rappresentante", "email"
+]
+
+# Browsers used for the website form submissions, driver1 included
+SUBMIT_WORKERS = int(os.getenv("SUBMIT_WORKERS", "4"))
+
 # Example mapping for 4 real websites
 WEBSITE_CONFIGS = [
     {
@@ -70,62 +84,159 @@ WEBSITE_CONFIGS = [
     }
 ]
 
+NAVIGATION_TABS = ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]
+
+# expected_conditions are stateless callables, so the fixed-locator ones are built once and shared
+TAB_CONDITIONS = {tab: EC.element_to_be_clickable((By.ID, tab)) for tab in NAVIGATION_TABS}
+DASHBOARD_CONDITION = EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard"))
+DETAIL_PANEL_CONDITION = EC.visibility_of_element_located((By.CLASS_NAME, "detail-panel"))
+MODULO_TAB_CONDITION = EC.element_to_be_clickable((By.XPATH, "//span[contains(text(),'Modulo richiesta')]"))
+MODULO_PANEL_CONDITION = EC.visibility_of_element_located(
+    (By.XPATH, "//div[contains(@class,'detail-panel') and .//span[contains(text(),'Modulo richiesta')]]")
+)
+SUBMIT_BUTTON_CONDITION = EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']"))
+
+# Click an element by id inside the page; false when it is not rendered
+CLICK_BY_ID_JS = """
+const elem = document.getElementById(arguments[0]);
+if (!elem) return false;
+elem.click();
+return true;
+"""
+
+# Protocollo text and detail button of every dashboard row, in one round trip
+DASHBOARD_ROWS_JS = """
+const outermostRow = (span) => {
+    // Same row ./ancestor::tr resolves to: the first, i.e. outermost, enclosing tr
+    let row = null;
+    for (let el = span.parentElement; el; el = el.parentElement) {
+        if (el.tagName === "TR") row = el;
+    }
+    return row;
+};
+return Array.from(arguments[0].querySelectorAll("tbody tr span[id*='j_id484']"), (span) => {
+    const row = outermostRow(span);
+    return {protocollo: span.innerText.trim(), button: row ? row.querySelector("a.icon-search") : null};
+});
+"""
+
+# (field name, value) for every header/value cell pair of the modulo panel's tables, in one round trip
+MODULO_RICHIESTA_PANEL_JS = """
+const data = [];
+for (const table of arguments[0].querySelectorAll("table")) {
+    const rows = table.querySelectorAll("tr");
+    if (rows.length < 2) continue;
+    const valueTds = rows[1].querySelectorAll("td");
+    rows[0].querySelectorAll("td").forEach((headerTd, i) => {
+        const valueTd = valueTds[i];
+        let value = "";
+        if (valueTd) {
+            const checkbox = valueTd.querySelector("input[type='checkbox']");
+            const span = valueTd.querySelector("span");
+            if (checkbox) value = checkbox.checked ? "checked" : "unchecked";
+            else value = (span || valueTd).innerText.trim();
+        }
+        data.push([headerTd.innerText.trim(), value]);
+    });
+}
+return data;
+"""
+
 class DatabaseManager:
-    def __init__(self):
-        self.conn = psycopg2.connect(
+    def __init__(self, minconn=2, maxconn=8):
+        # psycopg2 connections aren't thread-safe; every call borrows its own from the pool
+        self.pool = ThreadedConnectionPool(
+            minconn,
+            maxconn,
             dbname=DB_NAME,
             user=DB_USER,
             password=DB_PASSWORD,
             host=DB_HOST,
             port=DB_PORT
         )
-        self.cur = self.conn.cursor()
         self.create_tables()
+        self.load_existing_keys()
 
-    def create_tables(self):
-        self.cur.execute("""
-            CREATE TABLE IF NOT EXISTS customer_detail_records (
-              protocollo TEXT PRIMARY KEY,
-              indirizzo TEXT,
-              sesso TEXT,
-              ateco TEXT,
-              codice_fiscale TEXT,
-              legale_rappresentante TEXT,
-              telefono TEXT,
-              settore TEXT,
-              partita_iva TEXT,
-              codice_fiscale_legale_rappresentante TEXT,
-              email TEXT,
-              content_hash TEXT UNIQUE
-            )
-        """)
-        self.cur.execute("""
-            CREATE TABLE IF NOT EXISTS modulo_richiesta_records (
-              protocollo TEXT,
-              field_name TEXT,
-              field_value TEXT,
-              content_hash TEXT UNIQUE
-            )
-        """)
-        self.conn.commit()
+    @contextmanager
+    def cursor(self):
+        # One transaction per block: commit on success, roll back on error, always return the connection
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
 
-    def protocollo_exists(self, protocollo):
-        self.cur.execute(
-            "SELECT 1 FROM customer_detail_records WHERE protocollo = %s", (protocollo,)
+    def create_tables(self):
+        with self.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS customer_detail_records (
+                  protocollo TEXT PRIMARY KEY,
+                  indirizzo TEXT,
+                  sesso TEXT,
+                  ateco TEXT,
+                  codice_fiscale TEXT,
+                  legale_rappresentante TEXT,
+                  telefono TEXT,
+                  settore TEXT,
+                  partita_iva TEXT,
+                  codice_fiscale_legale_rappresentante TEXT,
+                  email TEXT,
+                  content_hash TEXT UNIQUE
+                )
+            """)
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS modulo_richiesta_records (
+                  protocollo TEXT,
+                  field_name TEXT,
+                  field_value TEXT,
+                  content_hash TEXT UNIQUE
+                )
+            """)
+
+    def load_existing_keys(self):
+        # Seed the in-process caches once; afterwards only unseen keys reach the database
+        with self.cursor() as cur:
+            cur.execute("SELECT protocollo, content_hash FROM customer_detail_records")
+            rows = cur.fetchall()
+            self._proto_set = {r[0] for r in rows}
+            self._cust_hash_set = {r[1] for r in rows if r[1]}
+            cur.execute("SELECT content_hash FROM modulo_richiesta_records")
+            self._modulo_hash_set = {r[0] for r in cur.fetchall() if r[0]}
+
+    def _existing(self, cache, query, keys):
+        # Cache misses are resolved with a single = ANY(%s) round trip
+        unknown = list({k for k in keys if k not in cache})
+        if unknown:
+            with self.cursor() as cur:
+                cur.execute(query, (unknown,))
+                cache.update(r[0] for r in cur.fetchall())
+        return {k for k in keys if k in cache}
+
+    def existing_protocolli(self, protocolli):
+        return self._existing(
+            self._proto_set,
+            "SELECT protocollo FROM customer_detail_records WHERE protocollo = ANY(%s)",
+            protocolli
         )
-        return self.cur.fetchone() is not None
 
-    def hash_exists_customer(self, content_hash):
-        self.cur.execute(
-            "SELECT 1 FROM customer_detail_records WHERE content_hash = %s", (content_hash,)
+    def existing_customer_hashes(self, hashes):
+        return self._existing(
+            self._cust_hash_set,
+            "SELECT content_hash FROM customer_detail_records WHERE content_hash = ANY(%s)",
+            hashes
         )
-        return self.cur.fetchone() is not None
 
-    def hash_exists_modulo(self, content_hash):
-        self.cur.execute(
-            "SELECT 1 FROM modulo_richiesta_records WHERE content_hash = %s", (content_hash,)
+    def existing_modulo_hashes(self, hashes):
+        return self._existing(
+            self._modulo_hash_set,
+            "SELECT content_hash FROM modulo_richiesta_records WHERE content_hash = ANY(%s)",
+            hashes
         )
-        return self.cur.fetchone() is not None
 
     def insert_customer_batch(self, records):
         insert_data = []
@@ -144,21 +255,22 @@ class DatabaseManager:
                 record["email"],
                 content_hash,
             ))
-        self.cur.executemany(
-            """
-            INSERT INTO customer_detail_records (
-              protocollo, indirizzo, sesso, ateco,
-              codice_fiscale, legale_rappresentante, telefono, settore,
-              partita_iva, codice_fiscale_legale_rappresentante, email, content_hash
-            ) VALUES (
-              %s, %s, %s, %s,
-              %s, %s, %s, %s,
-              %s, %s, %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
-            """,
-            insert_data,
-        )
-        self.conn.commit()
+        with self.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO customer_detail_records (
+                  protocollo, indirizzo, sesso, ateco,
+                  codice_fiscale, legale_rappresentante, telefono, settore,
+                  partita_iva, codice_fiscale_legale_rappresentante, email, content_hash
+                ) VALUES %s ON CONFLICT (protocollo) DO NOTHING
+                """,
+                insert_data,
+                page_size=500,
+            )
+        # Committed: conflicts were already in the table, so every key is now known
+        self._proto_set.update(record["protocollo"] for record, _ in records)
+        self._cust_hash_set.update(content_hash for _, content_hash in records)
 
     def insert_modulo_batch(self, records):
         insert_data = []
@@ -169,44 +281,82 @@ class DatabaseManager:
                 record["field_value"],
                 record["content_hash"]
             ))
-        self.cur.executemany(
-            """
-            INSERT INTO modulo_richiesta_records (
-              protocollo, field_name, field_value, content_hash
-            ) VALUES (
-              %s, %s, %s, %s
-            ) ON CONFLICT (content_hash) DO NOTHING
-            """,
-            insert_data,
-        )
-        self.conn.commit()
+        with self.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO modulo_richiesta_records (
+                  protocollo, field_name, field_value, content_hash
+                ) VALUES %s ON CONFLICT (content_hash) DO NOTHING
+                """,
+                insert_data,
+                page_size=500,
+            )
+        self._modulo_hash_set.update(record["content_hash"] for record in records)
 
     def close(self):
-        self.conn.close()
+        self.pool.closeall()
 
 class PopupNotifier:
-    def show(self, msg, title="Success"):
-        root = tk.Tk()
-        root.overrideredirect(True)
-        root.attributes("-topmost", True)
+    # One hidden Tk root per process, owned by a daemon thread; show() only enqueues
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.queue = queue.Queue()
+                instance.root = None
+                instance.thread = None
+                instance.open_popups = []
+                cls._instance = instance
+        return cls._instance
 
+    def show(self, msg, title="Success"):
+        with self._instance_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="PopupNotifier", daemon=True)
+                self.thread.start()
+        self.queue.put((msg, title))
+
+    def _run(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.root.after(50, self._pump)
+        self.root.mainloop()
+
+    def _pump(self):
+        while True:
+            try:
+                msg, title = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._popup(msg, title)
+        self.root.after(50, self._pump)
+
+    def _close(self, popup):
+        self.open_popups.remove(popup)
+        popup.destroy()
+
+    def _popup(self, msg, title):
+        popup = tk.Toplevel(self.root)
+        popup.overrideredirect(True)
+        popup.attributes("-topmost", True)
         width, height = 360, 110
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
+        screen_width = popup.winfo_screenwidth()
+        screen_height = popup.winfo_screenheight()
         x = screen_width - width - 20
-        y = screen_height - height - 120
-        root.geometry(f"{width}x{height}+{x}+{y}")
-
-        container = tk.Frame(root, bg="white", bd=0)
+        y = screen_height - height - 120 - len(self.open_popups) * (height + 10)
+        popup.geometry(f"{width}x{height}+{x}+{y}")
+        container = tk.Frame(popup, bg="white", bd=0)
         container.place(relwidth=1, relheight=1)
-
         stripe_margin_x = 8
         stripe_margin_y = 12
         stripe_height = height - stripe_margin_y * 2
         stripe = tk.Canvas(container, width=12, height=stripe_height, bg="white", highlightthickness=0)
         stripe.place(x=stripe_margin_x, y=stripe_margin_y)
         stripe.create_rectangle(0, 0, 12, stripe_height, fill="#27ae60", outline="")
-
         title_label = tk.Label(
             container,
             text=title,
@@ -216,7 +366,6 @@ class PopupNotifier:
             anchor="w"
         )
         title_label.place(x=28, y=18)
-
         message = tk.Label(
             container,
             text=msg,
@@ -228,9 +377,8 @@ class PopupNotifier:
             wraplength=300
         )
         message.place(x=28, y=50)
-
-        root.after(4000, root.destroy)
-        root.mainloop()
+        self.open_popups.append(popup)
+        popup.after(4000, lambda: self._close(popup))
 
 class SeleniumHelper:
     @staticmethod
@@ -250,9 +398,7 @@ class SeleniumHelper:
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
     def extract_customer_detail_panel(wait):
         try:
-            panel = wait.until(
-                EC.visibility_of_element_located((By.CLASS_NAME, "detail-panel"))
-            )
+            panel = wait.until(DETAIL_PANEL_CONDITION)
             tables = panel.find_elements(By.TAG_NAME, "table")
             data = {}
             for table in tables:
@@ -273,59 +419,29 @@ class SeleniumHelper:
 
     @staticmethod
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
-    def extract_modulo_richiesta_panel(wait):
+    def extract_modulo_richiesta_panel(wait, driver):
         try:
-            tab = wait.until(
-                EC.element_to_be_clickable((By.XPATH, "//span[contains(text(),'Modulo richiesta')]"))
-            )
+            tab = wait.until(MODULO_TAB_CONDITION)
             tab.click()
-            panel = wait.until(
-                EC.visibility_of_element_located((By.XPATH, "//div[contains(@class,'detail-panel') and .//span[contains(text(),'Modulo richiesta')]]"))
-            )
-            tables = panel.find_elements(By.TAG_NAME, "table")
-            data = []
-            for table in tables:
-                rows = table.find_elements(By.TAG_NAME, "tr")
-                if len(rows) < 2:
-                    continue
-                header_tds = rows[0].find_elements(By.TAG_NAME, "td")
-                value_tds = rows[1].find_elements(By.TAG_NAME, "td")
-                for i, header_td in enumerate(header_tds):
-                    field_name = header_td.text.strip()
-                    value_td = value_tds[i] if i < len(value_tds) else None
-                    field_value = ""
-                    checkbox = None
-                    try:
-                        checkbox = value_td.find_element(By.XPATH, ".//input[@type='checkbox']")
-                    except Exception:
-                        checkbox = None
-                    if checkbox:
-                        field_value = "checked" if checkbox.is_selected() else "unchecked"
-                    else:
-                        spans = value_td.find_elements(By.TAG_NAME, "span")
-                        if spans:
-                            field_value = spans[0].text.strip()
-                        else:
-                            field_value = value_td.text.strip()
-                    if not field_value:
-                        field_value = ""
-                    data.append((field_name, field_value))
-            return data
+            panel = wait.until(MODULO_PANEL_CONDITION)
+            return [tuple(pair) for pair in driver.execute_script(MODULO_RICHIESTA_PANEL_JS, panel)]
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
             return []
 
 class HashUtil:
+    # Only ever compared for equality in a UNIQUE column, so a fast non-cryptographic
+    # 128-bit hash does the job; the column stays TEXT
     @staticmethod
     def hash_content(data_dict):
-        filtered_dict = {k: v for k, v in data_dict.items() if k != "protocollo"}
-        content_str = "|".join(str(v) for v in filtered_dict.values())
-        return hashlib.sha256(content_str.encode("utf-8")).hexdigest()
+        # Fixed column order, so the hash doesn't depend on how the panel was read; \x1f can't occur in cell text
+        content_str = "\x1f".join(str(data_dict.get(f, "")) for f in CUSTOMER_DETAIL_FIELDS)
+        return xxhash.xxh3_128_hexdigest(content_str.encode("utf-8"))
 
     @staticmethod
     def hash_modulo(protocollo, field_name, field_value):
         content_str = f"{protocollo}|{field_name}|{field_value}"
-        return hashlib.sha256(content_str.encode("utf-8")).hexdigest()
+        return xxhash.xxh3_128_hexdigest(content_str.encode("utf-8"))
 
 class WebsiteFormSubmitter:
     @staticmethod
@@ -353,30 +469,60 @@ class WebsiteFormSubmitter:
                 logging.warning(f"Could not set field {field_name} on {site_config['name']}: {e}")
         # Submit the form (assuming a submit button with type='submit')
         try:
-            submit_btn = wait.until(EC.element_to_be_clickable((By.XPATH, "//button[@type='submit']")))
+            submit_btn = wait.until(SUBMIT_BUTTON_CONDITION)
             submit_btn.click()
         except Exception as e:
             logging.warning(f"Could not submit form on {site_config['name']}: {e}")
 
 class Scraper:
-    def __init__(self, driver, driver1, wait, db_manager, notifier):
+    def __init__(self, driver, driver1, wait, db_manager, notifier, submit_drivers=None):
         self.driver = driver
         self.driver1 = driver1
         self.wait = wait
         self.db = db_manager
         self.notifier = notifier
-        self.success_log = []
-        self.failed_log = []
+        # Line-buffered append: each result hits the file as soon as it's known and survives a crash
+        self.success_log = self._open_report("form_submission_report.txt", "Successful Submissions\n=======================\n\n")
+        self.failed_log = self._open_report("failed_submission_log.txt", "Failed Submissions\n===================\n\n")
+        # Each submission borrows a driver from the pool, so at most one job runs per browser
+        self.submit_drivers = submit_drivers or [driver1]
+        self.driver_pool = queue.Queue()
+        for submit_driver in self.submit_drivers:
+            self.driver_pool.put(submit_driver)
 
-    def decide_websites(self, modulo_data_dict):
-        # Example logic: send to all if "SomeCheckbox" is checked, else skip Site4
-        send_sites = []
-        some_checkbox = modulo_data_dict.get("SomeCheckbox", "")
+    @staticmethod
+    def _open_report(path, header):
+        report = open(path, "a", encoding="utf-8", buffering=1)
+        if report.tell() == 0:
+            report.write(header)
+        return report
+
+    def close_reports(self):
+        self.success_log.close()
+        self.failed_log.close()
+
+    def _submit_one(self, job):
+        protocollo, site_config, modulo_data_dict = job
+        submit_driver = self.driver_pool.get()
+        try:
+            WebsiteFormSubmitter.submit_form(submit_driver, site_config, modulo_data_dict)
+            return True, f"Sent modulo richiesta for {protocollo} to {site_config['name']}"
+        except Exception as e:
+            return False, f"Failed to send modulo richiesta for {protocollo} to {site_config['name']}: {e}"
+        finally:
+            self.driver_pool.put(submit_driver)
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _sites_for(some_checkbox):
+        # Example logic: send to all if "SomeCheckbox" is checked, else skip Site4.
+        # Tuples, since the cached result is shared between calls.
         if some_checkbox == "checked":
-            send_sites = WEBSITE_CONFIGS
-        else:
-            send_sites = [site for site in WEBSITE_CONFIGS if site["name"] != "Site4"]
-        return send_sites
+            return tuple(WEBSITE_CONFIGS)
+        return tuple(site for site in WEBSITE_CONFIGS if site["name"] != "Site4")
+
+    def decide_websites(self, modulo_data_dict):
+        return self._sites_for(modulo_data_dict.get("SomeCheckbox", ""))
 
     def scrape(self):
         logging.info("Scraping started...")
@@ -384,38 +530,45 @@ class Scraper:
         batch_customer_records = []
         batch_modulo_records = []
         modulo_batch_for_websites = []
+        customer_candidates = []
+        modulo_candidates = []
 
         try:
             self.driver.get(os.getenv("OMNIA_URL"))
 
-            for tab in ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]:
-                try:
-                    WebDriverWait(self.driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
-                except Exception:
-                    logging.warning(f"Tab {tab} not clickable, skipping.")
+            # When the dashboard tab is already on the landing page, one scripted click replaces the tab walk
+            if not self.driver.execute_script(CLICK_BY_ID_JS, NAVIGATION_TABS[-1]):
+                for tab in NAVIGATION_TABS:
+                    try:
+                        WebDriverWait(self.driver, 7).until(TAB_CONDITIONS[tab]).click()
+                    except Exception:
+                        logging.warning(f"Tab {tab} not clickable, skipping.")
 
-            table = WebDriverWait(self.driver, 7).until(EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard")))
+            table = WebDriverWait(self.driver, 7).until(DASHBOARD_CONDITION)
 
-            spans = table.find_elements(By.XPATH, ".//tbody//tr//span[contains(@id,'j_id484')]")
+            rows = self.driver.execute_script(DASHBOARD_ROWS_JS, table)
+            existing_protocolli = self.db.existing_protocolli([row["protocollo"] for row in rows if row["protocollo"]])
 
-            for span in spans:
-                protocollo = span.text.strip()
+            for row in rows:
+                protocollo = row["protocollo"]
                 if not protocollo:
                     continue
 
-                if self.db.protocollo_exists(protocollo):
-                    print(f"Skipping existing protocollo {protocollo}")
-                    logging.debug(f"Skipping existing protocollo {protocollo}")
+                if protocollo in existing_protocolli:
+                    # Lazy %-args: nothing is formatted unless DEBUG is on, and no extra stdout write
+                    logging.debug("Skipping existing protocollo %s", protocollo)
                     continue
 
-                row = span.find_element(By.XPATH, "./ancestor::tr")
-                button = row.find_element(By.CSS_SELECTOR, "a.icon-search")
+                button = row["button"]
+                if button is None:
+                    logging.warning(f"No detail button for protocollo {protocollo}, skipping.")
+                    continue
                 try:
                     WebDriverWait(self.driver, 3).until(EC.element_to_be_clickable(button)).click()
                 except Exception:
                     SeleniumHelper.click(self.driver, button)
 
-                detail_panel = self.wait.until(EC.visibility_of_element_located((By.CLASS_NAME, "detail-panel")))
+                detail_panel = self.wait.until(DETAIL_PANEL_CONDITION)
 
                 try:
                     cliente_link = detail_panel.find_element(By.XPATH, ".//span[text()='Cliente']/ancestor::td/following-sibling::td//a")
@@ -431,40 +584,55 @@ class Scraper:
                 customer_data["protocollo"] = protocollo
                 content_hash = HashUtil.hash_content(customer_data)
 
-                if self.db.hash_exists_customer(content_hash):
-                    print(f"Duplicate hash for {protocollo}, skipping insert")
-                    logging.warning(f"Duplicate hash for {protocollo}, skipping insert")
-                else:
-                    batch_customer_records.append((customer_data, content_hash))
-                    new_data_to_send.append({
-                        "indirizzo": customer_data.get("indirizzo", ""),
-                        "sesso": customer_data.get("sesso", ""),
-                        "ateco": customer_data.get("ateco", ""),
-                        "codice_fiscale": customer_data.get("codice_fiscale", ""),
-                        "legale_rappresentante": customer_data.get("legale_rappresentante", ""),
-                        "telefono": customer_data.get("telefono", ""),
-                        "settore": customer_data.get("settore", ""),
-                        "partita_iva": customer_data.get("partita_iva", ""),
-                        "codice_fiscale_legale_rappresentante": customer_data.get("codice_fiscale_legale_rappresentante", ""),
-                        "email": customer_data.get("email", "")
-                    })
-                    self.notifier.show(f"Inserted new customer record: {customer_data.get('indirizzo', '')}")
+                customer_candidates.append((customer_data, content_hash))
 
-                modulo_data = SeleniumHelper.extract_modulo_richiesta_panel(self.wait)
-                modulo_data_dict = {field_name: field_value for field_name, field_value in modulo_data}
-                new_modulo_found = False
+                modulo_data = SeleniumHelper.extract_modulo_richiesta_panel(self.wait, self.driver)
+                # Single pass: the submit payload and the hashed rows come out of the same walk
+                modulo_data_dict = {}
+                modulo_records = []
                 for field_name, field_value in modulo_data:
-                    modulo_hash = HashUtil.hash_modulo(protocollo, field_name, field_value)
-                    if not self.db.hash_exists_modulo(modulo_hash):
-                        batch_modulo_records.append({
-                            "protocollo": protocollo,
-                            "field_name": field_name,
-                            "field_value": field_value,
-                            "content_hash": modulo_hash
-                        })
-                        new_modulo_found = True
-                if new_modulo_found:
-                    modulo_batch_for_websites.append((protocollo, modulo_data_dict))
+                    modulo_data_dict[field_name] = field_value
+                    modulo_records.append({
+                        "protocollo": protocollo,
+                        "field_name": field_name,
+                        "field_value": field_value,
+                        "content_hash": HashUtil.hash_modulo(protocollo, field_name, field_value)
+                    })
+                modulo_candidates.append((protocollo, modulo_data_dict, modulo_records))
+
+            # Dedup the whole cycle against the DB with one hash lookup per table
+            seen_customer = self.db.existing_customer_hashes([h for _, h in customer_candidates])
+            for customer_data, content_hash in customer_candidates:
+                protocollo = customer_data["protocollo"]
+                if content_hash in seen_customer:
+                    logging.warning("Duplicate hash for %s, skipping insert", protocollo)
+                    continue
+                seen_customer.add(content_hash)
+                batch_customer_records.append((customer_data, content_hash))
+                new_data_to_send.append({
+                    "indirizzo": customer_data.get("indirizzo", ""),
+                    "sesso": customer_data.get("sesso", ""),
+                    "ateco": customer_data.get("ateco", ""),
+                    "codice_fiscale": customer_data.get("codice_fiscale", ""),
+                    "legale_rappresentante": customer_data.get("legale_rappresentante", ""),
+                    "telefono": customer_data.get("telefono", ""),
+                    "settore": customer_data.get("settore", ""),
+                    "partita_iva": customer_data.get("partita_iva", ""),
+                    "codice_fiscale_legale_rappresentante": customer_data.get("codice_fiscale_legale_rappresentante", ""),
+                    "email": customer_data.get("email", "")
+                })
+                self.notifier.show(f"Inserted new customer record: {customer_data.get('indirizzo', '')}")
+
+            seen_modulo = self.db.existing_modulo_hashes(
+                [record["content_hash"] for _, _, records in modulo_candidates for record in records]
+            )
+            for protocollo, modulo_data_dict, modulo_records in modulo_candidates:
+                new_records = [record for record in modulo_records if record["content_hash"] not in seen_modulo]
+                if not new_records:
+                    continue
+                seen_modulo.update(record["content_hash"] for record in new_records)
+                batch_modulo_records.extend(new_records)
+                modulo_batch_for_websites.append((protocollo, modulo_data_dict))
 
             if batch_customer_records:
                 self.db.insert_customer_batch(batch_customer_records)
@@ -475,32 +643,24 @@ class Scraper:
                 logging.info(f"Inserted {len(batch_modulo_records)} new modulo richiesta records in batch.")
 
             # Send new modulo richiesta data to websites
-            for protocollo, modulo_data_dict in modulo_batch_for_websites:
-                target_sites = self.decide_websites(modulo_data_dict)
-                for site_config in target_sites:
-                    try:
-                        WebsiteFormSubmitter.submit_form(self.driver1, site_config, modulo_data_dict)
-                        self.success_log.append(f"Sent modulo richiesta for {protocollo} to {site_config['name']}")
-                    except Exception as e:
-                        self.failed_log.append(f"Failed to send modulo richiesta for {protocollo} to {site_config['name']}: {e}")
+            jobs = [
+                (protocollo, site_config, modulo_data_dict)
+                for protocollo, modulo_data_dict in modulo_batch_for_websites
+                for site_config in self.decide_websites(modulo_data_dict)
+            ]
+            if jobs:
+                # Logs are filled here from the return values, never from the worker threads
+                with ThreadPoolExecutor(max_workers=len(self.submit_drivers)) as executor:
+                    for ok, message in executor.map(self._submit_one, jobs):
+                        (self.success_log if ok else self.failed_log).write(message + "\n")
 
         except Exception as e:
             logging.error(f"General scraping error: {e}", exc_info=True)
 
-        finally:
-            with open("form_submission_report.txt", "w", encoding="utf-8") as rpt:
-                rpt.write("Successful Submissions\n=======================\n\n")
-                rpt.write("\n".join(self.success_log))
-
-            with open("failed_submission_log.txt", "w", encoding="utf-8") as rpt:
-                rpt.write("Failed Submissions\n===================\n\n")
-                rpt.write("\n".join(self.failed_log))
-
-            print("\n📁 Reports saved.")
-
 class ScrapeScheduler:
     def __init__(self, scraper):
         self.scraper = scraper
+        self.shutdown_event = threading.Event()
 
     def threaded_scrape(self):
         if scrape_lock.locked():
@@ -513,37 +673,70 @@ class ScrapeScheduler:
 
         threading.Thread(target=run_task, name="ScrapeThread").start()
 
+    def stop(self, *_):
+        # Wakes the wait in start() at once; also the SIGTERM handler
+        self.shutdown_event.set()
+
     def start(self, interval_seconds=20):
-        schedule.every(interval_seconds).seconds.do(self.threaded_scrape)
+        signal.signal(signal.SIGTERM, self.stop)
         print(f"🧵 Multithreaded scheduler is running every {interval_seconds} seconds...\n")
+        next_run = time.monotonic() + interval_seconds
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            # Sleep until the next cycle is due or stop() is called, instead of waking every second to poll
+            while not self.shutdown_event.wait(max(0, next_run - time.monotonic())):
+                self.threaded_scrape()
+                next_run += interval_seconds
+                now = time.monotonic()
+                if next_run <= now:
+                    next_run = now + interval_seconds
         except KeyboardInterrupt:
             print("🛑 Script interrupted. Cleaning up...")
-            self.scraper.db.close()
-            self.scraper.driver.quit()
-            self.scraper.driver1.quit()
-            print("✅ Script completed successfully.")
+        finally:
+            self.close()
+
+    def close(self):
+        # A scrape still in flight finishes before its browsers and connection go away
+        with scrape_lock:
+            try:
+                self.scraper.db.close()
+                self.scraper.driver.quit()
+                for submit_driver in self.scraper.submit_drivers:
+                    submit_driver.quit()
+            finally:
+                # Report handles are held open for the whole run; release them even if a browser fails to quit
+                self.scraper.close_reports()
+        print("✅ Script completed successfully.")
 
 if __name__ == "__main__":
+    # Resolve the driver binary once for every browser; CHROMEDRIVER_PATH skips webdriver_manager entirely
+    service_path = os.getenv("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+
     options = webdriver.ChromeOptions()
     #options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--start-maximized")
     options.add_argument("--disable-dev-shm-usage")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = webdriver.Chrome(service=Service(service_path), options=options)
     wait = WebDriverWait(driver, 20)
 
     options1 = webdriver.ChromeOptions()
     options1.add_argument("--start-maximized")
-    driver1 = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options1)
+    driver1 = webdriver.Chrome(service=Service(service_path), options=options1)
+
+    # Extra headless browsers so the website submissions run side by side with driver1
+    submit_options = webdriver.ChromeOptions()
+    submit_options.add_argument("--headless=new")
+    submit_options.add_argument("--no-sandbox")
+    submit_options.add_argument("--disable-dev-shm-usage")
+    submit_drivers = [driver1] + [
+        webdriver.Chrome(service=Service(service_path), options=submit_options)
+        for _ in range(SUBMIT_WORKERS - 1)
+    ]
 
     db_manager = DatabaseManager()
     notifier = PopupNotifier()
-    scraper = Scraper(driver, driver1, wait, db_manager, notifier)
+    scraper = Scraper(driver, driver1, wait, db_manager, notifier, submit_drivers)
     scheduler = ScrapeScheduler(scraper)
     scheduler.start(interval_seconds=20)
     print("✅ Script started successfully.")
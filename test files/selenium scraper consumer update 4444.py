@@ -9,6 +9,7 @@ import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from psycopg2.extras import execute_values
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -67,6 +68,146 @@ CUSTOMER_DETAIL_FIELDS = [
     "settore", "partita_iva", "codice_fiscale_legale_rappresentante", "email"
 ]
 
+# Second-row cells of each customer detail table, in field order
+CUSTOMER_DETAIL_TABLES = [
+    ("customerViewForm:j_id2586", ["indirizzo", "sesso", "ateco"]),
+    ("customerViewForm:j_id2606", ["codice_fiscale", "legale_rappresentante", "telefono", "settore"]),
+    ("customerViewForm:j_id2621", ["partita_iva", "codice_fiscale_legale_rappresentante", "email"])
+]
+
+# nome_cliente plus every CUSTOMER_DETAIL_TABLES cell in one round trip; null when a table is missing or short
+CUSTOMER_DETAIL_JS = """
+const panel = arguments[0];
+const link = document.querySelector("[id='customerViewForm:j_id2433'] a");
+const data = {nome_cliente: link ? link.innerText.trim() : ""};
+for (const [id, fields] of arguments[1]) {
+    const table = document.getElementById(id);
+    if (!table || !panel.contains(table)) return null;
+    const rows = table.getElementsByTagName("tr");
+    if (rows.length < 2) continue;
+    const cells = rows[1].getElementsByTagName("td");
+    if (cells.length < fields.length) return null;
+    fields.forEach((field, i) => { data[field] = cells[i].innerText.trim(); });
+}
+return data;
+"""
+
+# (field, kind, element id) for every modulo richiesta field, read from the page in one script call
+MODULO_RICHIESTA_INPUTS = [
+    ("comune", "input", "module:j_id1488:0:j_id1849"),
+    ("provincia", "input", "module:j_id1488:0:j_id1851"),
+    ("indirizzo", "input", "module:j_id1488:0:j_id1853"),
+    ("cap", "input", "module:j_id1488:0:j_id1855"),
+    ("piano", "input", "module:j_id1488:0:j_id1857"),
+
+    ("appartamento_in_cond", "checkbox", "module:j_id1488:0:j_id1865"),
+    ("villa_a_schiera", "checkbox", "module:j_id1488:0:j_id1868"),
+    ("villa_isolata", "checkbox", "module:j_id1488:0:j_id1871"),
+    ("dimora_abituale", "checkbox", "module:j_id1488:0:j_id1874"),
+    ("dimora_saltuaria", "checkbox", "module:j_id1488:0:j_id1877"),
+    ("dimora_locata_a_terzi", "checkbox", "module:j_id1488:0:j_id1880"),
+
+    ("anno_di_costruzione", "input", "module:j_id1488:0:annoCostruzione"),
+    ("anno_ristrutturazione_impianti", "input", "module:j_id1488:0:annoRistrutturazioneImpianti"),
+
+    ("struttura_portante_in_muratura", "checkbox", "module:j_id1488:0:j_id1890"),
+    ("cappotto_termico", "checkbox", "module:j_id1488:0:j_id1893"),
+    ("struttura_portante_in_cemento_armato", "checkbox", "module:j_id1488:0:j_id1896"),
+    ("pannelli_solari_e_o_fotovoltaici", "checkbox", "module:j_id1488:0:j_id1899"),
+    ("struttura_portante_in_acciaio", "checkbox", "module:j_id1488:0:j_id1902"),
+    ("antisismico", "checkbox", "module:j_id1488:0:j_id1905"),
+    ("presenza_struttura_commerciale_e_o_ricreative", "checkbox", "module:j_id1488:0:j_id1908"),
+
+    ("vincolo", "checkbox", "module:j_id1488:0:j_id1926"),
+    ("ente_vincolatario", "input", "module:j_id1488:0:j_id1929"),
+    ("scadenza", "input", "module:j_id1488:0:j_id1931"),
+
+    ("immobile", "textarea", "module:j_id1488:0:j_id1937"),
+
+    # Sezione Incendio
+    ("incendio_fabbricato", "checkbox", "module:j_id1488:0:j_id1947"),
+    ("incendio_fabbricato_importo", "input", "module:j_id1488:0:j_id1949"),
+    ("incendio_contenuto", "checkbox", "module:j_id1488:0:j_id1951"),
+    ("incendio_contenuto_importo", "input", "module:j_id1488:0:j_id1953"),
+    ("rischio_locativo", "checkbox", "module:j_id1488:0:j_id1955"),
+    ("rischio_locativo_importo", "input", "module:j_id1488:0:j_id1957"),
+    ("ricorso_terzi", "checkbox", "module:j_id1488:0:j_id1959"),
+    ("ricorso_terzi_importo", "input", "module:j_id1488:0:j_id1961"),
+    ("fenomeno_elettrico", "checkbox", "module:j_id1488:0:j_id1963"),
+    ("fenomeno_elettrico_importo", "input", "module:j_id1488:0:j_id1965"),
+    ("acqua_condotta", "checkbox", "module:j_id1488:0:j_id1967"),
+    ("acqua_condotta_importo", "input", "module:j_id1488:0:j_id1969"),
+    ("spese_ricerca_e_riparazione_guasti", "checkbox", "module:j_id1488:0:j_id1971"),
+    ("spese_ricerca_e_riparazione_guasti_importo", "input", "module:j_id1488:0:j_id1973"),
+    ("cristalli", "checkbox", "module:j_id1488:0:j_id1975"),
+    ("cristalli_importo", "input", "module:j_id1488:0:j_id1977"),
+    ("eventi_atmosferici", "checkbox", "module:j_id1488:0:j_id1979"),
+    ("eventi_atmosferici_importo", "input", "module:j_id1488:0:j_id1981"),
+    ("eventi_sociopolitici", "checkbox", "module:j_id1488:0:j_id1983"),
+    ("eventi_sociopolitici_importo", "input", "module:j_id1488:0:j_id1985"),
+    ("pacchetto_extra", "checkbox", "module:j_id1488:0:j_id1987"),
+    ("pacchetto_extra_importo", "input", "module:j_id1488:0:j_id1989"),
+
+    # Sezione RC
+    ("rct", "checkbox", "module:j_id1488:0:j_id1999"),
+    ("rct_importo", "input", "module:j_id1488:0:j_id2001"),
+
+    # Sezione Furto
+    ("furto_contenuto", "checkbox", "module:j_id1488:0:j_id2011"),
+    ("furto_contenuto_importo", "input", "module:j_id1488:0:j_id2013"),
+    ("furto_gioielli_e_valori", "checkbox", "module:j_id1488:0:j_id2015"),
+    ("furto_gioielli_e_valori_importo", "input", "module:j_id1488:0:j_id2017"),
+    ("furto_rapina_estorsione", "checkbox", "module:j_id1488:0:j_id2019"),
+    ("furto_rapina_estorsione_importo", "input", "module:j_id1488:0:j_id2021"),
+
+    # Sezione Assistenza
+    ("allagamento_locali", "checkbox", "module:j_id1488:0:j_id2031"),
+    ("allagamento_locali_importo", "input", "module:j_id1488:0:j_id2033"),
+    ("pronto_intervento_per_danni_acqua", "checkbox", "module:j_id1488:0:j_id2035"),
+    ("pronto_intervento_per_danni_acqua_importo", "input", "module:j_id1488:0:j_id2037"),
+    ("invio_fabbro_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2039"),
+    ("invio_fabbro_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2041"),
+    ("invio_elettricista_per_interventi_di_emergenza", "checkbox", "module:j_id1488:0:j_id2043"),
+    ("invio_elettricista_per_interventi_di_emergenza_importo", "input", "module:j_id1488:0:j_id2045"),
+
+    # Sezione Tutela Legale
+    ("tutela_legale", "checkbox", "module:j_id1488:0:j_id2055"),
+    ("tutela_legale_importo", "input", "module:j_id1488:0:j_id2057"),
+
+    # Note (textarea)
+    ("note_sezione_incendio", "textarea", "module:j_id1488:0:j_id2064"),
+    ("note_sezione_rc", "textarea", "module:j_id1488:0:j_id2066"),
+    ("note_sezione_furto", "textarea", "module:j_id1488:0:j_id2068"),
+    ("note_sezione_assistenza", "textarea", "module:j_id1488:0:j_id2070"),
+    ("note_sezione_tutela_legale", "textarea", "module:j_id1488:0:j_id2072")
+]
+
+MODULO_RICHIESTA_JS = """
+return arguments[0].map(([name, kind, id]) => {
+    const elem = document.getElementById(id);
+    if (kind === "checkbox") {
+        return elem && elem.checked ? "checked" : "unchecked";
+    } else if (!elem) {
+        return "";
+    } else if (kind === "textarea") {
+        return elem.value || elem.textContent || "";
+    }
+    return (elem.value || "").trim();
+});
+"""
+
+def build_upsert_sql(table, fields):
+    columns = ["protocollo"] + fields
+    update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in fields])
+    return f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        VALUES %s
+        ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
+    """
+
+MODULO_RICHIESTA_UPSERT_SQL = build_upsert_sql("modulo_richiesta", MODULO_RICHIESTA_FIELDS)
+CUSTOMER_DETAIL_UPSERT_SQL = build_upsert_sql("customer_detail", CUSTOMER_DETAIL_FIELDS)
+
 class DatabaseManager:
     def __init__(self):
         self.conn = psycopg2.connect(
@@ -77,9 +218,21 @@ class DatabaseManager:
             port=DB_PORT
         )
         self.cur = self.conn.cursor()
-        self.create_table()
-        self.create_modulo_richiesta_table()
-        self.create_customer_detail_table()
+        # One probe for all three tables; the DDL only runs for the ones that are missing
+        missing = self.missing_tables(["scraped_records_test", "modulo_richiesta", "customer_detail"])
+        if "scraped_records_test" in missing:
+            self.create_table()
+        if "modulo_richiesta" in missing:
+            self.create_modulo_richiesta_table()
+        if "customer_detail" in missing:
+            self.create_customer_detail_table()
+        self.conn.commit()
+
+    def missing_tables(self, tables):
+        self.cur.execute(
+            "SELECT name FROM unnest(%s::text[]) AS name WHERE to_regclass(name) IS NULL", (tables,)
+        )
+        return {row[0] for row in self.cur.fetchall()}
 
     def create_table(self):
         self.cur.execute("""
@@ -97,7 +250,6 @@ class DatabaseManager:
               content_hash TEXT UNIQUE
             )
         """)
-        self.conn.commit()
 
     def create_modulo_richiesta_table(self):
         columns = ",\n".join([f"{field} TEXT" for field in MODULO_RICHIESTA_FIELDS])
@@ -108,7 +260,6 @@ class DatabaseManager:
             )
         """
         self.cur.execute(sql)
-        self.conn.commit()
 
     def create_customer_detail_table(self):
         columns = ",\n".join([f"{field} TEXT" for field in CUSTOMER_DETAIL_FIELDS])
@@ -119,13 +270,13 @@ class DatabaseManager:
             )
         """
         self.cur.execute(sql)
-        self.conn.commit()
 
-    def protocollo_exists(self, protocollo):
+    def existing_protocolli(self, protocolli):
+        # One = ANY(%s) query for the whole dashboard instead of a SELECT per row
         self.cur.execute(
-            "SELECT 1 FROM modulo_richiesta WHERE protocollo = %s", (protocollo,)
+            "SELECT protocollo FROM modulo_richiesta WHERE protocollo = ANY(%s)", (list(protocolli),)
         )
-        return self.cur.fetchone() is not None
+        return {row[0] for row in self.cur.fetchall()}
 
     def hash_exists(self, content_hash):
         self.cur.execute(
@@ -149,49 +300,30 @@ class DatabaseManager:
                 record["collegato a"],
                 content_hash,
             ))
-        self.cur.executemany(
+        execute_values(
+            self.cur,
             """
             INSERT INTO scraped_records_test (
               protocollo, avanzamento, inserita_il,
               prodotto, assegnata_a, richiedente,
               referente, cliente, progetto,
               collegato_a, content_hash
-            ) VALUES (
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
+            ) VALUES %s ON CONFLICT (protocollo) DO NOTHING
             """,
             insert_data,
+            page_size=500,
         )
-        self.conn.commit()
 
-    def insert_modulo_richiesta(self, protocollo, fields_dict):
-        columns = ["protocollo"] + MODULO_RICHIESTA_FIELDS
-        values = [protocollo] + [fields_dict.get(f, "") for f in MODULO_RICHIESTA_FIELDS]
-        placeholders = ", ".join(["%s"] * len(columns))
-        update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in MODULO_RICHIESTA_FIELDS])
-        sql = f"""
-            INSERT INTO modulo_richiesta ({', '.join(columns)})
-            VALUES ({placeholders})
-            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
-        """
-        self.cur.execute(sql, values)
-        self.conn.commit()
+    def insert_modulo_richiesta_batch(self, items):
+        self._upsert_batch(MODULO_RICHIESTA_UPSERT_SQL, MODULO_RICHIESTA_FIELDS, items)
 
-    def insert_customer_detail(self, protocollo, fields_dict):
-        columns = ["protocollo"] + CUSTOMER_DETAIL_FIELDS
-        values = [protocollo] + [fields_dict.get(f, "") for f in CUSTOMER_DETAIL_FIELDS]
-        placeholders = ", ".join(["%s"] * len(columns))
-        update_stmt = ", ".join([f"{f}=EXCLUDED.{f}" for f in CUSTOMER_DETAIL_FIELDS])
-        sql = f"""
-            INSERT INTO customer_detail ({', '.join(columns)})
-            VALUES ({placeholders})
-            ON CONFLICT (protocollo) DO UPDATE SET {update_stmt}
-        """
-        self.cur.execute(sql, values)
-        self.conn.commit()
+    def insert_customer_detail_batch(self, items):
+        self._upsert_batch(CUSTOMER_DETAIL_UPSERT_SQL, CUSTOMER_DETAIL_FIELDS, items)
+
+    def _upsert_batch(self, sql, fields, items):
+        # items: [(protocollo, fields_dict)]; one statement per 500 rows, committed by the caller
+        rows = [tuple([protocollo] + [fields_dict.get(f, "") for f in fields]) for protocollo, fields_dict in items]
+        execute_values(self.cur, sql, rows, page_size=500)
 
     def close(self):
         self.conn.close()
@@ -261,120 +393,11 @@ class SeleniumHelper:
             )
             tab.click()
             wait.until(EC.presence_of_element_located((By.ID, "module:j_id1488:0:j_id1849")))
-            panel = wait.until(
+            wait.until(
                 EC.visibility_of_element_located((By.ID, "module:j_id1488:0td2"))
             )
-            fields = {}
-
-            def get_input_value(input_id):
-                try:
-                    elem = panel.find_element(By.ID, input_id)
-                    return elem.get_attribute("value").strip()
-                except Exception:
-                    return ""
-
-            def get_checkbox_value(input_id):
-                try:
-                    return "checked" if panel.find_element(By.ID, input_id).is_selected() else "unchecked"
-                except Exception:
-                    return "unchecked"
-
-            def get_textarea_value(textarea_id):
-                try:
-                    elem = panel.find_element(By.ID, textarea_id)
-                    return elem.get_attribute("value") or elem.text or ""
-                except Exception:
-                    return ""
-
-            # Fill all 43 fields by their HTML id (from your extract.html)
-            fields["comune"] = get_input_value("module:j_id1488:0:j_id1849")
-            fields["provincia"] = get_input_value("module:j_id1488:0:j_id1851")
-            fields["indirizzo"] = get_input_value("module:j_id1488:0:j_id1853")
-            fields["cap"] = get_input_value("module:j_id1488:0:j_id1855")
-            fields["piano"] = get_input_value("module:j_id1488:0:j_id1857")
-
-            fields["appartamento_in_cond"] = get_checkbox_value("module:j_id1488:0:j_id1865")
-            fields["villa_a_schiera"] = get_checkbox_value("module:j_id1488:0:j_id1868")
-            fields["villa_isolata"] = get_checkbox_value("module:j_id1488:0:j_id1871")
-            fields["dimora_abituale"] = get_checkbox_value("module:j_id1488:0:j_id1874")
-            fields["dimora_saltuaria"] = get_checkbox_value("module:j_id1488:0:j_id1877")
-            fields["dimora_locata_a_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1880")
-
-            fields["anno_di_costruzione"] = get_input_value("module:j_id1488:0:annoCostruzione")
-            fields["anno_ristrutturazione_impianti"] = get_input_value("module:j_id1488:0:annoRistrutturazioneImpianti")
-
-            fields["struttura_portante_in_muratura"] = get_checkbox_value("module:j_id1488:0:j_id1890")
-            fields["cappotto_termico"] = get_checkbox_value("module:j_id1488:0:j_id1893")
-            fields["struttura_portante_in_cemento_armato"] = get_checkbox_value("module:j_id1488:0:j_id1896")
-            fields["pannelli_solari_e_o_fotovoltaici"] = get_checkbox_value("module:j_id1488:0:j_id1899")
-            fields["struttura_portante_in_acciaio"] = get_checkbox_value("module:j_id1488:0:j_id1902")
-            fields["antisismico"] = get_checkbox_value("module:j_id1488:0:j_id1905")
-            fields["presenza_struttura_commerciale_e_o_ricreative"] = get_checkbox_value("module:j_id1488:0:j_id1908")
-
-            fields["vincolo"] = get_checkbox_value("module:j_id1488:0:j_id1926")
-            fields["ente_vincolatario"] = get_input_value("module:j_id1488:0:j_id1929")
-            fields["scadenza"] = get_input_value("module:j_id1488:0:j_id1931")
-
-            fields["immobile"] = get_textarea_value("module:j_id1488:0:j_id1937")
-
-            # Sezione Incendio
-            fields["incendio_fabbricato"] = get_checkbox_value("module:j_id1488:0:j_id1947")
-            fields["incendio_fabbricato_importo"] = get_input_value("module:j_id1488:0:j_id1949")
-            fields["incendio_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id1951")
-            fields["incendio_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id1953")
-            fields["rischio_locativo"] = get_checkbox_value("module:j_id1488:0:j_id1955")
-            fields["rischio_locativo_importo"] = get_input_value("module:j_id1488:0:j_id1957")
-            fields["ricorso_terzi"] = get_checkbox_value("module:j_id1488:0:j_id1959")
-            fields["ricorso_terzi_importo"] = get_input_value("module:j_id1488:0:j_id1961")
-            fields["fenomeno_elettrico"] = get_checkbox_value("module:j_id1488:0:j_id1963")
-            fields["fenomeno_elettrico_importo"] = get_input_value("module:j_id1488:0:j_id1965")
-            fields["acqua_condotta"] = get_checkbox_value("module:j_id1488:0:j_id1967")
-            fields["acqua_condotta_importo"] = get_input_value("module:j_id1488:0:j_id1969")
-            fields["spese_ricerca_e_riparazione_guasti"] = get_checkbox_value("module:j_id1488:0:j_id1971")
-            fields["spese_ricerca_e_riparazione_guasti_importo"] = get_input_value("module:j_id1488:0:j_id1973")
-            fields["cristalli"] = get_checkbox_value("module:j_id1488:0:j_id1975")
-            fields["cristalli_importo"] = get_input_value("module:j_id1488:0:j_id1977")
-            fields["eventi_atmosferici"] = get_checkbox_value("module:j_id1488:0:j_id1979")
-            fields["eventi_atmosferici_importo"] = get_input_value("module:j_id1488:0:j_id1981")
-            fields["eventi_sociopolitici"] = get_checkbox_value("module:j_id1488:0:j_id1983")
-            fields["eventi_sociopolitici_importo"] = get_input_value("module:j_id1488:0:j_id1985")
-            fields["pacchetto_extra"] = get_checkbox_value("module:j_id1488:0:j_id1987")
-            fields["pacchetto_extra_importo"] = get_input_value("module:j_id1488:0:j_id1989")
-
-            # Sezione RC
-            fields["rct"] = get_checkbox_value("module:j_id1488:0:j_id1999")
-            fields["rct_importo"] = get_input_value("module:j_id1488:0:j_id2001")
-
-            # Sezione Furto
-            fields["furto_contenuto"] = get_checkbox_value("module:j_id1488:0:j_id2011")
-            fields["furto_contenuto_importo"] = get_input_value("module:j_id1488:0:j_id2013")
-            fields["furto_gioielli_e_valori"] = get_checkbox_value("module:j_id1488:0:j_id2015")
-            fields["furto_gioielli_e_valori_importo"] = get_input_value("module:j_id1488:0:j_id2017")
-            fields["furto_rapina_estorsione"] = get_checkbox_value("module:j_id1488:0:j_id2019")
-            fields["furto_rapina_estorsione_importo"] = get_input_value("module:j_id1488:0:j_id2021")
-
-            # Sezione Assistenza
-            fields["allagamento_locali"] = get_checkbox_value("module:j_id1488:0:j_id2031")
-            fields["allagamento_locali_importo"] = get_input_value("module:j_id1488:0:j_id2033")
-            fields["pronto_intervento_per_danni_acqua"] = get_checkbox_value("module:j_id1488:0:j_id2035")
-            fields["pronto_intervento_per_danni_acqua_importo"] = get_input_value("module:j_id1488:0:j_id2037")
-            fields["invio_fabbro_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2039")
-            fields["invio_fabbro_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2041")
-            fields["invio_elettricista_per_interventi_di_emergenza"] = get_checkbox_value("module:j_id1488:0:j_id2043")
-            fields["invio_elettricista_per_interventi_di_emergenza_importo"] = get_input_value("module:j_id1488:0:j_id2045")
-
-            # Sezione Tutela Legale
-            fields["tutela_legale"] = get_checkbox_value("module:j_id1488:0:j_id2055")
-            fields["tutela_legale_importo"] = get_input_value("module:j_id1488:0:j_id2057")
-
-            # Note (textarea)
-            fields["note_sezione_incendio"] = get_textarea_value("module:j_id1488:0:j_id2064")
-            fields["note_sezione_rc"] = get_textarea_value("module:j_id1488:0:j_id2066")
-            fields["note_sezione_furto"] = get_textarea_value("module:j_id1488:0:j_id2068")
-            fields["note_sezione_assistenza"] = get_textarea_value("module:j_id1488:0:j_id2070")
-            fields["note_sezione_tutela_legale"] = get_textarea_value("module:j_id1488:0:j_id2072")
-
-            return fields
+            values = driver.execute_script(MODULO_RICHIESTA_JS, MODULO_RICHIESTA_INPUTS)
+            return {name: value for (name, _, _), value in zip(MODULO_RICHIESTA_INPUTS, values)}
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
             return {}
@@ -387,51 +410,12 @@ class SeleniumHelper:
             panel = wait.until(
                 EC.visibility_of_element_located((By.ID, "customerViewForm:j_id2429"))
             )
-            data = {}
-
-            # Extract nome_cliente from id="customerViewForm:j_id2433" (the <a> tag text inside this div)
-            try:
-                nome_cliente_div = driver.find_element(By.ID, "customerViewForm:j_id2433")
-                nome_cliente_a = nome_cliente_div.find_element(By.TAG_NAME, "a")
-                data["nome_cliente"] = nome_cliente_a.text.strip()
-            except Exception:
-                data["nome_cliente"] = ""
-
-            # Extract from the first table (indirizzo, sesso, ateco)
-            table1 = panel.find_element(By.ID, "customerViewForm:j_id2586")
-            rows1 = table1.find_elements(By.TAG_NAME, "tr")
-            if len(rows1) >= 2:
-                indirizzo = rows1[1].find_elements(By.TAG_NAME, "td")[0].text.strip().replace("\n", " ")
-                sesso = rows1[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-                ateco = rows1[1].find_elements(By.TAG_NAME, "td")[2].text.strip()
-                data["indirizzo"] = indirizzo
-                data["sesso"] = sesso
-                data["ateco"] = ateco
-
-            # Extract from the second table (codice fiscale, legale rappresentante, telefono, settore)
-            table2 = panel.find_element(By.ID, "customerViewForm:j_id2606")
-            rows2 = table2.find_elements(By.TAG_NAME, "tr")
-            if len(rows2) >= 2:
-                codice_fiscale = rows2[1].find_elements(By.TAG_NAME, "td")[0].text.strip()
-                legale_rappresentante = rows2[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-                telefono = rows2[1].find_elements(By.TAG_NAME, "td")[2].text.strip()
-                settore = rows2[1].find_elements(By.TAG_NAME, "td")[3].text.strip()
-                data["codice_fiscale"] = codice_fiscale
-                data["legale_rappresentante"] = legale_rappresentante
-                data["telefono"] = telefono
-                data["settore"] = settore
-
-            # Extract from the third table (partita iva, codice fiscale legale rappresentante, email)
-            table3 = panel.find_element(By.ID, "customerViewForm:j_id2621")
-            rows3 = table3.find_elements(By.TAG_NAME, "tr")
-            if len(rows3) >= 2:
-                partita_iva = rows3[1].find_elements(By.TAG_NAME, "td")[0].text.strip()
-                codice_fiscale_legale_rappresentante = rows3[1].find_elements(By.TAG_NAME, "td")[1].text.strip()
-                email = rows3[1].find_elements(By.TAG_NAME, "td")[2].text.strip()
-                data["partita_iva"] = partita_iva
-                data["codice_fiscale_legale_rappresentante"] = codice_fiscale_legale_rappresentante
-                data["email"] = email
-
+            data = driver.execute_script(CUSTOMER_DETAIL_JS, panel, CUSTOMER_DETAIL_TABLES)
+            if data is None:
+                logging.error("Customer detail extraction error: detail table missing or incomplete")
+                return {}
+            if "indirizzo" in data:
+                data["indirizzo"] = data["indirizzo"].replace("\n", " ")
             return data
         except Exception as e:
             logging.error(f"Customer detail extraction error: {e}", exc_info=True)
@@ -451,6 +435,9 @@ class Scraper:
         logging.info("Scraping started...")
         new_data_to_send = []
         batch_records = []
+        # Keyed by protocollo: one upsert statement can't touch the same row twice
+        modulo_batch = {}
+        customer_batch = {}
 
         try:
             self.driver.get(os.getenv("OMNIA_URL"))
@@ -465,12 +452,14 @@ class Scraper:
 
             spans = table.find_elements(By.XPATH, ".//tbody//tr//span[contains(@id,'j_id484')]")
 
-            for span in spans:
-                protocollo = span.text.strip()
+            protocolli = [span.text.strip() for span in spans]
+            existing_protocolli = self.db.existing_protocolli([p for p in protocolli if p])
+
+            for span, protocollo in zip(spans, protocolli):
                 if not protocollo:
                     continue
 
-                if self.db.protocollo_exists(protocollo):
+                if protocollo in existing_protocolli:
                     print(f"Skipping existing protocollo {protocollo}")
                     logging.debug(f"Skipping existing protocollo {protocollo}")
                     continue
@@ -482,21 +471,19 @@ class Scraper:
                 except Exception:
                     SeleniumHelper.click(self.driver, button)
 
-                # 1. Click modulo richiesta and extract all fields, insert to DB
+                # 1. Click modulo richiesta and extract all fields, queued for the batch insert
                 modulo_fields = SeleniumHelper.extract_modulo_richiesta(self.wait, self.driver)
                 if modulo_fields:
-                    self.db.insert_modulo_richiesta(protocollo, modulo_fields)
-                    self.notifier.show(f"Inserted modulo richiesta for: {protocollo}")
+                    modulo_batch[protocollo] = modulo_fields
 
-                # 2. Click on CLIENTE link, go to detail.html, extract customer detail, insert to DB
+                # 2. Click on CLIENTE link, go to detail.html, extract customer detail, queue it too
                 try:
                     cliente_link = self.driver.find_element(By.ID, "module:j_id1444")
                     cliente_link.click()
                     # Wait for navigation to detail.html and customer panel to load
                     customer_fields = SeleniumHelper.extract_customer_detail(self.wait, self.driver)
                     if customer_fields:
-                        self.db.insert_customer_detail(protocollo, customer_fields)
-                        self.notifier.show(f"Inserted customer detail for: {protocollo}")
+                        customer_batch[protocollo] = customer_fields
                 except Exception as e:
                     logging.error(f"Could not extract customer detail for {protocollo}: {e}", exc_info=True)
                     continue
@@ -505,6 +492,20 @@ class Scraper:
             logging.error(f"General scraping error: {e}", exc_info=True)
 
         finally:
+            # Whatever was scraped before an error still goes in, as one transaction per cycle:
+            # "with conn" commits on success and rolls everything back on error
+            try:
+                with self.db.conn:
+                    if modulo_batch:
+                        self.db.insert_modulo_richiesta_batch(modulo_batch.items())
+                    if customer_batch:
+                        self.db.insert_customer_detail_batch(customer_batch.items())
+                if modulo_batch:
+                    self.notifier.show(f"Inserted modulo richiesta for: {', '.join(modulo_batch)}")
+                if customer_batch:
+                    self.notifier.show(f"Inserted customer detail for: {', '.join(customer_batch)}")
+            except Exception as e:
+                logging.error(f"Batch insert failed: {e}", exc_info=True)
             print("\n📁 Reports saved.")
 
 class ScrapeScheduler:
@@ -1,15 +1,24 @@
+import io
 import os
+import csv
 import json
 import time
+import queue
 import hashlib
-import schedule
+import urllib3
 import psycopg2
 import logging
+import signal
 import threading
 import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from psycopg2.extras import execute_values
+from urllib3.util import Retry
+from pybloom_live import ScalableBloomFilter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -31,6 +40,25 @@ DB_PASSWORD = os.getenv("DB_PASSWORD")
 DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_PORT")
 
+# Above this many rows COPY into a staging table beats multi-row INSERTs. A normal cycle stays well
+# under it; the first sync of an empty table, or catching up after downtime, is what crosses it
+COPY_THRESHOLD = int(os.getenv("COPY_THRESHOLD", "100"))
+SCRAPED_RECORD_COLUMNS = (
+    "protocollo, avanzamento, inserita_il, prodotto, assegnata_a, richiedente, "
+    "referente, cliente, progetto, collegato_a, content_hash"
+)
+# Shared by the execute_values and COPY paths; no target, so a protocollo or content_hash clash is skipped alike
+SCRAPED_RECORD_INSERT = f"INSERT INTO scraped_records_test ({SCRAPED_RECORD_COLUMNS}) {{source}} ON CONFLICT DO NOTHING"
+
+# Planned once per session in DatabaseManager.__init__, then run with EXECUTE
+PREPARED_STATEMENTS = {
+    "existing_protocolli": "SELECT protocollo FROM scraped_records_test WHERE protocollo = ANY($1::text[])",
+    "existing_hashes": "SELECT content_hash FROM scraped_records_test WHERE content_hash = ANY($1::text[])"
+}
+
+# Browsers used for the form submissions, driver1 included
+SUBMIT_WORKERS = int(os.getenv("SUBMIT_WORKERS", "4"))
+
 class DatabaseManager:
     def __init__(self):
         self.conn = psycopg2.connect(
@@ -43,6 +71,11 @@ class DatabaseManager:
         self.cur = self.conn.cursor()
         self.create_table()
         self.create_modulo_richiesta_table()
+        # Lookups run bare, with no transaction to commit; writes open one explicitly via transaction()
+        self.conn.autocommit = True
+        for name, sql in PREPARED_STATEMENTS.items():
+            self.cur.execute(f"PREPARE {name} AS {sql}")
+        self.load_existing_protocolli()
 
     def create_table(self):
         self.cur.execute("""
@@ -73,92 +106,151 @@ class DatabaseManager:
         """)
         self.conn.commit()
 
-    def protocollo_exists(self, protocollo):
+    def load_existing_protocolli(self):
+        # Loaded once at startup into a Bloom filter, a fraction of a set's memory on a large table;
+        # insert_records_batch keeps it current from then on
+        self.cur.execute("SELECT protocollo FROM scraped_records_test")
+        known = ScalableBloomFilter(initial_capacity=100_000, error_rate=1e-4)
+        for (protocollo,) in self.cur:
+            known.add(protocollo)
+        self.known_protocolli = known
+
+    def existing_protocolli(self, protocolli):
+        # Filter misses are definitive and cost nothing; the hits, some possibly false, are confirmed together
+        hits = [protocollo for protocollo in protocolli if protocollo in self.known_protocolli]
+        if not hits:
+            return set()
+        self.cur.execute("EXECUTE existing_protocolli(%s)", (hits,))
+        return {row[0] for row in self.cur.fetchall()}
+
+    def existing_hashes(self, hashes):
+        self.cur.execute("EXECUTE existing_hashes(%s)", (list(hashes),))
+        return {row[0] for row in self.cur.fetchall()}
+
+    @contextmanager
+    def transaction(self):
+        self.cur.execute("BEGIN")
+        try:
+            yield
+        except Exception:
+            self.cur.execute("ROLLBACK")
+            raise
+        self.cur.execute("COMMIT")
+
+    def insert_records_batch(self, insert_data):
+        # Rows come ready-made from Scraper._canonicalize, in SCRAPED_RECORD_COLUMNS order
+        with self.transaction():
+            if len(insert_data) > COPY_THRESHOLD:
+                self.copy_records(insert_data)
+            else:
+                execute_values(
+                    self.cur,
+                    SCRAPED_RECORD_INSERT.format(source="VALUES %s"),
+                    insert_data,
+                    page_size=500,
+                )
+        for row in insert_data:
+            self.known_protocolli.add(row[0])
+
+    def copy_records(self, rows):
+        # Needs the caller's transaction: the staging table lives until its COMMIT
+        buf = io.StringIO()
+        # QUOTE_ALL keeps "" as an empty string; an unquoted empty CSV field would load as NULL
+        csv.writer(buf, quoting=csv.QUOTE_ALL).writerows(rows)
+        buf.seek(0)
         self.cur.execute(
-            "SELECT 1 FROM scraped_records_test WHERE protocollo = %s", (protocollo,)
+            "CREATE TEMP TABLE IF NOT EXISTS staging_scraped "
+            "(LIKE scraped_records_test INCLUDING DEFAULTS) ON COMMIT DROP"
         )
-        return self.cur.fetchone() is not None
-
-    def hash_exists(self, content_hash):
-        self.cur.execute(
-            "SELECT 1 FROM scraped_records_test WHERE content_hash = %s", (content_hash,)
+        self.cur.copy_expert(
+            f"COPY staging_scraped ({SCRAPED_RECORD_COLUMNS}) FROM STDIN WITH CSV", buf
         )
-        return self.cur.fetchone() is not None
-
-    def insert_records_batch(self, records):
-        insert_data = []
-        for record, content_hash in records:
-            insert_data.append((
-                record["protocollo"],
-                record["avanzamento"],
-                datetime.strptime(record["inserita il"], "%d/%m/%Y %H:%M").date(),
-                record["prodotto"],
-                record["assegnata a"],
-                record["richiedente"],
-                record["referente destinatario"],
-                record["cliente"],
-                record["progetto"],
-                record["collegato a"],
-                content_hash,
-            ))
-        self.cur.executemany(
-            """
-            INSERT INTO scraped_records_test (
-              protocollo, avanzamento, inserita_il,
-              prodotto, assegnata_a, richiedente,
-              referente, cliente, progetto,
-              collegato_a, content_hash
-            ) VALUES (
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
-            """,
-            insert_data,
+        self.cur.execute(
+            SCRAPED_RECORD_INSERT.format(source=f"SELECT {SCRAPED_RECORD_COLUMNS} FROM staging_scraped")
         )
-        self.conn.commit()
 
-    def insert_modulo_richiesta(self, protocollo, fields_dict):
-        insert_data = []
-        for field, value in fields_dict.items():
-            insert_data.append((protocollo, field, value))
-        self.cur.executemany(
-            """
-            INSERT INTO modulo_richiesta (protocollo, field_name, field_value)
-            VALUES (%s, %s, %s)
-            ON CONFLICT (protocollo, field_name) DO UPDATE SET field_value = EXCLUDED.field_value
-            """,
-            insert_data,
-        )
-        self.conn.commit()
+    def insert_modulo_richiesta_bulk(self, modulo_batch):
+        # Keyed by protocollo, so no (protocollo, field_name) pair repeats within one upsert statement
+        insert_data = [
+            (protocollo, field, value)
+            for protocollo, fields_dict in modulo_batch.items()
+            for field, value in fields_dict.items()
+        ]
+        with self.transaction():
+            execute_values(
+                self.cur,
+                """
+                INSERT INTO modulo_richiesta (protocollo, field_name, field_value)
+                VALUES %s
+                ON CONFLICT (protocollo, field_name) DO UPDATE SET field_value = EXCLUDED.field_value
+                """,
+                insert_data,
+                page_size=500,
+            )
 
     def close(self):
         self.conn.close()
 
 class PopupNotifier:
-    def show(self, msg, title="Success"):
-        root = tk.Tk()
-        root.overrideredirect(True)
-        root.attributes("-topmost", True)
+    # One hidden Tk root per process, owned by a daemon thread; show() only enqueues
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                instance = super().__new__(cls)
+                instance.queue = queue.Queue()
+                instance.root = None
+                instance.thread = None
+                instance.open_popups = []
+                cls._instance = instance
+        return cls._instance
 
+    def show(self, msg, title="Success"):
+        with self._instance_lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="PopupNotifier", daemon=True)
+                self.thread.start()
+        self.queue.put((msg, title))
+
+    def _run(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.root.after(50, self._pump)
+        self.root.mainloop()
+
+    def _pump(self):
+        while True:
+            try:
+                msg, title = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self._popup(msg, title)
+        self.root.after(50, self._pump)
+
+    def _close(self, popup):
+        self.open_popups.remove(popup)
+        popup.destroy()
+
+    def _popup(self, msg, title):
+        popup = tk.Toplevel(self.root)
+        popup.overrideredirect(True)
+        popup.attributes("-topmost", True)
         width, height = 360, 110
-        screen_width = root.winfo_screenwidth()
-        screen_height = root.winfo_screenheight()
+        screen_width = popup.winfo_screenwidth()
+        screen_height = popup.winfo_screenheight()
         x = screen_width - width - 20
-        y = screen_height - height - 120
-        root.geometry(f"{width}x{height}+{x}+{y}")
-
-        container = tk.Frame(root, bg="white", bd=0)
+        y = screen_height - height - 120 - len(self.open_popups) * (height + 10)
+        popup.geometry(f"{width}x{height}+{x}+{y}")
+        container = tk.Frame(popup, bg="white", bd=0)
         container.place(relwidth=1, relheight=1)
-
         stripe_margin_x = 8
         stripe_margin_y = 12
         stripe_height = height - stripe_margin_y * 2
         stripe = tk.Canvas(container, width=12, height=stripe_height, bg="white", highlightthickness=0)
         stripe.place(x=stripe_margin_x, y=stripe_margin_y)
         stripe.create_rectangle(0, 0, 12, stripe_height, fill="#27ae60", outline="")
-
         title_label = tk.Label(
             container,
             text=title,
@@ -168,7 +260,6 @@ class PopupNotifier:
             anchor="w"
         )
         title_label.place(x=28, y=18)
-
         message = tk.Label(
             container,
             text=msg,
@@ -180,9 +271,77 @@ class PopupNotifier:
             wraplength=300
         )
         message.place(x=28, y=50)
-
-        root.after(4000, root.destroy)
-        root.mainloop()
+        self.open_popups.append(popup)
+        popup.after(4000, lambda: self._close(popup))
+
+NAVIGATION_TABS = ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]
+
+# expected_conditions are stateless callables, so the fixed-locator ones are built once and shared
+TAB_CONDITIONS = {tab: EC.element_to_be_clickable((By.ID, tab)) for tab in NAVIGATION_TABS}
+DASHBOARD_CONDITION = EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard"))
+
+# Protocollo text and detail button of every dashboard row, in one round trip
+DASHBOARD_ROWS_JS = """
+const outermostRow = (span) => {
+    // Same row ./ancestor::tr resolves to: the first, i.e. outermost, enclosing tr
+    let row = null;
+    for (let el = span.parentElement; el; el = el.parentElement) {
+        if (el.tagName === "TR") row = el;
+    }
+    return row;
+};
+return Array.from(arguments[0].querySelectorAll("tbody tr span[id*='j_id484']"), (span) => {
+    const row = outermostRow(span);
+    return {protocollo: span.innerText.trim(), button: row ? row.querySelector("a.icon-search") : null};
+});
+"""
+
+# Every label/value pair of the modulo richiesta panel in one round trip; mirrors the old XPath walk:
+# label cells take the following cell's text input or textarea, then checkboxes, then notes textareas
+# labelled by the row above them (or by their id)
+MODULO_RICHIESTA_JS = """
+const panel = arguments[0];
+const fields = {};
+for (const row of panel.querySelectorAll("tr")) {
+    const tds = row.querySelectorAll("td");
+    let i = 0;
+    while (i < tds.length) {
+        const label = tds[i].querySelector("span[class*='field-label']");
+        const text = label ? label.innerText.trim() : "";
+        if (!text) {
+            i += 1;
+            continue;
+        }
+        let value = "";
+        const cell = tds[i + 1];
+        if (cell) {
+            const input = cell.querySelector("input[type='text']");
+            if (input) value = (input.value || "").trim();
+            const textarea = cell.querySelector("textarea");
+            if (textarea) value = textarea.value || textarea.innerText || "";
+        }
+        fields[text] = value;
+        i += 2;
+    }
+}
+for (const div of panel.querySelectorAll("div[class*='icePnlGrp']")) {
+    const checkbox = div.querySelector("input[type='checkbox']");
+    const label = div.querySelector("span[class*='field-label']");
+    if (checkbox && label) fields[label.innerText.trim()] = checkbox.checked ? "checked" : "unchecked";
+}
+for (const textarea of panel.querySelectorAll("textarea")) {
+    const row = textarea.closest("tr");
+    let label = null;
+    let prev = row ? row.previousElementSibling : null;
+    while (prev && prev.tagName !== "TR") prev = prev.previousElementSibling;
+    if (prev) {
+        const title = prev.querySelector("span[class*='text-semibold'], span[class*='title']");
+        if (title) label = title.innerText.trim();
+    }
+    fields[label || textarea.id] = textarea.value || textarea.innerText || "";
+}
+return fields;
+"""
 
 class SeleniumHelper:
     @staticmethod
@@ -210,60 +369,7 @@ class SeleniumHelper:
             panel = wait.until(
                 EC.visibility_of_element_located((By.ID, "module:j_id1488:0td2"))
             )
-            fields = {}
-
-            # Extract all text fields and their labels
-            for row in panel.find_elements(By.XPATH, ".//tr"):
-                tds = row.find_elements(By.TAG_NAME, "td")
-                i = 0
-                while i < len(tds):
-                    # Label
-                    label_elems = tds[i].find_elements(By.XPATH, ".//span[contains(@class, 'field-label')]")
-                    label = label_elems[0].text.strip() if label_elems else None
-                    # Value
-                    value = ""
-                    if label:
-                        # Text input
-                        input_elems = tds[i+1].find_elements(By.XPATH, ".//input[@type='text']")
-                        if input_elems:
-                            value = input_elems[0].get_attribute("value").strip()
-                        # Textarea
-                        textarea_elems = tds[i+1].find_elements(By.XPATH, ".//textarea")
-                        if textarea_elems:
-                            value = textarea_elems[0].get_attribute("value") or textarea_elems[0].text or ""
-                        fields[label] = value
-                        i += 2
-                    else:
-                        i += 1
-
-            # Extract all checkboxes and their labels
-            for div in panel.find_elements(By.XPATH, ".//div[contains(@class, 'icePnlGrp')]"):
-                checkbox = div.find_elements(By.XPATH, ".//input[@type='checkbox']")
-                label_elem = div.find_elements(By.XPATH, ".//span[contains(@class, 'field-label')]")
-                if checkbox and label_elem:
-                    label = label_elem[0].text.strip()
-                    checked = "checked" if checkbox[0].is_selected() else "unchecked"
-                    fields[label] = checked
-
-            # Extract all textareas with their section label (for notes)
-            for textarea in panel.find_elements(By.XPATH, ".//textarea"):
-                parent_row = textarea.find_element(By.XPATH, "./ancestor::tr[1]")
-                # Try to find a preceding sibling row with a label
-                label = None
-                try:
-                    prev_row = parent_row.find_element(By.XPATH, "preceding-sibling::tr[1]")
-                    label_elem = prev_row.find_elements(By.XPATH, ".//span[contains(@class, 'text-semibold') or contains(@class, 'title')]")
-                    if label_elem:
-                        label = label_elem[0].text.strip()
-                except Exception:
-                    pass
-                if not label:
-                    # fallback: use textarea id
-                    label = textarea.get_attribute("id")
-                value = textarea.get_attribute("value") or textarea.text or ""
-                fields[label] = value
-
-            return fields
+            return driver.execute_script(MODULO_RICHIESTA_JS, panel)
         except Exception as e:
             logging.error(f"Modulo richiesta extraction error: {e}", exc_info=True)
             return {}
@@ -291,29 +397,48 @@ class SeleniumHelper:
             return None
 
 class FormSubmitter:
-    @staticmethod
+    # The test site keeps the login alive across page loads; trust it for this long before logging in again
+    SESSION_TTL = 30 * 60
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.logged_in = False
+        self.last_login = 0
+
+    def login(self):
+        driver = self.driver
+        SeleniumHelper.safe_send_keys(driver.find_element(By.ID, "login-username"), "admin")
+        SeleniumHelper.safe_send_keys(driver.find_element(By.ID, "login-password"), "1234")
+        SeleniumHelper.click(driver, driver.find_element(By.CSS_SELECTOR, "button[onclick='simulateLogin()']"))
+        time.sleep(1)
+        try:
+            return driver.find_element(By.ID, "main-content").is_displayed()
+        except:
+            return False
+
+    def session_active(self):
+        if not self.logged_in or time.monotonic() - self.last_login >= self.SESSION_TTL:
+            return False
+        content = self.driver.find_elements(By.ID, "main-content")
+        return bool(content) and content[0].is_displayed()
+
     @retry(stop=stop_after_attempt(3), wait=wait_fixed(5))
-    def submit_form(driver, data):
+    def submit_form(self, data):
+        driver = self.driver
         driver.get(os.getenv("TEST_SITE"))
 
-        def login():
-            SeleniumHelper.safe_send_keys(driver.find_element(By.ID, "login-username"), "admin")
-            SeleniumHelper.safe_send_keys(driver.find_element(By.ID, "login-password"), "1234")
-            SeleniumHelper.click(driver, driver.find_element(By.CSS_SELECTOR, "button[onclick='simulateLogin()']"))
-            time.sleep(1)
-            try:
-                return driver.find_element(By.ID, "main-content").is_displayed()
-            except:
-                return False
-
-        try:
+        if not self.session_active():
             for attempt in range(3):
-                if login():
+                if self.login():
                     break
                 driver.refresh()
             else:
+                self.logged_in = False
                 raise Exception("Login failed after 3 attempts: wrong username or password")
+            self.logged_in = True
+            self.last_login = time.monotonic()
 
+        try:
             SeleniumHelper.safe_send_keys(driver.find_element(By.ID, "avanzamento"), data["avanzamento"])
             SeleniumHelper.safe_send_keys(driver.find_element(By.ID, "inserita-il"), data["inserita-il"].strftime("%Y-%m-%d"))
             SeleniumHelper.safe_send_keys(driver.find_element(By.ID, "prodotto"), data["prodotto"])
@@ -327,66 +452,127 @@ class FormSubmitter:
 
             return True
 
-        except Exception as e:
-            raise e
+        except Exception:
+            # Most likely the session ended under us; the retry logs in from scratch
+            self.logged_in = False
+            raise
 
 class HashUtil:
     @staticmethod
     def hash_content(data_dict):
-        filtered_dict = {k: v for k, v in data_dict.items() if k != "protocollo"}
-        content_str = "|".join(str(v) for v in filtered_dict.values())
-        return hashlib.sha256(content_str.encode("utf-8")).hexdigest()
+        # Dedup key only, never a security boundary: 128-bit BLAKE2b over the same "|"-joined bytes, streamed
+        hasher = hashlib.blake2b(digest_size=16)
+        sep = b""
+        for k, v in data_dict.items():
+            if k == "protocollo":
+                continue
+            hasher.update(sep)
+            hasher.update(str(v).encode("utf-8"))
+            sep = b"|"
+        return hasher.hexdigest()
 
 class Scraper:
-    def __init__(self, driver, driver1, wait, db_manager, notifier):
+    def __init__(self, driver, driver1, wait, db_manager, notifier, submit_drivers=None):
         self.driver = driver
         self.driver1 = driver1
         self.wait = wait
+        self.wait_tab = WebDriverWait(driver, 7)
+        self.wait_short = WebDriverWait(driver, 3)
         self.db = db_manager
         self.notifier = notifier
         self.success_log = []
         self.failed_log = []
+        # Each submission borrows a submitter from the pool, so at most one form runs per browser;
+        # a submitter keeps its browser's login between records and between cycles
+        self.submit_drivers = submit_drivers or [driver1]
+        self.submitter_pool = queue.Queue()
+        for submit_driver in self.submit_drivers:
+            self.submitter_pool.put(FormSubmitter(submit_driver))
+
+    @staticmethod
+    def _canonicalize(record):
+        # DB row, form payload and content hash from one look at the record, parsing inserita il only once
+        inserita_il = datetime.strptime(record["inserita il"], "%d/%m/%Y %H:%M").date()
+        content_hash = HashUtil.hash_content(record)
+        row = (
+            record["protocollo"],
+            record["avanzamento"],
+            inserita_il,
+            record["prodotto"],
+            record["assegnata a"],
+            record["richiedente"],
+            record["referente destinatario"],
+            record["cliente"],
+            record["progetto"],
+            record["collegato a"],
+            content_hash,
+        )
+        form = {
+            "avanzamento": record["avanzamento"],
+            "inserita-il": inserita_il,
+            "prodotto": record["prodotto"],
+            "assegnata-a": record["assegnata a"],
+            "richiedente": record["richiedente"],
+            "referente": record["referente destinatario"],
+            "cliente": record["cliente"],
+            "progetto": record["progetto"],
+            "collegato-a": record["collegato a"]
+        }
+        return row, form, content_hash
+
+    def _submit_one(self, rec):
+        submitter = self.submitter_pool.get()
+        try:
+            return submitter.submit_form(rec), None
+        except Exception as e:
+            return False, e
+        finally:
+            self.submitter_pool.put(submitter)
 
     def scrape(self):
         logging.info("Scraping started...")
         new_data_to_send = []
         batch_records = []
+        candidates = []
+        modulo_batch = {}
 
         try:
             self.driver.get(os.getenv("OMNIA_URL"))
 
-            for tab in ["navigationForm:portfolio", "navigationForm:opportunities", "navigationForm:requestsDashboard"]:
+            for tab in NAVIGATION_TABS:
                 try:
-                    WebDriverWait(self.driver, 7).until(EC.element_to_be_clickable((By.ID, tab))).click()
+                    self.wait_tab.until(TAB_CONDITIONS[tab]).click()
                 except Exception:
                     logging.warning(f"Tab {tab} not clickable, skipping.")
 
-            table = WebDriverWait(self.driver, 7).until(EC.presence_of_element_located((By.ID, "module:tblRequestsDashboard")))
+            table = self.wait_tab.until(DASHBOARD_CONDITION)
 
-            spans = table.find_elements(By.XPATH, ".//tbody//tr//span[contains(@id,'j_id484')]")
+            rows = self.driver.execute_script(DASHBOARD_ROWS_JS, table)
+            existing_protocolli = self.db.existing_protocolli(row["protocollo"] for row in rows if row["protocollo"])
 
-            for span in spans:
-                protocollo = span.text.strip()
+            for row in rows:
+                protocollo = row["protocollo"]
                 if not protocollo:
                     continue
 
-                if self.db.protocollo_exists(protocollo):
+                if protocollo in existing_protocolli:
                     print(f"Skipping existing protocollo {protocollo}")
                     logging.debug(f"Skipping existing protocollo {protocollo}")
                     continue
 
-                row = span.find_element(By.XPATH, "./ancestor::tr")
-                button = row.find_element(By.CSS_SELECTOR, "a.icon-search")
+                button = row["button"]
+                if button is None:
+                    logging.warning(f"No detail button for protocollo {protocollo}, skipping.")
+                    continue
                 try:
-                    WebDriverWait(self.driver, 3).until(EC.element_to_be_clickable(button)).click()
+                    self.wait_short.until(EC.element_to_be_clickable(button)).click()
                 except Exception:
                     SeleniumHelper.click(self.driver, button)
 
-                # 1. Click modulo richiesta and extract all fields, insert to DB
+                # 1. Click modulo richiesta and extract all fields, queued for one DB write after the loop
                 modulo_fields = SeleniumHelper.extract_modulo_richiesta(self.wait, self.driver)
                 if modulo_fields:
-                    self.db.insert_modulo_richiesta(protocollo, modulo_fields)
-                    self.notifier.show(f"Inserted modulo richiesta for: {protocollo}")
+                    modulo_batch[protocollo] = modulo_fields
 
                 # 2. Extract detail data (already present functionality)
                 record = SeleniumHelper.extract_detail_data(self.wait)
@@ -394,28 +580,27 @@ class Scraper:
                     continue
 
                 record["protocollo"] = protocollo
-                content_hash = HashUtil.hash_content(record)
+                candidates.append(self._canonicalize(record))
 
-                if self.db.hash_exists(content_hash):
-                    print(f"Duplicate hash for {protocollo}, skipping insert")
-                    logging.warning(f"Duplicate hash for {protocollo}, skipping insert")
-                    continue
+            if modulo_batch:
+                self.db.insert_modulo_richiesta_bulk(modulo_batch)
+                logging.info(f"Inserted modulo richiesta for {len(modulo_batch)} protocolli in batch.")
+                for protocollo in modulo_batch:
+                    self.notifier.show(f"Inserted modulo richiesta for: {protocollo}")
 
-                batch_records.append((record, content_hash))
+            # One ANY() lookup for every hash collected above instead of a SELECT per row
+            seen_hashes = self.db.existing_hashes(content_hash for _, _, content_hash in candidates)
+            for row, form, content_hash in candidates:
+                if content_hash in seen_hashes:
+                    print(f"Duplicate hash for {row[0]}, skipping insert")
+                    logging.warning(f"Duplicate hash for {row[0]}, skipping insert")
+                    continue
+                seen_hashes.add(content_hash)
 
-                new_data_to_send.append({
-                    "avanzamento": record["avanzamento"],
-                    "inserita-il": datetime.strptime(record["inserita il"], "%d/%m/%Y %H:%M").date(),
-                    "prodotto": record["prodotto"],
-                    "assegnata-a": record["assegnata a"],
-                    "richiedente": record["richiedente"],
-                    "referente": record["referente destinatario"],
-                    "cliente": record["cliente"],
-                    "progetto": record["progetto"],
-                    "collegato-a": record["collegato a"]
-                })
+                batch_records.append(row)
+                new_data_to_send.append(form)
 
-                self.notifier.show(f"Inserted new record: {record['progetto']}")
+                self.notifier.show(f"Inserted new record: {form['progetto']}")
 
             # Batch insert at the end
             if batch_records:
@@ -428,17 +613,18 @@ class Scraper:
         finally:
             if new_data_to_send:
                 print(f"\n📤 Submitting {len(new_data_to_send)} new records to form...")
-                for rec in new_data_to_send:
-                    try:
-                        success = FormSubmitter.submit_form(self.driver1, rec)
-                        if success:
+                # Logs are filled here from the return values, never from the worker threads
+                with ThreadPoolExecutor(max_workers=len(self.submit_drivers)) as executor:
+                    results = executor.map(self._submit_one, new_data_to_send)
+                    for rec, (success, error) in zip(new_data_to_send, results):
+                        if error is not None:
+                            self.failed_log.append(f"Error submitting {rec['progetto']}: {error}")
+                        elif success:
                             self.notifier.show(f"✅ Form submitted for: {rec['progetto']}")
                             print(f"✅ Form submitted for: {rec['progetto']}")
                             self.success_log.append(f"Form sent: {rec['progetto']}")
                         else:
                             self.failed_log.append(f"Form failed: {rec['progetto']}")
-                    except Exception as e:
-                        self.failed_log.append(f"Error submitting {rec['progetto']}: {e}")
 
             with open("form_submission_report.txt", "w", encoding="utf-8") as rpt:
                 rpt.write("Successful Submissions\n=======================\n\n")
@@ -450,9 +636,24 @@ class Scraper:
 
             print("\n📁 Reports saved.")
 
+def enlarge_connection_pool(driver, maxsize=20):
+    # Selenium's local driver keeps a small urllib3 pool with no retries; give it room for overlapping commands
+    # and a short retry so a dropped keep-alive socket does not fail the command
+    executor = driver.command_executor
+    if executor._conn.connection_pool_kw.get("maxsize", 1) >= maxsize:
+        return driver
+    executor._conn.clear()
+    executor._conn = urllib3.PoolManager(
+        maxsize=maxsize,
+        timeout=executor.get_timeout(),
+        retries=Retry(total=2, backoff_factor=0.1)
+    )
+    return driver
+
 class ScrapeScheduler:
     def __init__(self, scraper):
         self.scraper = scraper
+        self.shutdown_event = threading.Event()
 
     def threaded_scrape(self):
         if scrape_lock.locked():
@@ -465,36 +666,65 @@ class ScrapeScheduler:
 
         threading.Thread(target=run_task, name="ScrapeThread").start()
 
+    def stop(self, *_):
+        # Wakes the wait in start() at once; also the SIGTERM handler
+        self.shutdown_event.set()
+
     def start(self, interval_seconds=20):
-        schedule.every(interval_seconds).seconds.do(self.threaded_scrape)
+        signal.signal(signal.SIGTERM, self.stop)
         print(f"🧵 Multithreaded scheduler is running every {interval_seconds} seconds...\n")
+        next_run = time.monotonic() + interval_seconds
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(1)
+            # Sleep until the next cycle is due or stop() is called, instead of waking every second to poll
+            while not self.shutdown_event.wait(max(0, next_run - time.monotonic())):
+                self.threaded_scrape()
+                next_run += interval_seconds
+                now = time.monotonic()
+                if next_run <= now:
+                    next_run = now + interval_seconds
         except KeyboardInterrupt:
             print("🛑 Script interrupted. Cleaning up...")
+        finally:
+            self.close()
+
+    def close(self):
+        # A scrape still in flight finishes before its browsers and connection go away
+        with scrape_lock:
             self.scraper.db.close()
             self.scraper.driver.quit()
-            self.scraper.driver1.quit()
-            print("✅ Script completed successfully.")
+            for submit_driver in self.scraper.submit_drivers:
+                submit_driver.quit()
+        print("✅ Script completed successfully.")
 
 if __name__ == "__main__":
+    # Resolve the driver binary once for every browser; CHROMEDRIVER_PATH skips webdriver_manager entirely
+    service_path = os.getenv("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+
     options = webdriver.ChromeOptions()
     #options.add_argument("--headless")
     options.add_argument("--no-sandbox")
     options.add_argument("--start-maximized")
     options.add_argument("--disable-dev-shm-usage")
     options.add_experimental_option("excludeSwitches", ["enable-logging"])
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    driver = enlarge_connection_pool(webdriver.Chrome(service=Service(service_path), options=options))
     wait = WebDriverWait(driver, 20)
 
     options1 = webdriver.ChromeOptions()
     options1.add_argument("--start-maximized")
-    driver1 = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options1)
+    driver1 = enlarge_connection_pool(webdriver.Chrome(service=Service(service_path), options=options1))
+
+    # Extra headless browsers so the form submissions run side by side with driver1
+    submit_options = webdriver.ChromeOptions()
+    submit_options.add_argument("--headless=new")
+    submit_options.add_argument("--no-sandbox")
+    submit_options.add_argument("--disable-dev-shm-usage")
+    submit_drivers = [driver1] + [
+        enlarge_connection_pool(webdriver.Chrome(service=Service(service_path), options=submit_options))
+        for _ in range(SUBMIT_WORKERS - 1)
+    ]
 
     db_manager = DatabaseManager()
     notifier = PopupNotifier()
-    scraper = Scraper(driver, driver1, wait, db_manager, notifier)
+    scraper = Scraper(driver, driver1, wait, db_manager, notifier, submit_drivers)
     scheduler = ScrapeScheduler(scraper)
     scheduler.start(interval_seconds=20)
\ No newline at end of file
@@ -10,6 +10,7 @@ import tkinter as tk
 from tkinter import ttk
 from dotenv import load_dotenv
 from datetime import datetime
+from psycopg2.extras import execute_values
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.service import Service
@@ -90,21 +91,18 @@ class DatabaseManager:
                 record["collegato a"],
                 content_hash,
             ))
-        self.cur.executemany(
+        execute_values(
+            self.cur,
             """
             INSERT INTO scraped_records_test (
               protocollo, avanzamento, inserita_il,
               prodotto, assegnata_a, richiedente,
               referente, cliente, progetto,
               collegato_a, content_hash
-            ) VALUES (
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s, %s,
-              %s, %s
-            ) ON CONFLICT (protocollo) DO NOTHING
+            ) VALUES %s ON CONFLICT (protocollo) DO NOTHING
             """,
             insert_data,
+            page_size=500,
         )
         self.conn.commit()
 